@@ -0,0 +1,154 @@
+"""
+Ball Store Module
+Structure-of-arrays board state with a lightweight per-ball view
+"""
+
+import numpy as np
+
+# Ball fields readable through BallView[...] (the old ball dict keys)
+BALL_FIELDS = ('id', 'pos', 'radius', 'color', 'matched', 'selected')
+
+
+class BallStore:
+    """
+    Every ball on the board as parallel NumPy arrays
+
+    Ball ids are row indices. Per-frame code works on the arrays directly
+    (positions can be updated for all balls in one operation); indexing or
+    iterating yields BallView objects for code that handles one ball.
+    """
+
+    def __init__(self, positions=None, radii=None, color_ids=None, palette=()):
+        """
+        Args:
+            positions: (n, 2) ball centres
+            radii: (n,) ball radii in pixels
+            color_ids: (n,) index of each ball's color in palette
+            palette: BGR color tuples
+        """
+        self.positions = (np.empty((0, 2)) if positions is None
+                          else np.ascontiguousarray(positions, dtype=np.float64))
+        count = len(self.positions)
+        self.radii = (np.zeros(count, dtype=np.int32) if radii is None
+                      else np.asarray(radii, dtype=np.int32))
+        self.color_ids = (np.zeros(count, dtype=np.int32) if color_ids is None
+                          else np.asarray(color_ids, dtype=np.int32))
+        self.palette = [tuple(color) for color in palette]
+        self.matched = np.zeros(count, dtype=bool)
+        self.selected = np.zeros(count, dtype=bool)
+        self.velocities = np.zeros((count, 2))  # Pixels per second (see physics.py)
+
+    @classmethod
+    def from_colors(cls, positions, radius, colors):
+        """
+        Build a store from per-ball colors
+
+        Args:
+            positions: (n, 2) ball centres
+            radius: Radius shared by every ball
+            colors: BGR color tuple of each ball
+        """
+        palette = {}
+        color_ids = [palette.setdefault(tuple(int(c) for c in color), len(palette))
+                     for color in colors]
+        return cls(positions, np.full(len(color_ids), radius), color_ids, list(palette))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, ball_id):
+        if not 0 <= ball_id < len(self.positions):
+            raise IndexError(f"No ball {ball_id}")
+        return BallView(self, ball_id)
+
+    def __iter__(self):
+        return (BallView(self, ball_id) for ball_id in range(len(self.positions)))
+
+    def get(self, ball_id, default=None):
+        """View of a ball, or default if there is no such ball"""
+        if ball_id is None or not 0 <= ball_id < len(self.positions):
+            return default
+        return BallView(self, ball_id)
+
+    def color(self, ball_id):
+        """BGR color of a ball"""
+        return self.palette[self.color_ids[ball_id]]
+
+    def colors(self):
+        """BGR color of every ball, in id order"""
+        return [self.palette[color_id] for color_id in self.color_ids.tolist()]
+
+    def unmatched(self):
+        """Ids of balls still on the board"""
+        return np.flatnonzero(~self.matched)
+
+
+class BallView:
+    """
+    One ball of a BallStore
+
+    Reads and writes go straight to the store's arrays. Supports both
+    attribute access (ball.pos) and the old dict keys (ball['pos']).
+    Views of the same ball compare equal.
+    """
+
+    __slots__ = ('store', 'id')
+
+    def __init__(self, store, ball_id):
+        self.store = store
+        self.id = ball_id
+
+    @property
+    def pos(self):
+        return self.store.positions[self.id]
+
+    @pos.setter
+    def pos(self, value):
+        self.store.positions[self.id] = value
+
+    @property
+    def radius(self):
+        return int(self.store.radii[self.id])
+
+    @property
+    def color(self):
+        return self.store.color(self.id)
+
+    @property
+    def color_id(self):
+        return int(self.store.color_ids[self.id])
+
+    @property
+    def matched(self):
+        return bool(self.store.matched[self.id])
+
+    @matched.setter
+    def matched(self, value):
+        self.store.matched[self.id] = value
+
+    @property
+    def selected(self):
+        return bool(self.store.selected[self.id])
+
+    @selected.setter
+    def selected(self, value):
+        self.store.selected[self.id] = value
+
+    def __getitem__(self, key):
+        if key not in BALL_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in ('pos', 'matched', 'selected'):
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __eq__(self, other):
+        return isinstance(other, BallView) and other.store is self.store and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self.store), self.id))
+
+    def __repr__(self):
+        return f"BallView(id={self.id}, pos={tuple(self.pos)}, color={self.color})"
@@ -0,0 +1,258 @@
+"""
+Frame Loop Benchmark
+Measures GestureGame throughput and per-stage latency without a camera
+or display, and writes the results as JSON for regression tracking
+
+Examples:
+    python benchmark.py --source synthetic --landmarks synthetic
+    python benchmark.py --source clip.mp4 --frames 500 --output results.json
+    python benchmark.py --source clip.mp4 --record-landmarks clip.jsonl
+    python benchmark.py --source clip.mp4 --inference-scale 0.5 --roi --compare-reference
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+
+from frame_source import open_frame_source, RecordedLandmarkDetector, LandmarkRecorder
+from game import GestureGame
+from physics import BallPhysics
+from utils import percentile, distance_between_points
+
+STAGES = ('detect', 'update', 'draw')
+
+
+def summarize(samples):
+    """
+    Summarize per-frame timings
+
+    Args:
+        samples: List of durations in seconds
+
+    Returns:
+        Dictionary of mean, standard deviation and percentile latencies
+        in milliseconds
+    """
+    ms = [s * 1000.0 for s in samples]
+    return {
+        'mean_ms': sum(ms) / len(ms) if ms else 0.0,
+        'std_ms': statistics.pstdev(ms) if ms else 0.0,
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'max_ms': max(ms) if ms else 0.0,
+    }
+
+
+def build_detector(args):
+    """Create the hand detector selected on the command line"""
+    if args.landmarks == 'synthetic':
+        return RecordedLandmarkDetector.synthetic(args.width, args.height)
+    if args.landmarks:
+        return RecordedLandmarkDetector.load(args.landmarks)
+
+    from gesture_detector import GestureDetector
+    detector = GestureDetector(inference_scale=args.inference_scale,
+                               roi_tracking=args.roi)
+    if args.record_landmarks:
+        detector = LandmarkRecorder(detector, args.record_landmarks)
+    return detector
+
+
+def pointer_errors(gesture_points, reference_points):
+    """
+    Compare pointers against a reference detection of the same frame
+
+    Args:
+        gesture_points: Pointers from the detector under test
+        reference_points: Pointers from the full-resolution reference
+
+    Returns:
+        Tuple (list of pixel errors for matched hands, number of missed hands)
+    """
+    errors = []
+    missed = 0
+    for ref_point, _ in reference_points:
+        if not gesture_points:
+            missed += 1
+            continue
+        errors.append(min(distance_between_points(point, ref_point)
+                          for point, _ in gesture_points))
+    return errors, missed
+
+
+def run_benchmark(game, num_frames, warmup=10, reference_detector=None):
+    """
+    Drive the game loop headlessly and time each stage
+
+    Args:
+        game: GestureGame to benchmark
+        num_frames: Number of timed frames
+        warmup: Untimed frames run first
+        reference_detector: Optional full-resolution detector run on the
+                            same frames to measure latency saving and
+                            cursor accuracy of the detector under test
+
+    Returns:
+        Dictionary with overall FPS and per-stage latency summaries
+    """
+    timings = {stage: [] for stage in STAGES}
+    frame_times = []
+    reference_times = []
+    errors = []
+    missed = 0
+    frames = 0
+
+    while frames < num_frames + warmup:
+        success, frame = game.cap.read(game.capture_buffer)
+        if not success:
+            break
+        game.capture_buffer = frame
+
+        t0 = time.perf_counter()
+        hand_landmarks, handedness = game.gesture_detector.detect_hands(frame)
+        t1 = time.perf_counter()
+        game.update_game(hand_landmarks)
+        game.game_manager.update(frame.shape)
+        t2 = time.perf_counter()
+        game._draw_game(game.mirror(frame), hand_landmarks)
+        t3 = time.perf_counter()
+
+        reference_points = None
+        if reference_detector is not None:
+            r0 = time.perf_counter()
+            reference_landmarks, _ = reference_detector.detect_hands(frame)
+            reference_time = time.perf_counter() - r0
+            reference_points = reference_detector.get_gesture_points(reference_landmarks)
+
+        frames += 1
+        if frames <= warmup:
+            continue
+
+        if reference_points is not None:
+            reference_times.append(reference_time)
+            frame_errors, frame_missed = pointer_errors(
+                game.gesture_detector.get_gesture_points(hand_landmarks),
+                reference_points)
+            errors.extend(frame_errors)
+            missed += frame_missed
+
+        timings['detect'].append(t1 - t0)
+        timings['update'].append(t2 - t1)
+        timings['draw'].append(t3 - t2)
+        frame_times.append(t3 - t0)
+
+    total = sum(frame_times)
+    results = {
+        'frames': len(frame_times),
+        'fps': len(frame_times) / total if total > 0 else 0.0,
+        'frame': summarize(frame_times),
+        'stages': {stage: summarize(samples) for stage, samples in timings.items()},
+    }
+
+    if reference_detector is not None:
+        reference = summarize(reference_times)
+        detect = results['stages']['detect']
+        results['reference'] = {
+            'detect': reference,
+            'latency_saving_ms': reference['mean_ms'] - detect['mean_ms'],
+            'latency_saving_pct': (100.0 * (1 - detect['mean_ms'] / reference['mean_ms'])
+                                   if reference['mean_ms'] > 0 else 0.0),
+            'cursor_error_px': {
+                'mean': sum(errors) / len(errors) if errors else 0.0,
+                'p50': percentile(errors, 50),
+                'p95': percentile(errors, 95),
+                'max': max(errors) if errors else 0.0,
+            },
+            'missed_hands': missed,
+        }
+    return results
+
+
+def print_report(results):
+    """Print a human readable summary"""
+    print(f"frames: {results['frames']}  fps: {results['fps']:.1f}")
+    print(f"{'stage':<8}{'mean':>9}{'std':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    rows = dict(results['stages'], frame=results['frame'])
+    for name, stats in rows.items():
+        print(f"{name:<8}{stats['mean_ms']:>9.3f}{stats['std_ms']:>9.3f}{stats['p50_ms']:>9.3f}"
+              f"{stats['p95_ms']:>9.3f}{stats['p99_ms']:>9.3f}")
+
+    reference = results.get('reference')
+    if reference:
+        error = reference['cursor_error_px']
+        print(f"vs full-resolution reference: detect saving "
+              f"{reference['latency_saving_ms']:.2f} ms ({reference['latency_saving_pct']:.0f}%), "
+              f"cursor error mean {error['mean']:.1f}px p95 {error['p95']:.1f}px, "
+              f"missed hands {reference['missed_hands']}")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Headless frame loop benchmark")
+    parser.add_argument("--source", default="synthetic",
+                        help="'synthetic', a video file, an image directory or a camera index")
+    parser.add_argument("--landmarks",
+                        help="replay a landmark recording instead of running MediaPipe "
+                             "('synthetic' generates one)")
+    parser.add_argument("--record-landmarks",
+                        help="write MediaPipe results to this recording while benchmarking")
+    parser.add_argument("--inference-scale", type=float, default=1.0,
+                        help="downsample factor applied before MediaPipe inference")
+    parser.add_argument("--roi", action="store_true",
+                        help="crop inference around the previously tracked hands")
+    parser.add_argument("--compare-reference", action="store_true",
+                        help="also run a full-resolution detector to report latency "
+                             "saving and cursor accuracy")
+    parser.add_argument("--frames", type=int, default=300, help="number of timed frames")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed warm-up frames")
+    parser.add_argument("--width", type=int, default=1280, help="synthetic frame width")
+    parser.add_argument("--height", type=int, default=720, help="synthetic frame height")
+    parser.add_argument("--moving-balls", action="store_true",
+                        help="include ball physics in the game update stage")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the benchmark"""
+    args = parse_args(argv)
+    frame_source = open_frame_source(args.source, loop=True,
+                                     width=args.width, height=args.height)
+    detector = build_detector(args)
+    game = GestureGame(frame_source=frame_source, gesture_detector=detector,
+                       physics=BallPhysics() if args.moving_balls else None)
+
+    reference_detector = None
+    if args.compare_reference and not args.landmarks:
+        from gesture_detector import GestureDetector
+        reference_detector = GestureDetector()
+
+    try:
+        results = run_benchmark(game, args.frames, args.warmup, reference_detector)
+    finally:
+        frame_source.release()
+        detector.release()
+        if reference_detector is not None:
+            reference_detector.release()
+
+    results['config'] = {
+        'source': args.source,
+        'landmarks': args.landmarks or 'mediapipe',
+        'inference_scale': args.inference_scale,
+        'roi': args.roi,
+        'frames': args.frames,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+    }
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
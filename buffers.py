@@ -0,0 +1,84 @@
+"""
+Frame Buffer Module
+Reusable frame buffers so the per-frame loop does not allocate full-size images
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class FrameBuffers:
+    """
+    Named scratch arrays reused from frame to frame
+
+    A buffer is only reallocated when the requested shape or dtype changes
+    (e.g. when the ROI crop size changes), so steady-state frames write
+    into the same memory every time.
+    """
+
+    def __init__(self):
+        self.buffers = {}
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Get the buffer for a name, allocating it on first use or shape change
+
+        Args:
+            name: Buffer name
+            shape: Required shape
+            dtype: Required dtype
+
+        Returns:
+            Writable array with the requested shape (contents undefined)
+        """
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = self.buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
+
+class BufferPool:
+    """
+    Fixed number of frame buffers shared between pipeline threads
+
+    A producer acquires a buffer, fills it (e.g. cap.read(buffer)) and
+    passes it downstream; whoever consumes or drops the frame releases it.
+    When every buffer is in flight the producer waits instead of allocating.
+    """
+
+    def __init__(self, count):
+        """
+        Args:
+            count: Number of buffers that may be in flight at once
+        """
+        self.available = count
+        self.free = deque()  # Released buffers ready for reuse
+        self.condition = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """
+        Take a buffer
+
+        Args:
+            timeout: Seconds to wait for one to be released (None waits forever)
+
+        Returns:
+            Tuple (success, buffer). buffer is None on the first uses, before
+            any frame has been released; pass it to cap.read() anyway so
+            the capture allocates one that is later recycled.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.available > 0, timeout):
+                return False, None
+            self.available -= 1
+            return True, self.free.popleft() if self.free else None
+
+    def release(self, buffer):
+        """Return a buffer acquired from the pool"""
+        with self.condition:
+            if buffer is not None:
+                self.free.append(buffer)
+            self.available += 1
+            self.condition.notify()
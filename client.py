@@ -0,0 +1,114 @@
+"""
+Game Display Client
+Renders the board streamed by server.py; does no detection itself
+
+Examples:
+    python client.py --connect 127.0.0.1:5055
+    python client.py --connect unix:/tmp/gesture-game.sock
+"""
+
+import argparse
+import socket
+
+import cv2
+import numpy as np
+
+from presenter import CvPresenter
+from protocol import LENGTH, RemoteBoard, decode_message
+from renderer import BoardLayer, draw_hands
+from server import parse_address
+
+
+class StateClient:
+    """Receives length-prefixed state messages from a StateServer"""
+
+    def __init__(self, address, timeout=5.0):
+        """
+        Args:
+            address: "host:port" or "unix:/path" of the server
+            timeout: Seconds to wait for each message
+        """
+        family, target = parse_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(target)
+        self.buffer = bytearray()
+
+    def _read_exactly(self, size):
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self.buffer)))
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            self.buffer += chunk
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def receive(self):
+        """Block until the next message arrives and return it decoded"""
+        (size,) = LENGTH.unpack(self._read_exactly(LENGTH.size))
+        return decode_message(self._read_exactly(size))
+
+    def close(self):
+        """Close the connection"""
+        self.sock.close()
+
+
+def draw_remote(frame, board, board_layer):
+    """Draw the mirrored board, hands and rubber-band lines"""
+    frame.fill(0)
+    board_layer.composite(frame, board)
+
+    for start_pos, end_pos in board.current_lines():
+        cv2.line(frame, tuple(map(int, start_pos)), tuple(map(int, end_pos)),
+                 (0, 255, 255), 2)
+    for _, position, _ in board.cursors:
+        cv2.circle(frame, tuple(map(int, position)), 8, (0, 255, 255), 2)
+
+    draw_hands(frame, board.landmarks[:, :, :2])
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Gesture game display client")
+    parser.add_argument("--connect", default="127.0.0.1:5055",
+                        help="'host:port' or 'unix:/path/to/socket' of the server")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the display client"""
+    args = parse_args(argv)
+    client = StateClient(args.connect)
+    board = RemoteBoard()
+    board_layer = BoardLayer()
+    presenter = CvPresenter("Gesture Color Connection Game (remote)")
+    presenter.open()
+    frame = None
+
+    try:
+        while True:
+            board.apply(client.receive())
+            if not board.synced:
+                continue
+
+            width, height = board.frame_size
+            if frame is None or frame.shape[:2] != (height, width):
+                frame = np.zeros((height, width, 3), dtype=np.uint8)
+            draw_remote(frame, board, board_layer)
+            presenter.present(frame)
+
+            key = presenter.poll_key() & 0xFF
+            if key == ord('q') or key == 27:
+                break
+    except (ConnectionError, socket.timeout) as e:
+        print(f"Disconnected: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+        presenter.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Filtering Module
+Per-hand cursor smoothing, latency compensation and hand identity tracking
+"""
+
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """
+    One Euro filter for a 2D point
+
+    Low-pass filters the position with a cutoff that rises with speed:
+    slow movements are smoothed heavily (no jitter) while fast ones follow
+    closely (little lag). The filtered velocity is kept so the position can
+    be extrapolated forward in time.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.02, d_cutoff=1.0):
+        """
+        Args:
+            min_cutoff: Cutoff frequency (Hz) when the hand is still
+            beta: How fast the cutoff rises with speed
+            d_cutoff: Cutoff frequency (Hz) for the velocity estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+        self.position = None  # Filtered position
+        self.velocity = np.zeros(2)  # Filtered velocity in pixels/second
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        """Smoothing factor for a cutoff frequency and time step"""
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, point, timestamp):
+        """
+        Add a measurement and return the filtered position
+
+        Args:
+            point: Measured (x, y)
+            timestamp: Measurement time in seconds
+
+        Returns:
+            Filtered position as a NumPy array
+        """
+        point = np.asarray(point, dtype=np.float64)[:2]
+
+        if self.position is None:
+            self.position = point.copy()
+            self.timestamp = timestamp
+            return self.position
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.position
+
+        # Smooth the velocity, then use its magnitude to pick the cutoff
+        raw_velocity = (point - self.position) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.velocity = a_d * raw_velocity + (1 - a_d) * self.velocity
+
+        speed = math.hypot(self.velocity[0], self.velocity[1])
+        a = self._alpha(self.min_cutoff + self.beta * speed, dt)
+        self.position = a * point + (1 - a) * self.position
+        self.timestamp = timestamp
+        return self.position
+
+    def predict(self, timestamp):
+        """
+        Extrapolate the filtered position to a later time
+
+        Args:
+            timestamp: Time in seconds to predict for
+
+        Returns:
+            Predicted position as a NumPy array
+        """
+        if self.position is None:
+            return None
+        return self.position + self.velocity * (timestamp - self.timestamp)
+
+
+class HandTrack:
+    """One tracked hand with a persistent id"""
+
+    def __init__(self, track_id, anchor, timestamp, filter_params):
+        self.track_id = track_id
+        self.anchor = np.asarray(anchor, dtype=np.float64)  # Palm point used for association
+        self.last_seen = timestamp
+        self.cursor_filter = OneEuroFilter(**filter_params)
+
+
+class HandTracker:
+    """
+    Keeps hand identities stable across frames
+
+    MediaPipe reports hands in no fixed order, so each detection is matched
+    to the nearest existing track by its palm position. Each track owns a
+    cursor filter that therefore never resets while the hand stays in view.
+    """
+
+    def __init__(self, max_match_distance=150, timeout=0.5, max_prediction=0.1,
+                 min_cutoff=1.0, beta=0.02, d_cutoff=1.0):
+        """
+        Args:
+            max_match_distance: Furthest (pixels) a palm may move between
+                                frames and keep its id
+            timeout: Seconds a track survives without a detection
+            max_prediction: Longest extrapolation in seconds
+            min_cutoff, beta, d_cutoff: One Euro filter parameters
+        """
+        self.max_match_distance = max_match_distance
+        self.timeout = timeout
+        self.max_prediction = max_prediction
+        self.filter_params = {'min_cutoff': min_cutoff, 'beta': beta, 'd_cutoff': d_cutoff}
+
+        self.tracks = {}  # track_id -> HandTrack
+        self.next_id = 0
+
+    def update(self, anchors, pointers, timestamp):
+        """
+        Associate this frame's detections with tracks and filter cursors
+
+        Args:
+            anchors: (hands, 2) palm positions used to match hands
+            pointers: (hands, 2) raw cursor positions
+            timestamp: Capture time of the frame in seconds
+
+        Returns:
+            Tuple (track ids in detection order, list of lost track ids)
+        """
+        anchors = np.asarray(anchors, dtype=np.float64).reshape(-1, 2)
+        track_ids = list(self.tracks)
+        assigned = [None] * len(anchors)
+
+        # Greedy nearest-pair matching between detections and tracks
+        if track_ids and len(anchors):
+            track_anchors = np.array([self.tracks[t].anchor for t in track_ids])
+            distances = np.linalg.norm(anchors[:, None, :] - track_anchors[None, :, :], axis=2)
+            used_tracks = set()
+            for flat in np.argsort(distances, axis=None):
+                det, trk = divmod(int(flat), len(track_ids))
+                if distances[det, trk] > self.max_match_distance:
+                    break
+                if assigned[det] is not None or trk in used_tracks:
+                    continue
+                assigned[det] = track_ids[trk]
+                used_tracks.add(trk)
+
+        for det, anchor in enumerate(anchors):
+            if assigned[det] is None:
+                assigned[det] = self.next_id
+                self.tracks[self.next_id] = HandTrack(self.next_id, anchor, timestamp,
+                                                      self.filter_params)
+                self.next_id += 1
+
+            track = self.tracks[assigned[det]]
+            track.anchor = anchor
+            track.last_seen = timestamp
+            track.cursor_filter.filter(pointers[det], timestamp)
+
+        lost = [track_id for track_id, track in self.tracks.items()
+                if timestamp - track.last_seen > self.timeout]
+        for track_id in lost:
+            del self.tracks[track_id]
+
+        return assigned, lost
+
+    def cursors(self, timestamp, track_ids=None):
+        """
+        Filtered cursors extrapolated to a point in time
+
+        Args:
+            timestamp: Time to predict for (e.g. now, to cancel pipeline latency)
+            track_ids: Tracks to report (defaults to all live tracks)
+
+        Returns:
+            List of (position, track_id)
+        """
+        if track_ids is None:
+            track_ids = list(self.tracks)
+
+        points = []
+        for track_id in track_ids:
+            cursor_filter = self.tracks[track_id].cursor_filter
+            lead = min(timestamp, cursor_filter.timestamp + self.max_prediction)
+            points.append((cursor_filter.predict(lead), track_id))
+        return points
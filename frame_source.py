@@ -0,0 +1,266 @@
+"""
+Frame Source Module
+Pluggable video frame and hand landmark sources for running the game
+without a live webcam
+"""
+
+import json
+import math
+import os
+
+import cv2
+import numpy as np
+
+from landmarks import HandLandmarks
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def _copy_into(source, image):
+    """Copy a frame into a caller-supplied buffer when it fits, else a new array"""
+    if image is not None and image.shape == source.shape and image.dtype == source.dtype:
+        np.copyto(image, source)
+        return image
+    return source.copy()
+
+
+class VideoFileSource:
+    """Frames read from a video file"""
+
+    def __init__(self, path, loop=False):
+        """
+        Args:
+            path: Path to the video file
+            loop: Restart from the first frame when the file ends
+        """
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video file: {path}")
+
+    def read(self, image=None):
+        """Read the next frame, cv2.VideoCapture style (into image if given)"""
+        success, frame = self.cap.read(image)
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read(image)
+        return success, frame
+
+    def release(self):
+        """Release the underlying capture"""
+        self.cap.release()
+
+
+class ImageDirectorySource:
+    """Frames read from a directory of still images in name order"""
+
+    def __init__(self, path, loop=False, preload=True):
+        """
+        Args:
+            path: Directory containing the images
+            loop: Restart from the first image when all have been read
+            preload: Decode every image up front so disk I/O is not timed
+        """
+        self.loop = loop
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.paths:
+            raise IOError(f"No images found in: {path}")
+
+        self.frames = [cv2.imread(p) for p in self.paths] if preload else None
+        self.index = 0
+
+    def read(self, image=None):
+        """Read the next image, cv2.VideoCapture style (into image if given)"""
+        if self.index >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self.index = 0
+
+        if self.frames is not None:
+            frame = _copy_into(self.frames[self.index], image)
+        else:
+            frame = cv2.imread(self.paths[self.index])
+        self.index += 1
+        return frame is not None, frame
+
+    def release(self):
+        """Drop any preloaded images"""
+        self.frames = None
+
+
+class SyntheticSource:
+    """Generated test-pattern frames for camera-free runs"""
+
+    def __init__(self, width=1280, height=720, num_frames=None):
+        """
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            num_frames: Number of frames to produce (None for unlimited)
+        """
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.index = 0
+
+        # Static gradient background; a bright square moves across it
+        gradient = np.linspace(40, 200, width, dtype=np.uint8)
+        self.background = np.dstack([
+            np.tile(gradient, (height, 1)),
+            np.tile(gradient[::-1], (height, 1)),
+            np.full((height, width), 90, dtype=np.uint8),
+        ])
+
+    def read(self, image=None):
+        """Produce the next frame, cv2.VideoCapture style (into image if given)"""
+        if self.num_frames is not None and self.index >= self.num_frames:
+            return False, None
+
+        frame = _copy_into(self.background, image)
+        x = int((self.index * 7) % self.width)
+        y = int(self.height / 2 + self.height / 4 * math.sin(self.index / 15))
+        cv2.rectangle(frame, (x, y), (x + 60, y + 60), (255, 255, 255), -1)
+        self.index += 1
+        return True, frame
+
+    def release(self):
+        """Nothing to release"""
+        pass
+
+
+def open_frame_source(spec, loop=False, width=1280, height=720):
+    """
+    Open a frame source from a command line style specification
+
+    Args:
+        spec: Camera index ("0"), "synthetic", a video file or an image directory
+        loop: Loop file-backed sources forever
+        width: Width of synthetic frames
+        height: Height of synthetic frames
+
+    Returns:
+        Object with cv2.VideoCapture-style read() and release()
+    """
+    if spec.isdigit():
+        return cv2.VideoCapture(int(spec))
+    if spec == 'synthetic':
+        return SyntheticSource(width, height)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop)
+
+
+class RecordedLandmarkDetector:
+    """
+    Stand-in for GestureDetector that replays recorded hand landmarks
+
+    Lets the game logic and rendering run without MediaPipe inference.
+    Recordings are line-delimited JSON, one frame per line:
+    {"hands": [[[x, y], ...21 points], ...], "handedness": ["Right", ...]}
+    """
+
+    def __init__(self, frames, loop=True):
+        """
+        Args:
+            frames: List of (HandLandmarks, handedness) tuples
+            loop: Restart from the first frame when the recording ends
+        """
+        self.frames = frames
+        self.loop = loop
+        self.index = 0
+
+    @classmethod
+    def load(cls, path, loop=True):
+        """Load a landmark recording written by LandmarkRecorder"""
+        frames = []
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                hand_landmarks = HandLandmarks.from_lists(record['hands'])
+                frames.append((hand_landmarks, record.get('handedness', [])))
+        return cls(frames, loop=loop)
+
+    @classmethod
+    def synthetic(cls, width=1280, height=720, num_frames=600):
+        """
+        Build a recording of one hand sweeping a Lissajous path over the field
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            num_frames: Length of the recording
+        """
+        # Rough open-hand shape relative to the index fingertip (landmark 8)
+        offsets = [
+            (10, 160), (-30, 140), (-55, 110), (-70, 80), (-80, 55),
+            (-20, 80), (-10, 45), (-5, 20), (0, 0),
+            (10, 80), (15, 40), (18, 15), (20, -5),
+            (35, 85), (45, 50), (50, 25), (55, 5),
+            (55, 95), (70, 70), (78, 50), (85, 35),
+        ]
+        frames = []
+        for i in range(num_frames):
+            t = 2 * math.pi * i / num_frames
+            x = width / 2 + 0.4 * width * math.sin(3 * t)
+            y = height / 2 + 0.35 * height * math.sin(2 * t)
+            hand = [(int(x + dx), int(y + dy)) for dx, dy in offsets]
+            frames.append((HandLandmarks.from_lists([hand]), ['Right']))
+        return cls(frames)
+
+    def detect_hands(self, frame):
+        """Return the next recorded frame's landmarks, ignoring the image"""
+        if self.index >= len(self.frames):
+            if not self.loop or not self.frames:
+                return HandLandmarks(), []
+            self.index = 0
+
+        hand_landmarks, handedness = self.frames[self.index]
+        self.index += 1
+        return hand_landmarks, handedness
+
+    def get_gesture_points(self, hand_landmarks):
+        """Use the index fingertip of each hand as its pointer"""
+        return [(pointer, hand_id)
+                for hand_id, pointer in enumerate(hand_landmarks.pointers())]
+
+    def release(self):
+        """Nothing to release"""
+        pass
+
+
+class LandmarkRecorder:
+    """Wraps a detector and writes every detection result to a recording"""
+
+    def __init__(self, gesture_detector, path):
+        """
+        Args:
+            gesture_detector: Detector whose results are recorded
+            path: Output file for the line-delimited JSON recording
+        """
+        self.gesture_detector = gesture_detector
+        self.file = open(path, 'w')
+
+    def detect_hands(self, frame):
+        """Detect hands and append the result to the recording"""
+        hand_landmarks, handedness = self.gesture_detector.detect_hands(frame)
+        record = {
+            'hands': [[[int(p[0]), int(p[1])] for p in hand] for hand in hand_landmarks],
+            'handedness': list(handedness),
+        }
+        self.file.write(json.dumps(record) + "\n")
+        return hand_landmarks, handedness
+
+    def get_gesture_points(self, hand_landmarks):
+        """Delegate to the wrapped detector"""
+        return self.gesture_detector.get_gesture_points(hand_landmarks)
+
+    def release(self):
+        """Close the recording and release the wrapped detector"""
+        self.file.close()
+        self.gesture_detector.release()
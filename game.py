@@ -3,146 +3,400 @@ Gesture Recognition Color Connecting Game
 A real-time game that uses hand gestures to connect colored balls
 """
 
+import argparse
+import time
 import cv2
-import mediapipe as mp
 import numpy as np
 from gesture_detector import GestureDetector
 from game_manager import GameManager
+from filtering import HandTracker
+from landmarks import HandLandmarks, PALM_CENTER, classify_gestures
+from pipeline import FramePipeline
+from scheduler import InferenceScheduler, INFER, TRACK
+from selection import DWELL, SELECTION_MODES
+from profiler import StageProfiler
+from replay import SessionRecorder
+from levels import LevelPack, LayoutCache
+from motion import MotionGate
+from physics import BallPhysics
+from presenter import CvPresenter, NullPresenter
+from renderer import BoardLayer, draw_hands, SKELETON_FULL, SKELETON_LEVELS
 from utils import draw_text, draw_circle, distance_between_points
 
+WINDOW_NAME = "Gesture Color Connection Game"
+
 class GestureGame:
-    def __init__(self):
-        """Initialize the gesture recognition game"""
-        self.cap = cv2.VideoCapture(0)
-        self.gesture_detector = GestureDetector()
-        self.game_manager = GameManager()
+    def __init__(self, pipelined=False, frame_source=None, gesture_detector=None,
+                 max_hands=2, inference_interval=1, target_fps=None, profiler=None,
+                 trace_path=None, selection_mode=DWELL, dwell_time=0.3, seed=None,
+                 record_path=None, skeleton_detail=SKELETON_FULL, levels=None,
+                 layout_cache=None, no_crossing=False, motion_gate=None, attract_delay=20.0,
+                 presenter=None, physics=None):
+        """
+        Initialize the gesture recognition game
+        
+        Args:
+            pipelined: Run capture, detection and rendering on overlapping
+                       threads instead of one after another
+            frame_source: Object with cv2.VideoCapture-style read() and
+                          release() (defaults to webcam 0, opened by run())
+            gesture_detector: Hand detector (defaults to a MediaPipe
+                              GestureDetector)
+            max_hands: Number of hands that can hold selections at once
+            inference_interval: Run hand detection every this many frames
+                                and extrapolate cursors in between
+            target_fps: If set, adapt the inference interval to keep this
+                        display frame rate
+            profiler: StageProfiler for per-stage timing (one is created
+                      if not given)
+            trace_path: Write a Chrome trace (.json) or CSV (.csv) of every
+                        stage span here when the game exits
+            selection_mode: How hovering a ball is confirmed ('instant',
+                            'dwell', 'pinch' or 'point')
+            dwell_time: Seconds to rest on a ball in dwell mode
+            seed: Seed for ball colors and layout (random if not given)
+            record_path: Log the session here for replay.py
+            skeleton_detail: Hand overlay detail ('full', 'tips' or 'off')
+            levels: LevelPack to play (defaults to the original progression)
+            layout_cache: LayoutCache holding precomputed level layouts
+            no_crossing: Reject connections that cross a matched pair's line
+            motion_gate: MotionGate that idles hand detection while nothing
+                         moves in front of the camera
+            attract_delay: Seconds of idling before the game switches to
+                           attract mode (needs motion_gate)
+            presenter: Presenter that displays frames and reads keys
+                       (defaults to an unpaced OpenCV window)
+            physics: BallPhysics for the moving-balls mode
+        """
+        self.cap = frame_source
+        self.gesture_detector = (gesture_detector if gesture_detector is not None
+                                 else GestureDetector(max_num_hands=max_hands))
+        self.recorder = SessionRecorder(record_path) if record_path else None
+        self.game_manager = GameManager(max_hands=max_hands, selection_mode=selection_mode,
+                                        dwell_time=dwell_time, seed=seed,
+                                        recorder=self.recorder, levels=levels,
+                                        layout_cache=layout_cache,
+                                        no_crossing=no_crossing,
+                                        physics=physics)
+        
+        # Per-stage instrumentation
+        self.trace_path = trace_path
+        self.profiler = profiler if profiler is not None else StageProfiler(
+            record_events=trace_path is not None)
+        self.gesture_detector.profiler = self.profiler
+        self.board_layer = BoardLayer()
+        
+        # Per-hand identity, smoothing and latency compensation
+        self.hand_tracker = HandTracker()
+        self.hand_track_ids = []
+        self.last_landmarks = None
+        self.last_pointers = []
+        
+        # Decides per frame whether to run detection or predict
+        self.scheduler = InferenceScheduler(target_fps=target_fps or 30.0,
+                                            adaptive=target_fps is not None,
+                                            interval=inference_interval)
+        self.inference_duration = 0.0
+        
+        # Presence gating and attract mode for unattended kiosks
+        self.motion_gate = motion_gate
+        self.attract_delay = attract_delay
+        
+        # Reused capture and display frames (no per-frame allocation)
+        self.capture_buffer = None
+        self.display_buffer = None
         
         # Game settings
-        self.window_name = "Gesture Color Connection Game"
+        self.window_name = WINDOW_NAME
+        self.presenter = presenter if presenter is not None else CvPresenter(self.window_name)
         self.is_running = True
         self.show_fps = True
         self.show_help = True
+        self.show_profile = False
+        self.skeleton_detail = skeleton_detail
+        
+        # Threaded capture -> detection -> render pipeline
+        self.pipelined = pipelined
+        self.pipeline = None
         
         # FPS calculation
         self.fps = 0
         self.frame_count = 0
         self.prev_time = 0
+        self.frame_stats = self.presenter.stats()
         
-    def process_frame(self, frame):
-        """Process a single frame of video"""
-        # Detect hand gestures
-        hand_landmarks, handedness = self.gesture_detector.detect_hands(frame)
-        gesture_points = self.gesture_detector.get_gesture_points(hand_landmarks)
+    def process_frame(self, frame, capture_time=None):
+        """
+        Process a single frame of video
+        
+        Args:
+            frame: Camera frame as captured (detection mirrors the landmarks)
+            capture_time: time.perf_counter() when the frame was captured
+        
+        Returns:
+            Mirrored frame with the game drawn on it
+        """
+        hand_landmarks = self.step(frame, capture_time)
+        frame = self.mirror(frame)
+        
+        with self.profiler.stage('_draw_game'):
+            self._draw_game(frame, hand_landmarks)
+        return frame
+    
+    def mirror(self, frame):
+        """Flip a captured frame into the reused display buffer for the selfie view"""
+        with self.profiler.stage('flip'):
+            self.display_buffer = cv2.flip(frame, 1, dst=self.display_buffer)
+        return self.display_buffer
+    
+    def step(self, frame, capture_time=None):
+        """
+        Advance hand tracking and game logic by one frame without drawing
+        
+        Args:
+            frame: Camera frame as captured
+            capture_time: time.perf_counter() when the frame was captured
+        
+        Returns:
+            HandLandmarks used for this frame (detected or predicted)
+        """
+        self.inference_duration = 0.0
+        if not self.detector_ready:
+            # Model still loading in the background (or failed to): show the board meanwhile
+            return HandLandmarks()
+        
+        if self.motion_gate is not None:
+            now = capture_time if capture_time is not None else time.perf_counter()
+            with self.profiler.stage('motion'):
+                detect = self.motion_gate.update(frame, now, bool(self.hand_track_ids))
+            self._update_attract(now)
+            if not detect:
+                # Nobody in front of the camera: skip detection until motion or a probe
+                return HandLandmarks()
         
-        # Update game based on detected points
-        if gesture_points:
-            for point, hand_id in gesture_points:
-                self.game_manager.update_cursor(point, hand_id)
+        decision = self.scheduler.decide(has_tracks=bool(self.hand_track_ids))
+        
+        if decision == INFER or self.last_landmarks is None:
+            # Detect hand gestures
+            start = time.perf_counter()
+            hand_landmarks, handedness = self.gesture_detector.detect_hands(frame)
+            self.inference_duration = time.perf_counter() - start
+            self.scheduler.record_inference(self.inference_duration)
+            self.update_game(hand_landmarks, capture_time)
+            return hand_landmarks
+        
+        if decision == TRACK:
+            # Between inference frames, move the cursors along their predicted paths
+            return self.update_game_predicted()
+        return self.last_landmarks
+    
+    def _update_attract(self, now):
+        """Switch attract mode on after attract_delay seconds without a player"""
+        self.game_manager.set_attract(self.motion_gate.idle_for(now) >= self.attract_delay)
+    
+    @property
+    def detector_ready(self):
+        """False while the hand model is loading on a background thread, or failed to load"""
+        return not getattr(self.gesture_detector, 'loading', False)
+    
+    @property
+    def detector_error(self):
+        """Exception raised by a background model load, or None"""
+        return getattr(self.gesture_detector, 'load_error', None)
+    
+    def apply_detections(self, frame, hand_landmarks, capture_time=None):
+        """Update the game from detected hands and draw the frame"""
+        self.update_game(hand_landmarks, capture_time)
         
         # Draw game elements
-        self._draw_game(frame, hand_landmarks)
+        with self.profiler.stage('_draw_game'):
+            self._draw_game(frame, hand_landmarks)
         
         return frame
     
+    def update_game(self, hand_landmarks, capture_time=None):
+        """
+        Feed the detected hand pointers into the game
+        
+        Pointers go through the per-hand tracker, which keeps hand ids stable,
+        filters jitter and extrapolates each cursor from the frame's capture
+        time to now to hide detection latency.
+        
+        Args:
+            hand_landmarks: HandLandmarks detected in the frame
+            capture_time: time.perf_counter() when the frame was captured
+        """
+        now = time.perf_counter()
+        if capture_time is None:
+            capture_time = now
+        
+        gesture_points = self.gesture_detector.get_gesture_points(hand_landmarks)
+        pointers = [point for point, _ in gesture_points]
+        anchors = hand_landmarks.xy[:, PALM_CENTER] if hand_landmarks else []
+        
+        track_ids, lost = self.hand_tracker.update(anchors, pointers, capture_time)
+        for track_id in lost:
+            self.game_manager.drop_hand(track_id)
+        
+        # Pinch / pointing signals for the per-hand selection state machines
+        gestures = None
+        if hand_landmarks:
+            with self.profiler.stage('gestures'):
+                classified = classify_gestures(hand_landmarks)
+                gestures = {
+                    track_id: (float(pinch), bool(pointing))
+                    for track_id, pinch, pointing in zip(
+                        track_ids, classified['pinch_ratio'], classified['pointing'])
+                }
+        
+        self.last_landmarks = hand_landmarks
+        self.last_pointers = pointers
+        self.hand_track_ids = track_ids
+        
+        # Update game based on filtered points, all hands at once
+        with self.profiler.stage('update_cursor'):
+            self.game_manager.update_cursors(self.hand_tracker.cursors(now, track_ids),
+                                             gestures, now)
+    
+    def update_game_predicted(self):
+        """
+        Advance the game on a frame without inference
+        
+        Returns:
+            Last detected landmarks shifted to follow the predicted cursors
+        """
+        now = time.perf_counter()
+        cursors = self.hand_tracker.cursors(now, self.hand_track_ids)
+        with self.profiler.stage('update_cursor'):
+            self.game_manager.update_cursors(cursors, timestamp=now)
+        
+        hand_landmarks = HandLandmarks(self.last_landmarks.points.copy(),
+                                       self.last_landmarks.visibility)
+        for i, (position, _) in enumerate(cursors):
+            hand_landmarks.points[i, :, :2] += position - self.last_pointers[i]
+        return hand_landmarks
+    
     def _draw_game(self, frame, hand_landmarks):
         """Draw all game elements on the frame"""
-        # Draw matched pairs with lines
-        for pair in self.game_manager.matched_pairs:
-            ball1 = None
-            ball2 = None
-            for ball in self.game_manager.balls:
-                if ball['id'] == pair['ball1_id']:
-                    ball1 = ball
-                if ball['id'] == pair['ball2_id']:
-                    ball2 = ball
+        # Static balls, matched lines and HUD from the cached layer
+        self.board_layer.composite(frame, self.game_manager)
+        
+        # Draw each hand's line from its first selected ball to its cursor
+        for session in self.game_manager.sessions.values():
+            if session.current_line is None:
+                continue
             
-            if ball1 and ball2:
-                # Draw line between matched balls
-                cv2.line(frame, tuple(ball1['pos'].astype(int)), 
-                        tuple(ball2['pos'].astype(int)), 
-                        pair['color'], 3)
-        
-        # Draw all balls
-        for ball in self.game_manager.balls:
-            if not ball['matched']:
-                # Draw unmatched ball
-                color = ball['color']
-                radius = ball['radius']
-                
-                # Highlight selected ball
-                if ball['selected']:
-                    cv2.circle(frame, tuple(ball['pos'].astype(int)), 
-                             radius + 5, (255, 255, 255), 3)
-                
-                # Draw ball
-                cv2.circle(frame, tuple(ball['pos'].astype(int)), 
-                          radius, color, -1)
-                
-                # Draw ball border
-                cv2.circle(frame, tuple(ball['pos'].astype(int)), 
-                          radius, (255, 255, 255), 2)
-        
-        # Draw current line being drawn from first selected ball to cursor
-        if self.game_manager.current_line:
-            start_pos, end_pos = self.game_manager.current_line
-            cv2.line(frame, tuple(map(int, start_pos)), tuple(map(int, end_pos)), 
-                    (0, 255, 255), 2)  # Yellow line while drawing
+            # Yellow while drawing, red while the line would cross a matched pair
+            start_pos, end_pos = session.current_line
+            color = (0, 255, 255) if session.line_valid else (0, 0, 255)
+            cv2.line(frame, tuple(map(int, start_pos)), tuple(map(int, end_pos)), color, 2)
             
             # Draw circle at cursor position
-            cv2.circle(frame, tuple(map(int, end_pos)), 8, (0, 255, 255), 2)
+            cv2.circle(frame, tuple(map(int, end_pos)), 8, color, 2)
         
-        # Draw hand landmarks
+        # Dwell progress ring around cursors resting on a ball
+        now = time.perf_counter()
+        for session in self.game_manager.sessions.values():
+            progress = session.selector.progress(now)
+            if progress > 0 and session.cursor_pos is not None:
+                cv2.ellipse(frame, tuple(map(int, session.cursor_pos)), (14, 14), -90,
+                            0, 360 * progress, (0, 255, 255), 2)
+        
+        # Draw hand skeletons
         if hand_landmarks:
-            for hand in hand_landmarks:
-                for i, landmark in enumerate(hand):
-                    x, y = int(landmark[0]), int(landmark[1])
-                    cv2.circle(frame, (x, y), 3, (0, 255, 0), -1)
-                    
-                    # Draw connections between landmarks for hand visualization
-                    if i < len(hand) - 1:
-                        x_next, y_next = int(hand[i + 1][0]), int(hand[i + 1][1])
-                        cv2.line(frame, (x, y), (x_next, y_next), (0, 200, 0), 1)
+            with self.profiler.stage('skeleton'):
+                draw_hands(frame, hand_landmarks.xy, self.skeleton_detail)
         
         # Draw UI
-        self._draw_ui(frame)
+        with self.profiler.stage('_draw_ui'):
+            self._draw_ui(frame)
     
     def _draw_ui(self, frame):
-        """Draw user interface elements"""
-        # Score
-        score_text = f"Score: {self.game_manager.score}"
-        draw_text(frame, score_text, (10, 30), color=(0, 255, 0), font_size=1)
-        
-        # Level
-        level_text = f"Level: {self.game_manager.level}"
-        draw_text(frame, level_text, (10, 60), color=(0, 255, 0), font_size=1)
-        
-        # Remaining pairs
-        total_pairs = len(self.game_manager.balls) // 2
-        matched_pairs = len(self.game_manager.matched_pairs)
-        remaining_text = f"Pairs: {matched_pairs}/{total_pairs}"
-        draw_text(frame, remaining_text, (10, 90), 
-                 color=(255, 200, 0), font_size=1)
-        
-        # Combo
-        if self.game_manager.combo > 0:
-            combo_text = f"Combo: {self.game_manager.combo}x"
-            draw_text(frame, combo_text, (10, 120), 
-                     color=(0, 165, 255), font_size=1)
-        
+        """Draw per-frame user interface elements (score HUD is in the board layer)"""
         # FPS
         if self.show_fps:
-            fps_text = f"FPS: {self.fps:.1f}"
+            fps_text = f"FPS: {self.fps:.1f}  Inf: {self.scheduler.inference_rate:.0f}/s"
             draw_text(frame, fps_text, 
-                     (frame.shape[1] - 150, 30), 
+                     (frame.shape[1] - 280, 30), 
                      color=(0, 255, 0), font_size=0.7)
+            
+            # Frame pacing: interval spread, not just the average
+            stats = self.frame_stats
+            pacing_text = (f"Frame: {stats['mean_ms']:.1f}+/-{stats['std_ms']:.1f}ms "
+                           f"p99 {stats['p99_ms']:.1f} miss {stats['missed']}")
+            draw_text(frame, pacing_text, 
+                     (frame.shape[1] - 280, 55), 
+                     color=(0, 255, 0), font_size=0.5, thickness=1)
+            
+            # Per-stage pipeline timing and queue depth
+            if self.pipeline is not None:
+                y = 75
+                for name, stats in self.pipeline.get_stats().items():
+                    stage_text = (f"{name}: {stats['mean_ms']:.1f}ms "
+                                  f"q{stats['queue_depth']} drop {stats['dropped']}")
+                    draw_text(frame, stage_text, 
+                             (frame.shape[1] - 260, y), 
+                             color=(0, 255, 0), font_size=0.5, thickness=1)
+                    y += 20
+        
+        # Countdown on timed levels
+        remaining = self.game_manager.time_remaining(time.perf_counter())
+        if remaining is not None:
+            draw_text(frame, f"Time: {remaining:.0f}s", (frame.shape[1] // 2 - 60, 30),
+                     color=(0, 0, 255) if remaining < 10 else (255, 255, 255), font_size=1)
+        
+        # Attract mode banner
+        if self.game_manager.attract:
+            pulse = 0.6 + 0.4 * abs(((time.perf_counter() * 0.5) % 2) - 1)
+            draw_text(frame, "Wave a hand to play",
+                     (frame.shape[1] // 2 - 170, frame.shape[0] // 2 + 60),
+                     color=tuple(int(255 * pulse) for _ in range(3)), font_size=1.1)
+        
+        # Loading state until the hand model is ready, or why it never will be
+        if self.detector_error is not None:
+            draw_text(frame, "Hand tracking failed to load",
+                     (frame.shape[1] // 2 - 220, frame.shape[0] // 2),
+                     color=(0, 0, 255), font_size=1)
+            draw_text(frame, str(self.detector_error)[:80],
+                     (frame.shape[1] // 2 - 220, frame.shape[0] // 2 + 35),
+                     color=(0, 0, 255), font_size=0.5, thickness=1)
+        elif not self.detector_ready:
+            draw_text(frame, "Loading hand tracking...",
+                     (frame.shape[1] // 2 - 170, frame.shape[0] // 2),
+                     color=(255, 255, 255), font_size=1)
+        
+        # Per-stage latency overlay
+        if self.show_profile:
+            self._draw_profile(frame)
         
         # Help text
         if self.show_help:
-            help_text = "Match same colors | H: Help | Q: Quit | R: Reset"
+            help_text = "Match same colors | H: Help | L: Hands | P: Profile | Q: Quit | R: Reset"
             draw_text(frame, help_text, 
-                     (frame.shape[1] - 450, frame.shape[0] - 20), 
+                     (frame.shape[1] - 630, frame.shape[0] - 20), 
                      color=(200, 200, 200), font_size=0.5)
     
+    def _draw_profile(self, frame):
+        """Draw rolling per-stage latency and the last spike's breakdown"""
+        y = 160
+        draw_text(frame, "stage          mean    p95    max (ms)", (10, y),
+                 color=(255, 255, 255), font_size=0.45, thickness=1)
+        
+        for name, stats in self.profiler.summary().items():
+            y += 18
+            stage_text = (f"{name:<14}{stats['mean_ms']:>5.1f}  {stats['p95_ms']:>5.1f}"
+                          f"  {stats['max_ms']:>5.1f}")
+            draw_text(frame, stage_text, (10, y),
+                     color=(255, 255, 255), font_size=0.45, thickness=1)
+        
+        if self.profiler.last_spike is not None:
+            frame_ms, stages = self.profiler.last_spike
+            worst = sorted(stages.items(), key=lambda item: -item[1])[:3]
+            spike_text = f"last spike {frame_ms:.0f}ms: " + ", ".join(
+                f"{name} {ms:.0f}" for name, ms in worst)
+            draw_text(frame, spike_text, (10, y + 22),
+                     color=(0, 0, 255), font_size=0.45, thickness=1)
+    
     def update_fps(self, current_time):
         """Update FPS calculation"""
         self.frame_count += 1
@@ -150,10 +404,12 @@ class GestureGame:
             self.fps = self.frame_count / (current_time - self.prev_time)
             self.frame_count = 0
             self.prev_time = current_time
+            self.frame_stats = self.presenter.stats()
     
     def handle_input(self):
         """Handle keyboard input"""
-        key = cv2.waitKey(5) & 0xFF
+        with self.profiler.stage('poll_key'):
+            key = self.presenter.poll_key() & 0xFF
         
         if key == ord('q') or key == 27:  # Q or ESC
             self.is_running = False
@@ -163,44 +419,199 @@ class GestureGame:
             self.game_manager.reset_game()
         elif key == ord('f'):  # F for FPS
             self.show_fps = not self.show_fps
+        elif key == ord('p'):  # P for per-stage profile
+            self.show_profile = not self.show_profile
+        elif key == ord('l'):  # L cycles hand skeleton detail
+            index = SKELETON_LEVELS.index(self.skeleton_detail)
+            self.skeleton_detail = SKELETON_LEVELS[(index + 1) % len(SKELETON_LEVELS)]
     
     def run(self):
         """Main game loop"""
-        cv2.namedWindow(self.window_name, cv2.WINDOW_AUTOSIZE)
+        # Show the window straight away, then load the model while the
+        # camera opens
+        self.presenter.open()
+        self._show_splash("Starting camera...")
+        if hasattr(self.gesture_detector, 'load_async'):
+            self.gesture_detector.load_async()
+        if self.cap is None:
+            self.cap = cv2.VideoCapture(0)
+        
+        if self.pipelined:
+            self._run_pipelined()
+        else:
+            self._run_sequential()
+        
+        # Cleanup
+        self.cap.release()
+        self.presenter.close()
+        
+        stats = self.presenter.stats()
+        print(f"Frame pacing: {stats['fps']:.1f} fps, interval {stats['mean_ms']:.1f}ms "
+              f"+/- {stats['std_ms']:.1f}ms (p99 {stats['p99_ms']:.1f}ms, "
+              f"jitter {stats['jitter_ms']:.1f}ms, missed {stats['missed']})")
         
-        import time
+        if self.trace_path:
+            self.profiler.export(self.trace_path)
+            print(f"Wrote stage trace to {self.trace_path}")
         
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"Wrote session log to {self.recorder.path}")
+    
+    def _show_splash(self, message):
+        """Paint a placeholder frame before the first camera frame arrives"""
+        width, height = self.game_manager.frame_size
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        draw_text(frame, message, (width // 2 - 150, height // 2),
+                 color=(255, 255, 255), font_size=1)
+        self.presenter.show(frame)
+        self.presenter.poll_key()
+    
+    def _run_sequential(self):
+        """Capture, detect and render each frame on the main thread"""
         while self.is_running:
-            success, frame = self.cap.read()
+            self.profiler.begin_frame()
+            with self.profiler.stage('cap.read'):
+                success, frame = self.cap.read(self.capture_buffer)
+            capture_time = time.perf_counter()
             
             if not success:
                 print("Failed to read frame from camera")
                 break
+            self.capture_buffer = frame
             
-            # Flip frame for selfie view
-            frame = cv2.flip(frame, 1)
-            
-            # Process frame
-            frame = self.process_frame(frame)
-            
-            # Update game logic
-            current_time = time.time()
-            self.game_manager.update(frame.shape)
-            self.update_fps(current_time)
-            
-            # Display frame
-            cv2.imshow(self.window_name, frame)
-            
-            # Handle input
-            self.handle_input()
+            # Process frame (flipped for selfie view only for display)
+            frame = self.process_frame(frame, capture_time)
+            self._finish_frame(frame)
+            self.scheduler.record_frame(time.perf_counter() - capture_time,
+                                        self.inference_duration)
+            self.profiler.end_frame()
+    
+    def _run_pipelined(self):
+        """Render the newest detection result while capture and detection run ahead"""
+        self.pipeline = FramePipeline(self.cap, self.gesture_detector,
+                                      profiler=self.profiler,
+                                      motion_gate=self.motion_gate)
+        self.pipeline.start()
         
-        # Cleanup
-        self.cap.release()
-        cv2.destroyAllWindows()
+        try:
+            while self.is_running:
+                result = self.pipeline.get_result()
+                
+                if result is None:
+                    if self.pipeline.capture_failed:
+                        print("Failed to read frame from camera")
+                        break
+                    self.handle_input()
+                    continue
+                
+                frame, hand_landmarks, handedness, capture_time = result
+                if hand_landmarks is None:
+                    hand_landmarks = HandLandmarks()  # Skipped by the motion gate
+                else:
+                    self.scheduler.record_inference()
+                if self.motion_gate is not None:
+                    self._update_attract(capture_time)
+                self.profiler.begin_frame()
+                start = time.perf_counter()
+                display = self.mirror(frame)
+                self.pipeline.release_frame(frame)
+                frame = self.apply_detections(display, hand_landmarks, capture_time)
+                self.pipeline.stats['render'].record(time.perf_counter() - start)
+                self._finish_frame(frame)
+                self.profiler.end_frame()
+        finally:
+            self.pipeline.stop()
+            self.pipeline = None
+    
+    def _finish_frame(self, frame):
+        """Update game logic, display the frame and handle input"""
+        # Update game logic
+        current_time = time.time()
+        self.game_manager.update(frame.shape)
+        self.update_fps(current_time)
+        
+        # Display frame in its slot
+        with self.profiler.stage('pace'):
+            self.presenter.pace()
+        with self.profiler.stage('present'):
+            self.presenter.show(frame)
+        
+        # Handle input
+        self.handle_input()
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Gesture Color Connection Game")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="overlap capture, detection and rendering on separate threads")
+    parser.add_argument("--inference-scale", type=float, default=1.0,
+                        help="downsample frames by this factor before hand detection")
+    parser.add_argument("--hands", type=int, default=2,
+                        help="number of hands that can play at once")
+    parser.add_argument("--inference-interval", type=int, default=1,
+                        help="run hand detection every N frames, predicting cursors in between")
+    parser.add_argument("--target-fps", type=float,
+                        help="skip hand detection on some frames when needed to hold this frame rate")
+    parser.add_argument("--trace",
+                        help="on exit, write per-stage timings as a Chrome trace (.json) or CSV (.csv)")
+    parser.add_argument("--roi", action="store_true",
+                        help="run detection on a crop around the previously tracked hands")
+    parser.add_argument("--select", choices=SELECTION_MODES, default=DWELL,
+                        help="how hovering a ball is confirmed as a selection")
+    parser.add_argument("--dwell-time", type=float, default=0.3,
+                        help="seconds to rest on a ball in dwell mode")
+    parser.add_argument("--seed", type=int,
+                        help="seed for ball colors and layout")
+    parser.add_argument("--record",
+                        help="log the session (seed, cursors, game events) for replay.py")
+    parser.add_argument("--levels",
+                        help="level pack to play (.json or .toml, see levels.py)")
+    parser.add_argument("--layout-cache",
+                        help="folder of precomputed level layouts (e.g. ~/.cache/gesture-game/layouts;"
+                             " useful with --seed, layouts are kept in memory only by default)")
+    parser.add_argument("--no-crossing", action="store_true",
+                        help="connections may not cross the line of an already matched pair")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="idle hand detection while nothing moves in front of the camera")
+    parser.add_argument("--attract-after", type=float, default=20.0,
+                        help="seconds without a player before attract mode (with --motion-gate)")
+    parser.add_argument("--skeleton", choices=SKELETON_LEVELS, default=SKELETON_FULL,
+                        help="hand overlay: full skeleton, fingertips only, or off")
+    parser.add_argument("--moving-balls", action="store_true",
+                        help="harder mode: unmatched balls drift and bounce off the edges and each other")
+    parser.add_argument("--ball-speed", type=float, default=120.0,
+                        help="launch speed of moving balls in pixels per second")
+    parser.add_argument("--present-fps", type=float,
+                        help="pace displayed frames to this rate on a fixed deadline grid")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window (e.g. for soak tests with --record)")
+    return parser.parse_args(argv)
 
 def main():
     """Entry point for the game"""
-    game = GestureGame()
+    args = parse_args()
+    detector = GestureDetector(inference_scale=args.inference_scale,
+                               roi_tracking=args.roi,
+                               max_num_hands=args.hands)
+    game = GestureGame(pipelined=args.pipelined, gesture_detector=detector,
+                       max_hands=args.hands,
+                       inference_interval=args.inference_interval,
+                       target_fps=args.target_fps,
+                       trace_path=args.trace,
+                       selection_mode=args.select,
+                       dwell_time=args.dwell_time,
+                       seed=args.seed,
+                       record_path=args.record,
+                       skeleton_detail=args.skeleton,
+                       levels=LevelPack.load(args.levels) if args.levels else None,
+                       layout_cache=LayoutCache(args.layout_cache),
+                       no_crossing=args.no_crossing,
+                       motion_gate=MotionGate() if args.motion_gate else None,
+                       attract_delay=args.attract_after,
+                       presenter=(NullPresenter(target_fps=args.present_fps) if args.headless
+                                  else CvPresenter(WINDOW_NAME, target_fps=args.present_fps)),
+                       physics=BallPhysics(speed=args.ball_speed) if args.moving_balls else None)
     try:
         game.run()
     except KeyboardInterrupt:
@@ -4,193 +4,695 @@ Manages game state, scoring, and ball color matching
 """
 
 import random
+import time
 import numpy as np
-from utils import distance_between_points
+from balls import BallStore
+from levels import LevelPack, LayoutCache, layout_key, build_layout
+from placement import PlacementError
+from selection import SelectionFSM, DWELL
+from spatial import UniformGrid, SegmentGrid
+
+class HandSession:
+    """Selection state for one hand (or player) on the shared board"""
+    
+    def __init__(self, hand_id, selector=None):
+        """
+        Args:
+            hand_id: Identifier of the hand driving this session
+            selector: SelectionFSM deciding when a hovered ball is selected
+        """
+        self.hand_id = hand_id
+        self.selector = selector if selector is not None else SelectionFSM()
+        self.cursor_pos = None
+        self.first_selected_ball = None  # First ball selected for matching
+        self.current_line = None  # Line from the selected ball to the cursor
+        self.line_valid = True  # False while current_line crosses a matched pair
+        self.combo = 0
+    
+    def update_line(self):
+        """Refresh the rubber-band line from the selected ball to the cursor"""
+        if self.first_selected_ball is not None and self.cursor_pos is not None:
+            self.current_line = (tuple(self.first_selected_ball.pos), tuple(self.cursor_pos))
+        else:
+            self.current_line = None
 
 class GameManager:
-    def __init__(self):
-        """Initialize the game manager"""
+    def __init__(self, frame_size=(1280, 720), max_hands=4, selection_mode=DWELL,
+                 dwell_time=0.3, seed=None, rng=None, recorder=None, levels=None,
+                 layout_cache=None, no_crossing=False, physics=None):
+        """
+        Initialize the game manager
+        
+        Args:
+            frame_size: (width, height) of the play field in pixels
+            max_hands: Most hands that can hold a selection at once
+            selection_mode: How a hovered ball is confirmed (see selection.py)
+            dwell_time: Seconds to rest on a ball in dwell mode
+            seed: Seed for ball colors and layout (random if not given)
+            rng: random.Random-compatible generator to use instead of a
+                 seeded one (layouts are then sampled, never cached)
+            recorder: SessionRecorder logging this session for replay
+            levels: LevelPack to play (defaults to the original progression)
+            layout_cache: LayoutCache for precomputed layouts (defaults to
+                          an in-memory cache)
+            no_crossing: Reject connections that cross a matched pair's line
+            physics: BallPhysics that keeps unmatched balls drifting and
+                     bouncing (balls stay put if not given)
+        """
+        self.frame_size = tuple(frame_size)
         self.score = 0
         self.level = 1
-        self.combo = 0
         self.max_combo = 0
         
         # Game state
-        self.balls = []
+        self.balls = BallStore()  # Positions, radii, colors and flags as arrays
+        self.ball_index = None  # Spatial index rebuilt by generate_balls
+        self.state_version = 0  # Bumped whenever the static board changes
         self.matched_pairs = []  # Pairs that have been successfully matched
-        self.current_line = None  # Current line being drawn from gesture
-        self.first_selected_ball = None  # First ball selected for matching
-        self.cursor_pos = [0, 0]
+        self.pair_lines = None  # SegmentGrid of matched-pair lines
+        
+        # Per-hand selection state
+        self.max_hands = max_hands
+        self.sessions = {}  # hand_id -> HandSession
+        self.ball_owner = {}  # ball id -> hand_id holding it as first selection
         self.active_hand_id = None
         
+        # Callbacks notified of game events: callback(event, data)
+        self.listeners = []
+        
+        # Layouts are a pure function of (level, seed, deal, frame size) so
+        # sessions can be replayed and layouts precomputed
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.rng = rng
+        self.recorder = None
+        
+        # Level definitions and their cached layouts
+        self.levels = levels if levels is not None else LevelPack.default()
+        self.layouts = layout_cache if layout_cache is not None else LayoutCache()
+        self.deals = {}  # Level number -> boards dealt for it so far this session
+        self.deal = 0  # Deal number of the current board (0 = first board of its level)
+        self.obstacles = []  # Pixel shapes kept free of balls
+        self.time_limit = None  # Seconds allowed for the current board
+        self.level_started = None  # Timestamp of the first update on this board
+        self.attract = False  # Nobody playing; the board waits for the next player
+        self.physics = physics
+        
         # Game settings
         self.ball_radius = 25
         self.selection_distance = 50  # How close to select a ball
-        self.max_balls = 6 + self.level * 2  # Always even number for pairs
+        self.selection_exit_factor = 1.3  # Hovered ball is kept until this much farther
+        self.swept_selection = True  # Also select balls passed over between updates
+        self.max_sweep = 600  # Longest cursor jump (pixels) treated as motion
+        self.selection_mode = selection_mode
+        self.dwell_time = dwell_time
+        self.no_crossing = no_crossing
+        self.pair_line_cell = 128  # SegmentGrid cell size for crossing tests
+        self.max_balls = 6 + self.level * 2  # Set from the level by generate_balls
         
         # Initialize game
         self.reset_game()
+        if recorder is not None:
+            self.start_recording(recorder)
+    
+    @property
+    def ball_positions(self):
+        """Contiguous (n, 2) ball centres"""
+        return self.balls.positions
+    
+    @property
+    def ball_matched(self):
+        """(n,) flags of balls already matched"""
+        return self.balls.matched
+    
+    @property
+    def balls_by_id(self):
+        """Balls by id (ids are indices into the store)"""
+        return self.balls
+    
+    @property
+    def combo(self):
+        """Best running combo across all hands"""
+        return max((session.combo for session in self.sessions.values()), default=0)
+    
+    @property
+    def active_session(self):
+        """Session of the most recently updated hand"""
+        return self.sessions.get(self.active_hand_id)
+    
+    @property
+    def first_selected_ball(self):
+        """First selected ball of the most recently updated hand"""
+        session = self.active_session
+        return session.first_selected_ball if session else None
+    
+    @property
+    def current_line(self):
+        """Rubber-band line of the most recently updated hand"""
+        session = self.active_session
+        return session.current_line if session else None
+    
+    @property
+    def cursor_pos(self):
+        """Cursor of the most recently updated hand"""
+        session = self.active_session
+        return session.cursor_pos if session and session.cursor_pos else [0, 0]
+    
+    def add_listener(self, callback):
+        """
+        Subscribe to game events
+        
+        Args:
+            callback: Called as callback(event, data) for 'layout', 'select',
+                      'release', 'match', 'blocked', 'level', 'timeout',
+                      'stuck', 'attract' and 'wake' events
+        """
+        self.listeners.append(callback)
+    
+    def start_recording(self, recorder):
+        """
+        Log every input and game event from now on
+        
+        Args:
+            recorder: SessionRecorder (see replay.py)
+        """
+        recorder.record('start', seed=self.seed, frame_size=list(self.frame_size),
+                        max_hands=self.max_hands, selection_mode=self.selection_mode,
+                        dwell_time=self.dwell_time, levels=self.levels.to_dict(),
+                        no_crossing=self.no_crossing,
+                        physics=self.physics.settings() if self.physics is not None else None)
+        self.recorder = recorder
+        self.add_listener(recorder.on_event(self))
+    
+    def _emit(self, event, **data):
+        """Notify listeners of a game event"""
+        for callback in self.listeners:
+            callback(event, data)
+    
+    def current_lines(self):
+        """Rubber-band lines of every hand holding a selection"""
+        return [session.current_line for session in self.sessions.values()
+                if session.current_line is not None]
     
     def reset_game(self):
         """Reset the game to initial state"""
+        if self.recorder is not None:
+            self.recorder.record('reset')
+        self._reset()
+    
+    def _reset(self):
+        """Start a new game at level 1 with a new board"""
         self.score = 0
         self.level = 1
-        self.combo = 0
         self.matched_pairs = []
-        self.first_selected_ball = None
-        self.current_line = None
+        self.sessions = {}
+        self.active_hand_id = None
         self.generate_balls()
     
-    def generate_balls(self, num_pairs=None):
-        """Generate colored ball pairs on the screen"""
-        if num_pairs is None:
-            num_pairs = self.max_balls // 2
+    def generate_balls(self, num_pairs=None, rng=None, deal=None):
+        """
+        Lay out the current level's colored ball pairs
+        
+        The layout comes from the layout cache (built on a miss), so a
+        precomputed or prefetched level starts without any sampling.
+        Each level's boards are numbered (deals) within the session, so
+        the first boards of every level can be precomputed for a seed.
+        
+        Args:
+            num_pairs: Number of color pairs (defaults to the level's)
+            rng: random.Random-compatible generator to sample the layout
+                 with instead of the cache (defaults to self.rng)
+            deal: Deal number to lay out again (defaults to the level's
+                  next deal)
+        """
+        if deal is None:
+            deal = self.deals.get(self.level, 0)
+            self.deals[self.level] = deal + 1
+        self.deal = deal
+        
+        level = self.levels.level(self.level)
+        if num_pairs is not None and num_pairs != level.pairs:
+            level = level.with_pairs(num_pairs)
+        if rng is None:
+            rng = self.rng
+        
+        try:
+            layout = self._layout(level, deal, rng)
+        except PlacementError:
+            # Obstacles leave no room for even one pair: play the level on the open frame
+            level = level.without_obstacles()
+            layout = self._layout(level, deal, rng)
         
-        self.balls = []
         self.matched_pairs = []
-        self.first_selected_ball = None
-        
-        # Color palette - each color appears twice (pairs)
-        colors = [
-            (255, 0, 0),    # Blue
-            (0, 255, 0),    # Green
-            (0, 0, 255),    # Red
-            (255, 255, 0),  # Cyan
-            (255, 0, 255),  # Magenta
-            (0, 255, 255),  # Yellow
-            (128, 0, 255),  # Purple
-            (255, 128, 0),  # Orange
-            (0, 128, 255),  # Sky Blue
-            (255, 0, 128),  # Pink
-        ]
-        
-        # Create pairs of each color
-        color_list = []
-        for i in range(num_pairs):
-            color_list.append(colors[i % len(colors)])
-            color_list.append(colors[i % len(colors)])  # Add color twice for pairs
-        
-        # Shuffle colors
-        random.shuffle(color_list)
-        
-        # Generate ball positions
-        for i, color in enumerate(color_list):
-            # Random position avoiding overlaps
-            while True:
-                x = random.randint(self.ball_radius + 50, 1280 - self.ball_radius - 50)
-                y = random.randint(self.ball_radius + 100, 720 - self.ball_radius - 50)
-                
-                # Check if position is too close to other balls
-                too_close = False
-                for ball in self.balls:
-                    dist = distance_between_points((x, y), tuple(ball['pos']))
-                    if dist < self.ball_radius * 3.5:
-                        too_close = True
-                        break
-                
-                if not too_close:
-                    break
-            
-            ball = {
-                'id': i,
-                'pos': np.array([x, y]),
-                'radius': self.ball_radius,
-                'color': color,
-                'matched': False,
-                'selected': False
-            }
-            self.balls.append(ball)
+        self.pair_lines = SegmentGrid(self.pair_line_cell)
+        self.ball_owner = {}
+        for session in self.sessions.values():
+            session.first_selected_ball = None
+            session.current_line = None
+            session.selector.reset()
+        
+        # One distinct color per pair, each appearing on two balls. Cached
+        # layouts are shared, so the board gets its own positions
+        self.balls = BallStore(layout.positions.copy(),
+                               np.full(len(layout.pairs), layout.radius),
+                               layout.pairs, level.colors())
+        self.ball_radius = layout.radius
+        self.max_balls = len(self.balls)
+        self.obstacles = level.obstacle_shapes(self.frame_size)
+        self.time_limit = level.time_limit
+        self.level_started = None
+        
+        # Moving balls get launch velocities from the same seed as the layout
+        if self.physics is not None:
+            if rng is None:
+                velocity_rng = np.random.default_rng([self.seed, self.level, deal])
+            else:
+                velocity_rng = np.random.default_rng(rng.randrange(1 << 32))
+            self.physics.launch(self.balls, velocity_rng)
+        
+        self.state_version += 1
+        self._emit('layout', positions=self.ball_positions, colors=self.balls.colors(),
+                   radius=self.ball_radius, frame_size=self.frame_size)
+        
+        # Index sized so a selection query touches at most 2x2 cells
+        self.ball_index = UniformGrid(self.ball_positions, self.selection_distance * 2)
+        
+        # Build the next level while this one is played
+        if rng is None:
+            next_level = self.levels.level(self.level + 1)
+            next_deal = self.deals.get(self.level + 1, 0)
+            self.layouts.prefetch(
+                layout_key(next_level, self.level + 1, self.frame_size, self.seed, next_deal),
+                next_level, self.frame_size)
+    
+    def _layout(self, level, deal, rng):
+        """Cached layout of a level's deal, or one sampled with rng if given"""
+        if rng is None:
+            key = layout_key(level, self.level, self.frame_size, self.seed, deal)
+            return self.layouts.get(key, level, self.frame_size)
+        return build_layout(level, self.frame_size, None, rng)
+    
+    def get_session(self, hand_id):
+        """
+        Get (or start) the session for a hand
+        
+        Returns:
+            HandSession, or None if max_hands sessions are already active
+        """
+        session = self.sessions.get(hand_id)
+        if session is None and len(self.sessions) < self.max_hands:
+            session = HandSession(hand_id, SelectionFSM(self.selection_mode, self.dwell_time))
+            self.sessions[hand_id] = session
+        return session
+    
+    def drop_hand(self, hand_id):
+        """End a hand's session and release any ball it was holding"""
+        if self.recorder is not None:
+            self.recorder.record('drop', hand=hand_id)
+        session = self.sessions.pop(hand_id, None)
+        if session is not None:
+            # The layer shows its highlight and (through the HUD) its combo
+            self._release_selection(session)
+            self.state_version += 1
+        if self.active_hand_id == hand_id:
+            self.active_hand_id = None
+    
+    def set_attract(self, active):
+        """
+        Enter or leave attract mode
+        
+        Entering (nobody in front of the camera) releases every hand's
+        selection and pauses the level timer; leaving starts a fresh game
+        if the last player made any progress, so the next one begins at
+        level 1.
+        
+        Args:
+            active: True when nobody is playing
+        """
+        if active == self.attract:
+            return
+        if self.recorder is not None:
+            self.recorder.record('attract', active=active)
+        
+        self.attract = active
+        self.level_started = None
+        if active:
+            for session in self.sessions.values():
+                self._release_selection(session)
+            self.sessions = {}
+            self.active_hand_id = None
+        elif self.score or self.level > 1 or self.matched_pairs:
+            self._reset()
+        self.state_version += 1
+        self._emit('attract' if active else 'wake')
     
     def update_cursor(self, position, hand_id):
         """Update cursor position from hand gesture"""
-        self.cursor_pos = list(position)
-        self.active_hand_id = hand_id
+        self.update_cursors([(position, hand_id)])
+    
+    def update_cursors(self, gesture_points, gestures=None, timestamp=None):
+        """
+        Update every hand's cursor for one frame and resolve selections
         
-        # Update the line being drawn
-        if self.first_selected_ball is not None:
-            self.current_line = (tuple(self.first_selected_ball['pos']), tuple(self.cursor_pos))
+        Each hand's SelectionFSM decides whether the ball under its cursor
+        is selected this frame. Confirmed hits are then resolved in a fixed
+        order (closest cursor first, then lowest hand id), and a ball used by
+        one hand this frame cannot be used by another, so two hands reaching
+        the same ball resolve the same way every time.
         
-        # Check if cursor is near any ball to select it
-        self.check_ball_selection()
-    
-    def check_ball_selection(self):
-        """Check if cursor is near a ball and select/match it"""
-        for ball in self.balls:
-            if ball['matched']:  # Skip already matched balls
+        Args:
+            gesture_points: List of (position, hand_id) for this frame
+            gestures: Optional dict of hand_id -> (pinch_ratio, pointing)
+                      from a fresh detection (omit on predicted frames)
+            timestamp: Frame time in seconds (defaults to now)
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        
+        if self.recorder is not None:
+            record = {'t': timestamp,
+                      'p': [[int(hand_id), float(position[0]), float(position[1])]
+                            for position, hand_id in gesture_points]}
+            if gestures:
+                record['g'] = [[int(hand_id), float(pinch), bool(pointing)]
+                               for hand_id, (pinch, pointing) in gestures.items()]
+            self.recorder.record('cursors', **record)
+        
+        # Boards with a time limit are re-dealt when it runs out
+        if self.time_limit is not None:
+            if self.level_started is None:
+                self.level_started = timestamp
+            elif timestamp - self.level_started >= self.time_limit:
+                self.redeal('timeout')
+        
+        hits = []
+        for position, hand_id in gesture_points:
+            session = self.get_session(hand_id)
+            if session is None:
                 continue
             
-            dist = distance_between_points(
-                tuple(self.cursor_pos),
-                tuple(ball['pos'])
-            )
+            previous = session.cursor_pos
+            session.cursor_pos = list(position)
+            self.active_hand_id = hand_id
+            signals = gestures.get(hand_id, (None, None)) if gestures else (None, None)
+            
+            # Balls the cursor passed over since the last update, in path
+            # order, so a fast hand at a low frame rate cannot skip them.
+            # Gesture signals are fed to the selector once per frame
+            if previous is not None and self.swept_selection and session.selector.selects_on_contact:
+                for hit in self.swept_hits(session, previous):
+                    if session.selector.update(hit[4].id, timestamp, *signals):
+                        hits.append(hit)
+                    signals = (None, None)
+            
+            # Check if cursor is near any ball, then whether that counts as selecting it
+            hit = self.check_ball_selection(session)
+            target = hit[3].id if hit is not None else None
+            if session.selector.update(target, timestamp, *signals):
+                hits.append((1.0,) + hit)
+        
+        # Earliest along each path first, then closest cursor, then lowest hand id
+        hits.sort(key=lambda hit: hit[:3])
+        used_balls = set()
+        board = self.balls
+        
+        for _, _, _, session, ball in hits:
+            # A level-up or re-deal replaced the board; remaining hits are stale
+            if self.balls is not board:
+                break
+            if ball.id in used_balls or self.ball_matched[ball.id]:
+                # Another hand got there first; keep hovering
+                if session.selector.target == ball.id:
+                    session.selector.cancel(timestamp)
+                continue
             
-            if dist < self.selection_distance:
-                # First ball selection
-                if self.first_selected_ball is None:
-                    self.first_selected_ball = ball
-                    ball['selected'] = True
-                # Second ball selection - attempt match
-                elif self.first_selected_ball['id'] != ball['id']:
-                    self.attempt_match(ball)
-    
-    def attempt_match(self, second_ball):
+            used_balls.add(ball.id)
+            if session.first_selected_ball is not None:
+                used_balls.add(session.first_selected_ball.id)
+            self.apply_selection(session, ball)
+        
+        # Update the lines being drawn, flagging those that would cross a pair
+        for position, hand_id in gesture_points:
+            session = self.sessions.get(hand_id)
+            if session is not None:
+                session.update_line()
+                if self.no_crossing and session.current_line is not None:
+                    session.line_valid = not self.pair_lines.crosses(*session.current_line)
+    
+    def check_ball_selection(self, session):
+        """
+        Find the ball a hand's cursor is selecting
+        
+        The ball already hovered stays the target until the cursor moves
+        selection_exit_factor times farther than the selection distance, so
+        a cursor jittering on the boundary does not restart the hover.
+        
+        Returns:
+            Tuple (distance, hand_id, session, ball), or None if the cursor is
+            not over a ball this hand may use
+        """
+        index = None
+        hovered = session.selector.target
+        if hovered is not None and hovered < len(self.balls) and not self.ball_matched[hovered]:
+            offset = self.ball_positions[hovered] - session.cursor_pos
+            if np.hypot(offset[0], offset[1]) <= self.selection_distance * self.selection_exit_factor:
+                index = hovered
+        
+        if index is None:
+            index = self.ball_index.nearest_within(
+                session.cursor_pos, self.selection_distance, exclude=self.ball_matched)
+        if index is None:
+            return None
+        
+        if not self.can_select(session, index):
+            return None
+        
+        offset = self.ball_positions[index] - session.cursor_pos
+        return (float(np.hypot(offset[0], offset[1])), session.hand_id, session, self.balls[index])
+    
+    def can_select(self, session, index):
+        """Whether a hand may select a ball (it is not held elsewhere or already its selection)"""
+        # Balls held by another hand are locked to that hand
+        owner = self.ball_owner.get(index)
+        if owner is not None and owner != session.hand_id:
+            return False
+        
+        # Hovering the already selected ball does nothing
+        first = session.first_selected_ball
+        return first is None or first.id != index
+    
+    def swept_hits(self, session, start):
+        """
+        Balls the cursor passed over on its way from start to its current position
+        
+        Tests the capsule swept by the selection radius along the segment
+        against the balls in the grid cells it overlaps, so the cost depends
+        on the path length rather than the number of balls. Jumps longer
+        than max_sweep (e.g. a hand re-acquired elsewhere) are not swept.
+        
+        Returns:
+            List of (t, distance, hand_id, session, ball) in path order,
+            where t is the fraction of the path at which the cursor entered
+            the ball's selection radius and distance is the closest approach
+        """
+        start = np.asarray(start, dtype=np.float64)
+        end = np.asarray(session.cursor_pos, dtype=np.float64)
+        delta = end - start
+        length_sq = float(delta @ delta)
+        if length_sq == 0 or length_sq > self.max_sweep * self.max_sweep:
+            return []
+        
+        radius = self.selection_distance
+        indices = self.ball_index.candidates(min(start[0], end[0]) - radius,
+                                             min(start[1], end[1]) - radius,
+                                             max(start[0], end[0]) + radius,
+                                             max(start[1], end[1]) + radius)
+        indices = indices[~self.ball_matched[indices]]
+        if len(indices) == 0:
+            return []
+        
+        # Closest point on the segment to each ball centre
+        relative = self.ball_positions[indices] - start
+        along = relative @ delta / length_sq
+        closest = relative - np.clip(along, 0.0, 1.0)[:, None] * delta
+        distance_sq = np.einsum('ij,ij->i', closest, closest)
+        inside = distance_sq <= radius * radius
+        if not inside.any():
+            return []
+        
+        # Where the path enters each ball's selection circle
+        indices, along, distance_sq = indices[inside], along[inside], distance_sq[inside]
+        perpendicular_sq = np.maximum(
+            np.einsum('ij,ij->i', relative[inside], relative[inside]) - along * along * length_sq, 0.0)
+        entry = np.clip(along - np.sqrt(radius * radius - np.minimum(perpendicular_sq, radius * radius))
+                        / np.sqrt(length_sq), 0.0, 1.0)
+        
+        order = np.lexsort((indices, entry))
+        return [(t, float(np.sqrt(d)), session.hand_id, session, self.balls[index])
+                for t, d, index in zip(entry[order].tolist(), distance_sq[order].tolist(),
+                                       indices[order].tolist())
+                if self.can_select(session, index)]
+    
+    def apply_selection(self, session, ball):
+        """Select a ball for a hand, or try to match it with its selection"""
+        # First ball selection
+        if session.first_selected_ball is None:
+            session.first_selected_ball = ball
+            self.balls.selected[ball.id] = True
+            self.ball_owner[ball.id] = session.hand_id
+            self.state_version += 1
+            self._emit('select', hand_id=session.hand_id, ball_id=ball.id)
+        # Second ball selection - attempt match
+        else:
+            self.attempt_match(session, ball)
+    
+    def attempt_match(self, session, second_ball):
         """Attempt to match two balls"""
-        first_ball = self.first_selected_ball
+        first_ball = session.first_selected_ball
         
         # Check if colors match
-        if first_ball['color'] == second_ball['color']:
+        color_ids = self.balls.color_ids
+        if color_ids[first_ball.id] == color_ids[second_ball.id]:
+            if self.no_crossing and self.pair_lines.crosses(first_ball.pos, second_ball.pos):
+                # Right color, but the line would cross a matched pair
+                self._emit('blocked', hand_id=session.hand_id,
+                           ball1_id=first_ball.id, ball2_id=second_ball.id)
+                self.reset_selection(session)
+                return
+            
             # Successful match!
-            self.match_pair(first_ball, second_ball)
+            self.match_pair(session, first_ball, second_ball)
         else:
             # Wrong color, reset selection
-            self.reset_selection()
+            self.reset_selection(session)
     
-    def match_pair(self, ball1, ball2):
+    def match_pair(self, session, ball1, ball2):
         """Mark a matched pair and update score"""
-        ball1['matched'] = True
-        ball2['matched'] = True
+        self.balls.matched[[ball1.id, ball2.id]] = True
         
         # Add to matched pairs list
         self.matched_pairs.append({
-            'ball1_id': ball1['id'],
-            'ball2_id': ball2['id'],
-            'color': ball1['color']
+            'ball1_id': ball1.id,
+            'ball2_id': ball2.id,
+            'color': ball1.color
         })
+        self.pair_lines.insert(ball1.pos, ball2.pos)
         
         # Update score
-        self.combo += 1
+        session.combo += 1
         base_points = 200
-        self.score += base_points * self.combo
+        self.score += base_points * session.combo
+        self._emit('match', hand_id=session.hand_id,
+                   ball1_id=ball1.id, ball2_id=ball2.id)
         
         # Reset current line
-        self.current_line = None
-        self.first_selected_ball = None
+        self._release_selection(session)
+        self.state_version += 1
         
         # Check if level complete
         if len(self.matched_pairs) == len(self.balls) // 2:
             self.level_complete()
+        elif self.no_crossing and not self.has_valid_move():
+            self.redeal('stuck')
     
-    def reset_selection(self):
-        """Reset the current selection"""
-        if self.first_selected_ball:
-            self.first_selected_ball['selected'] = False
+    def reset_selection(self, session):
+        """Reset a hand's current selection"""
+        self._release_selection(session)
+        session.combo = 0  # Reset combo on wrong match
+        self.state_version += 1
+    
+    def _release_selection(self, session):
+        """Clear a hand's selected ball and rubber-band line"""
+        ball = session.first_selected_ball
+        if ball is not None:
+            self.balls.selected[ball.id] = False
+            self.ball_owner.pop(ball.id, None)
+            self._emit('release', hand_id=session.hand_id, ball_id=ball.id)
         
-        self.first_selected_ball = None
-        self.current_line = None
-        self.combo = 0  # Reset combo on wrong match
+        session.first_selected_ball = None
+        session.current_line = None
     
     def level_complete(self):
         """Handle level completion"""
         self.max_combo = max(self.max_combo, self.combo)
         self.level += 1
-        self.max_balls = 6 + self.level * 2  # Ensure even number
         self.score += 500 * self.level  # Bonus for level completion
+        self._emit('level', level=self.level)
         
         # Generate new balls
-        self.generate_balls(self.max_balls // 2)
-        self.combo = 0
+        self.generate_balls()
+        for session in self.sessions.values():
+            session.combo = 0
+        self.state_version += 1
     
-    def update(self, frame_shape):
-        """Update game state"""
-        # Game updates happen in real-time via gesture tracking
-        pass
+    def has_valid_move(self):
+        """Whether any unmatched pair can still be joined without crossing a line"""
+        # Sorting the unmatched balls by color puts each pair side by side
+        unmatched = self.balls.unmatched()
+        pairs = unmatched[np.argsort(self.balls.color_ids[unmatched], kind='stable')].reshape(-1, 2)
+        positions = self.ball_positions
+        return any(not self.pair_lines.crosses(positions[a], positions[b])
+                   for a, b in pairs.tolist())
+    
+    def redeal(self, reason):
+        """
+        Deal a new board for the current level
+        
+        Args:
+            reason: Event emitted first ('timeout' when the time limit ran
+                    out, 'stuck' when no pair can be joined any more)
+        """
+        self._emit(reason, level=self.level)
+        self.generate_balls()
+        for session in self.sessions.values():
+            session.combo = 0
+        self.state_version += 1
+    
+    def time_remaining(self, timestamp):
+        """Seconds left on the current board, or None without a time limit"""
+        if self.time_limit is None:
+            return None
+        if self.level_started is None:
+            return self.time_limit
+        return max(self.time_limit - (timestamp - self.level_started), 0.0)
+    
+    def update(self, frame_shape, timestamp=None):
+        """
+        Update game state once per frame
+        
+        Args:
+            frame_shape: Shape of the camera frame
+            timestamp: Frame time in seconds (defaults to now)
+        """
+        self.resize(frame_shape)
+        if self.physics is not None:
+            self.advance(timestamp if timestamp is not None else time.perf_counter())
+    
+    def advance(self, timestamp):
+        """
+        Move the balls up to a frame time in fixed physics steps
+        
+        Args:
+            timestamp: Frame time in seconds
+        """
+        if self.recorder is not None:
+            self.recorder.record('tick', t=timestamp)
+        if not self.physics.advance(self.balls, self.frame_size, self.obstacles, timestamp):
+            return
+        
+        # Selection queries and rubber bands follow the balls (the renderer
+        # draws moving balls every frame, so state_version is left alone)
+        self.ball_index = UniformGrid(self.ball_positions, self.selection_distance * 2)
+        for session in self.sessions.values():
+            session.update_line()
+    
+    def resize(self, frame_shape):
+        """Follow a change of camera frame size"""
+        frame_size = (frame_shape[1], frame_shape[0])
+        if frame_size != self.frame_size:
+            if self.recorder is not None:
+                self.recorder.record('resize', shape=list(frame_shape[:2]))
+            self.frame_size = frame_size
+            
+            # Re-layout the same deal for the real frame size if nobody has played yet
+            if not self.matched_pairs and not self.ball_owner:
+                self.generate_balls(deal=self.deal)
@@ -3,178 +3,282 @@ Gesture Detection Module
 Detects hand gestures and extracts key points using MediaPipe
 """
 
+import threading
+import time
 import cv2
-import mediapipe as mp
 import numpy as np
-from utils import distance_between_points
+from buffers import FrameBuffers
+from landmarks import HandLandmarks, classify_gestures
+from profiler import NULL_PROFILER
+from utils import clamp
 
 class GestureDetector:
-    def __init__(self):
-        """Initialize MediaPipe hand detection"""
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
+    def __init__(self, inference_scale=1.0, roi_tracking=False, roi_margin=0.3,
+                 roi_refresh_interval=30, max_num_hands=2, mirror=True):
+        """
+        Configure MediaPipe hand detection
+        
+        The model is not built here: call load() (or load_async() to build
+        it on a background thread), otherwise the first detect_hands() call
+        loads it. mediapipe itself is only imported at that point.
+        
+        Args:
+            inference_scale: Downsample factor applied before inference
+                             (landmarks are mapped back to full resolution)
+            roi_tracking: Crop inference to the area around the hands found
+                          in the previous frame
+            roi_margin: Padding around the tracked hands, as a fraction of
+                        their bounding box size
+            roi_refresh_interval: Run a full-frame detection every this many
+                                  frames so new hands entering are found
+            max_num_hands: Maximum number of hands to detect
+            mirror: Frames are passed in as captured (not flipped) and
+                    landmarks are returned mirrored for the selfie view,
+                    so only the displayed frame needs flipping
+        """
+        self.max_num_hands = max_num_hands
+        self.mp_hands = None
+        self.hands = None  # Built by load()
+        self.load_lock = threading.Lock()
+        self.load_thread = None
+        self.load_error = None
+        self.load_times = {}  # 'import' / 'model' seconds, filled by load()
         
         # Gesture thresholds
         self.pointer_threshold = 0.05  # Distance threshold for pointer detection
         self.palm_threshold = 100  # Pixel threshold for palm open/closed
         
+        # Reduced-resolution / ROI inference
+        self.inference_scale = inference_scale
+        self.roi_tracking = roi_tracking
+        self.roi_margin = roi_margin
+        self.roi_refresh_interval = roi_refresh_interval
+        self.roi_min_size = 256  # Smallest crop side in pixels
+        self.roi = None  # (x0, y0, x1, y1) crop for the next frame
+        self.frames_since_full = 0
+        
+        # Mirroring is folded into the landmark mapping
+        self.mirror = mirror
+        
+        # Resize / RGB scratch buffers reused across frames
+        self.buffers = FrameBuffers()
+        
+        # Stage timing hooks (GestureGame installs its profiler here)
+        self.profiler = NULL_PROFILER
+        
+    @property
+    def ready(self):
+        """Whether the model is loaded and detect_hands() will run inference"""
+        return self.hands is not None
+    
+    @property
+    def loading(self):
+        """Whether a background load is still running (or failed, see load_error)"""
+        return self.hands is None and self.load_thread is not None
+    
+    def load(self):
+        """Import mediapipe and build the hand tracking graph (idempotent)"""
+        with self.load_lock:
+            if self.hands is not None:
+                return
+            
+            start = time.perf_counter()
+            import mediapipe as mp
+            self.load_times['import'] = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            self.mp_hands = mp.solutions.hands
+            hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=self.max_num_hands,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.5
+            )
+            self.load_times['model'] = time.perf_counter() - start
+            self.hands = hands
+    
+    def load_async(self):
+        """Start loading the model on a background thread"""
+        if self.hands is not None or self.load_thread is not None:
+            return
+        self.load_thread = threading.Thread(target=self._load_in_background,
+                                            name="model-load", daemon=True)
+        self.load_thread.start()
+    
+    def _load_in_background(self):
+        try:
+            self.load()
+        except Exception as e:
+            self.load_error = e
+    
     def detect_hands(self, frame):
         """
         Detect hands and landmarks in the frame
         
         Args:
-            frame: Input video frame (BGR)
+            frame: Input video frame (BGR), unflipped when mirror is set
             
         Returns:
-            hand_landmarks: List of hand landmark coordinates
+            hand_landmarks: HandLandmarks in (display) frame pixel coordinates
             handedness: List of hand labels ('Left' or 'Right')
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        if self.hands is None:
+            if self.load_thread is not None:
+                # Still loading in the background; report no hands meanwhile
+                if self.load_error is not None:
+                    raise RuntimeError(f"Hand tracking model failed to load: {self.load_error}")
+                return HandLandmarks(), []
+            self.load()
+        
+        h, w, _ = frame.shape
+        
+        region = None
+        if self.roi_tracking and self.frames_since_full < self.roi_refresh_interval:
+            region = self.roi
         
-        hand_landmarks = []
-        handedness = []
+        hand_landmarks, handedness = self._detect_in_region(frame, region)
         
-        if results.multi_hand_landmarks:
-            h, w, _ = frame.shape
+        # Tracking lost inside the crop, fall back to the full frame
+        if region is not None and not hand_landmarks:
+            region = None
+            hand_landmarks, handedness = self._detect_in_region(frame, None)
+        
+        if region is None:
+            self.frames_since_full = 0
+        else:
+            self.frames_since_full += 1
+        
+        if self.roi_tracking:
+            self.roi = self._hands_roi(hand_landmarks, w, h)
+        
+        return hand_landmarks, handedness
+    
+    def _detect_in_region(self, frame, region):
+        """
+        Run inference on a region of the frame
+        
+        Args:
+            frame: Full-resolution BGR frame
+            region: (x0, y0, x1, y1) crop in frame coordinates, or None for
+                    the whole frame
             
-            for hand_lm, hand_info in zip(
-                results.multi_hand_landmarks, 
-                results.multi_handedness
-            ):
-                # Extract landmark coordinates
-                landmarks = []
-                for lm in hand_lm.landmark:
-                    x = int(lm.x * w)
-                    y = int(lm.y * h)
-                    landmarks.append((x, y))
-                
-                hand_landmarks.append(landmarks)
-                handedness.append(hand_info.classification[0].label)
+        Returns:
+            hand_landmarks and handedness in full-frame pixel coordinates
+        """
+        h, w, _ = frame.shape
+        x0, y0, x1, y1 = region if region is not None else (0, 0, w, h)
+        image = frame[y0:y1, x0:x1]
+        
+        if self.inference_scale != 1.0:
+            size = (max(1, round((x1 - x0) * self.inference_scale)),
+                    max(1, round((y1 - y0) * self.inference_scale)))
+            with self.profiler.stage('resize'):
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA,
+                                   dst=self.buffers.get('resize', (size[1], size[0], 3)))
+        
+        # Convert BGR to RGB into a reused buffer
+        with self.profiler.stage('cvtColor'):
+            rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB,
+                                     dst=self.buffers.get('rgb', image.shape))
+        
+        # Read-only lets MediaPipe wrap the buffer without copying it
+        rgb_frame.flags.writeable = False
+        with self.profiler.stage('Hands.process'):
+            results = self.hands.process(rgb_frame)
+        rgb_frame.flags.writeable = True
+        
+        if not results.multi_hand_landmarks:
+            return HandLandmarks(), []
+        
+        # Normalized landmarks are relative to the (possibly scaled) crop
+        with self.profiler.stage('landmarks'):
+            hand_landmarks = HandLandmarks.from_mediapipe(
+                results.multi_hand_landmarks, (x0, y0, x1, y1),
+                mirror_width=w if self.mirror else None)
+            handedness = [hand_info.classification[0].label
+                          for hand_info in results.multi_handedness]
+            if self.mirror:
+                # MediaPipe labels hands assuming a mirrored input image
+                handedness = ['Left' if label == 'Right' else 'Right' for label in handedness]
         
         return hand_landmarks, handedness
     
+    def _hands_roi(self, hand_landmarks, frame_w, frame_h):
+        """
+        Compute the crop to search in the next frame
+        
+        Returns:
+            (x0, y0, x1, y1) padded box around all hands in the coordinates
+            of the frame passed to detect_hands, or None when no hand is
+            being tracked
+        """
+        if not hand_landmarks:
+            return None
+        
+        xy = hand_landmarks.xy.reshape(-1, 2)
+        min_x, min_y = xy.min(axis=0)
+        max_x, max_y = xy.max(axis=0)
+        
+        # Pad the box and keep it large enough for the palm detector
+        half_w = max((max_x - min_x) * (0.5 + self.roi_margin), self.roi_min_size / 2)
+        half_h = max((max_y - min_y) * (0.5 + self.roi_margin), self.roi_min_size / 2)
+        cx = (min_x + max_x) / 2
+        cy = (min_y + max_y) / 2
+        
+        x0 = int(clamp(cx - half_w, 0, frame_w))
+        x1 = int(clamp(cx + half_w, 0, frame_w))
+        y0 = int(clamp(cy - half_h, 0, frame_h))
+        y1 = int(clamp(cy + half_h, 0, frame_h))
+        
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        if self.mirror:
+            # Landmarks are mirrored, the frame we crop next is not
+            x0, x1 = frame_w - x1, frame_w - x0
+        return (x0, y0, x1, y1)
+    
     def get_gesture_points(self, hand_landmarks):
         """
         Extract gesture points (fingertips, palm center, etc.)
         
         Args:
-            hand_landmarks: List of hand landmark coordinates
+            hand_landmarks: HandLandmarks for the frame
             
         Returns:
             List of tuples (point, hand_id)
         """
-        gesture_points = []
-        
         if not hand_landmarks:
-            return gesture_points
-        
-        # MediaPipe hand landmarks indices
-        THUMB_TIP = 4
-        INDEX_FINGER_TIP = 8
-        MIDDLE_FINGER_TIP = 12
-        RING_FINGER_TIP = 16
-        PINKY_TIP = 20
-        PALM_CENTER = 9
-        
-        for hand_id, landmarks in enumerate(hand_landmarks):
-            # Get key points (fingertips)
-            fingertips = [
-                landmarks[THUMB_TIP],
-                landmarks[INDEX_FINGER_TIP],
-                landmarks[MIDDLE_FINGER_TIP],
-                landmarks[RING_FINGER_TIP],
-                landmarks[PINKY_TIP]
-            ]
-            
-            # Use index finger tip as primary pointer
-            pointer = landmarks[INDEX_FINGER_TIP]
-            gesture_points.append((pointer, hand_id))
-            
-        return gesture_points
+            return []
+        
+        # Use index finger tip as primary pointer
+        return [(pointer, hand_id)
+                for hand_id, pointer in enumerate(hand_landmarks.pointers())]
     
     def detect_gesture(self, hand_landmarks):
         """
         Detect specific gestures (pointing, open hand, fist, etc.)
         
         Args:
-            hand_landmarks: List of hand landmark coordinates
+            hand_landmarks: HandLandmarks for the frame
             
         Returns:
-            Dictionary with gesture information
+            Dictionary with gesture information (True if any hand shows it)
         """
         if not hand_landmarks:
             return None
         
-        # Landmark indices
-        THUMB_IP = 2
-        THUMB_TIP = 4
-        INDEX_MCP = 5
-        INDEX_PIP = 6
-        INDEX_DIP = 7
-        INDEX_FINGER_TIP = 8
-        MIDDLE_PIP = 10
-        MIDDLE_FINGER_TIP = 12
-        RING_PIP = 14
-        RING_FINGER_TIP = 16
-        PINKY_PIP = 18
-        PINKY_TIP = 20
-        WRIST = 0
-        
-        gestures = {
-            'pointing': False,
-            'open_hand': False,
-            'fist': False,
-            'two_finger_point': False,
-            'peace': False
+        gestures = classify_gestures(hand_landmarks)
+        return {
+            'pointing': bool(gestures['pointing'].any()),
+            'open_hand': bool(gestures['open_hand'].any()),
+            'fist': bool(gestures['fist'].any()),
+            'two_finger_point': bool(gestures['two_finger_point'].any()),
+            'peace': bool(gestures['peace'].any())
         }
-        
-        for landmarks in hand_landmarks:
-            # Calculate finger distances
-            index_extended = distance_between_points(
-                landmarks[INDEX_FINGER_TIP],
-                landmarks[INDEX_PIP]
-            ) > distance_between_points(
-                landmarks[INDEX_PIP],
-                landmarks[INDEX_MCP]
-            )
-            
-            middle_extended = distance_between_points(
-                landmarks[MIDDLE_FINGER_TIP],
-                landmarks[MIDDLE_PIP]
-            ) > distance_between_points(
-                landmarks[MIDDLE_PIP],
-                landmarks[5]  # MCP
-            )
-            
-            # Pointing gesture (index extended, others folded)
-            if index_extended and not middle_extended:
-                gestures['pointing'] = True
-            
-            # Peace gesture (index and middle extended)
-            if index_extended and middle_extended:
-                gestures['peace'] = True
-            
-            # Open hand (all fingers extended)
-            all_extended = True
-            for tip_idx in [THUMB_TIP, INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, 
-                           RING_FINGER_TIP, PINKY_TIP]:
-                if distance_between_points(landmarks[tip_idx], landmarks[WRIST]) < 50:
-                    all_extended = False
-            
-            if all_extended:
-                gestures['open_hand'] = True
-        
-        return gestures
     
     def release(self):
         """Release resources"""
-        self.hands.close()
+        if self.load_thread is not None:
+            self.load_thread.join()
+        if self.hands is not None:
+            self.hands.close()
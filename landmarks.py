@@ -0,0 +1,174 @@
+"""
+Hand Landmarks Module
+Compact NumPy container for the hand landmarks detected in one frame
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+PALM_CENTER = 9
+MIDDLE_FINGER_TIP = 12
+RING_FINGER_TIP = 16
+PINKY_TIP = 20
+
+# Per-finger joints (thumb, index, middle, ring, pinky) for batched math
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])
+FINGER_MCPS = np.array([2, 5, 9, 13, 17])
+
+# Bone topology (same edges as mediapipe.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),  # Index
+    (5, 9), (9, 10), (10, 11), (11, 12),  # Middle
+    (9, 13), (13, 14), (14, 15), (15, 16),  # Ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky and palm
+])
+
+
+class HandLandmarks:
+    """
+    Landmarks for every hand in a frame
+
+    points has shape (hands, 21, 3) holding x, y in frame pixels and z in
+    the same pixel scale as x; visibility has shape (hands, 21). Indexing
+    or iterating yields the (21, 2) x/y view of each hand, so code written
+    against lists of (x, y) points keeps working.
+    """
+
+    def __init__(self, points=None, visibility=None):
+        """
+        Args:
+            points: Float array of shape (hands, 21, 3)
+            visibility: Float array of shape (hands, 21), defaults to ones
+        """
+        if points is None:
+            points = np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+        if visibility is None:
+            visibility = np.ones(points.shape[:2], dtype=np.float32)
+
+        self.points = points
+        self.visibility = visibility
+
+    @classmethod
+    def from_mediapipe(cls, multi_hand_landmarks, region, mirror_width=None):
+        """
+        Convert MediaPipe results in one pass over all hands
+
+        Args:
+            multi_hand_landmarks: results.multi_hand_landmarks from Hands.process
+            region: (x0, y0, x1, y1) area of the frame the inference ran on
+            mirror_width: If set, the inference ran on an unmirrored frame of
+                          this width and x is mirrored (x -> width - x) so the
+                          landmarks match the horizontally flipped display
+
+        Returns:
+            HandLandmarks in full-frame pixel coordinates
+        """
+        num_hands = len(multi_hand_landmarks)
+        raw = np.fromiter(
+            (value
+             for hand_lm in multi_hand_landmarks
+             for lm in hand_lm.landmark
+             for value in (lm.x, lm.y, lm.z, lm.visibility)),
+            dtype=np.float32,
+            count=num_hands * NUM_LANDMARKS * 4,
+        ).reshape(num_hands, NUM_LANDMARKS, 4)
+
+        # Normalized coordinates are relative to the inference region
+        x0, y0, x1, y1 = region
+        scale = np.array([x1 - x0, y1 - y0, x1 - x0], dtype=np.float32)
+        offset = np.array([x0, y0, 0], dtype=np.float32)
+        if mirror_width is not None:
+            # Fold the selfie-view flip into the same affine mapping
+            scale[0] = -scale[0]
+            offset[0] = mirror_width - x0
+        points = raw[:, :, :3] * scale + offset
+        return cls(points, raw[:, :, 3].copy())
+
+    @classmethod
+    def from_lists(cls, hands):
+        """
+        Build from nested lists of (x, y) or (x, y, z) points per hand
+
+        Args:
+            hands: List of hands, each a list of 21 points
+        """
+        if not hands:
+            return cls()
+
+        points = np.zeros((len(hands), NUM_LANDMARKS, 3), dtype=np.float32)
+        for i, hand in enumerate(hands):
+            hand = np.asarray(hand, dtype=np.float32)
+            points[i, :, :hand.shape[1]] = hand
+        return cls(points)
+
+    @property
+    def xy(self):
+        """(hands, 21, 2) view of the pixel coordinates"""
+        return self.points[:, :, :2]
+
+    def pointers(self):
+        """(hands, 2) index fingertip positions"""
+        return self.points[:, INDEX_FINGER_TIP, :2]
+
+    def __len__(self):
+        return self.points.shape[0]
+
+    def __bool__(self):
+        return self.points.shape[0] > 0
+
+    def __getitem__(self, hand_id):
+        return self.points[hand_id, :, :2]
+
+    def __iter__(self):
+        return iter(self.points[:, :, :2])
+
+
+def classify_gestures(hand_landmarks, open_hand_distance=50):
+    """
+    Classify gestures for all hands with batched array math
+
+    Args:
+        hand_landmarks: HandLandmarks for the frame
+        open_hand_distance: Minimum fingertip-to-wrist pixel distance for
+                            a finger to count towards an open hand
+
+    Returns:
+        Dictionary of boolean arrays of shape (hands,) per gesture, plus
+        'extended' with shape (hands, 5) for thumb..pinky and 'pinch_ratio',
+        the thumb-to-index tip distance relative to palm length
+    """
+    xy = hand_landmarks.xy
+    tips = xy[:, FINGER_TIPS]
+    pips = xy[:, FINGER_PIPS]
+    mcps = xy[:, FINGER_MCPS]
+
+    # A finger is extended when its last segment is longer than the one below
+    tip_to_pip = np.linalg.norm(tips - pips, axis=2)
+    pip_to_mcp = np.linalg.norm(pips - mcps, axis=2)
+    extended = tip_to_pip > pip_to_mcp
+
+    tip_to_wrist = np.linalg.norm(tips - xy[:, WRIST:WRIST + 1], axis=2)
+
+    # Scale-free pinch measure (palm length = wrist to middle knuckle)
+    palm = np.linalg.norm(xy[:, PALM_CENTER] - xy[:, WRIST], axis=1)
+    pinch = np.linalg.norm(xy[:, THUMB_TIP] - xy[:, INDEX_FINGER_TIP], axis=1)
+    pinch_ratio = pinch / np.maximum(palm, 1.0)
+
+    index = extended[:, 1]
+    middle = extended[:, 2]
+    return {
+        'extended': extended,
+        'pointing': index & ~middle,
+        'peace': index & middle,
+        'two_finger_point': index & middle & ~extended[:, 3] & ~extended[:, 4],
+        'open_hand': (tip_to_wrist >= open_hand_distance).all(axis=1),
+        'fist': ~extended[:, 1:].any(axis=1),
+        'pinch_ratio': pinch_ratio,
+    }
@@ -0,0 +1,610 @@
+"""
+Level Definitions
+Declarative level packs (JSON or TOML), a perceptual palette generator and
+an on-disk cache of precomputed ball layouts
+
+A pack lists levels in order; levels past the end repeat the last one with
+pairs_step more pairs each time:
+
+    {
+        "name": "expo",
+        "pairs_step": 1,
+        "levels": [
+            {"pairs": 4},
+            {"pairs": 6, "radius": 22, "time_limit": 45},
+            {"pairs": 8, "seed": 7,
+             "obstacles": [{"rect": [0.4, 0.3, 0.2, 0.4]}]}
+        ]
+    }
+
+Examples:
+    python levels.py expo.json --precompute --seeds 1 2 3 --deals 2 --size 1280x720
+    python levels.py --palette 24
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import cv2
+from placement import place_balls, PlacementError
+
+# Original hand-picked colors (BGR), kept as the start of every generated palette
+BASE_PALETTE = (
+    (255, 0, 0),    # Blue
+    (0, 255, 0),    # Green
+    (0, 0, 255),    # Red
+    (255, 255, 0),  # Cyan
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Yellow
+    (128, 0, 255),  # Purple
+    (255, 128, 0),  # Orange
+    (0, 128, 255),  # Sky Blue
+    (255, 0, 128),  # Pink
+)
+
+# Smallest radius levels shrink to when their balls do not fit the frame
+MIN_RADIUS = 12
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'gesture-game', 'layouts')
+
+
+def _lab(colors):
+    """CIELAB coordinates of (n, 3) uint8 BGR colors"""
+    bgr = np.asarray(colors, dtype=np.float32).reshape(-1, 1, 3) / 255.0
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2Lab).reshape(-1, 3)
+
+
+def _palette_candidates(step=16, min_lightness=35.0, min_chroma=25.0):
+    """BGR grid colors bright and saturated enough to read as a ball color"""
+    levels = np.arange(0, 256, step)
+    levels[-1] = 255
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+    lab = _lab(grid)
+    chroma = np.hypot(lab[:, 1], lab[:, 2])
+    keep = (lab[:, 0] >= min_lightness) & (chroma >= min_chroma)
+    return grid[keep], lab[keep]
+
+
+_PALETTE_CACHE = {}
+
+
+def generate_palette(count, base=BASE_PALETTE):
+    """
+    Build a palette of perceptually distinct colors
+
+    Starts from base and greedily adds the candidate color farthest (in
+    CIELAB) from every color chosen so far, so each new color is as easy to
+    tell apart from the others as the remaining gamut allows. Dark and grey
+    candidates are excluded so balls stay visible against the camera image
+    and the white selection ring.
+
+    Args:
+        count: Number of colors needed
+        base: Colors (BGR) used first, in order
+
+    Returns:
+        List of count distinct BGR tuples
+
+    Raises:
+        ValueError: If more colors are requested than the candidate gamut holds
+    """
+    base = tuple(tuple(int(c) for c in color) for color in base)
+    key = (count, base)
+    palette = _PALETTE_CACHE.get(key)
+    if palette is not None:
+        return list(palette)
+
+    palette = list(dict.fromkeys(base))[:count]
+    if len(palette) < count:
+        candidates, candidate_lab = _palette_candidates()
+        if count - len(palette) > len(candidates):
+            raise ValueError(f"Cannot generate {count} distinct colors")
+
+        # Distance from each candidate to its nearest chosen color
+        nearest = np.full(len(candidates), np.inf)
+        if palette:
+            chosen = _lab(palette)
+            nearest = np.linalg.norm(candidate_lab[:, None] - chosen[None], axis=2).min(axis=1)
+
+        while len(palette) < count:
+            index = int(np.argmax(nearest))
+            palette.append(tuple(int(c) for c in candidates[index]))
+            nearest = np.minimum(nearest, np.linalg.norm(candidate_lab - candidate_lab[index], axis=1))
+            nearest[index] = -1.0
+
+    _PALETTE_CACHE[key] = tuple(palette)
+    return list(palette)
+
+
+class LevelDef:
+    """Settings for one level"""
+
+    def __init__(self, pairs, radius=25, palette=None, time_limit=None, obstacles=(), seed=None):
+        """
+        Args:
+            pairs: Number of color pairs on the board
+            radius: Ball radius in pixels
+            palette: BGR colors to use first (generated colors fill the rest)
+            time_limit: Seconds to clear the board before it is re-dealt,
+                        or None for no limit
+            obstacles: Areas kept free of balls, each {"rect": [x, y, w, h]}
+                       or {"circle": [x, y, r]} in fractions of the frame
+                       (circle radius as a fraction of the frame height)
+            seed: Fixed layout seed, so every game gets the same board for
+                  this level (defaults to the game's seed)
+        """
+        if pairs < 1:
+            raise ValueError(f"A level needs at least one pair, got {pairs}")
+        for obstacle in obstacles:
+            if set(obstacle) not in ({'rect'}, {'circle'}):
+                raise ValueError(f"Unknown obstacle: {obstacle}")
+
+        self.pairs = int(pairs)
+        self.radius = int(radius)
+        self.palette = [tuple(int(c) for c in color) for color in palette] if palette else None
+        self.time_limit = float(time_limit) if time_limit else None
+        self.obstacles = [dict(obstacle) for obstacle in obstacles]
+        self.seed = seed
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a level from its pack entry"""
+        unknown = set(data) - {'pairs', 'radius', 'palette', 'time_limit', 'obstacles', 'seed'}
+        if unknown:
+            raise ValueError(f"Unknown level settings: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def to_dict(self):
+        """Pack entry for this level (only non-default settings)"""
+        data = {'pairs': self.pairs, 'radius': self.radius}
+        if self.palette:
+            data['palette'] = [list(color) for color in self.palette]
+        if self.time_limit:
+            data['time_limit'] = self.time_limit
+        if self.obstacles:
+            data['obstacles'] = self.obstacles
+        if self.seed is not None:
+            data['seed'] = self.seed
+        return data
+
+    def with_pairs(self, pairs):
+        """Copy of this level with a different number of pairs"""
+        data = self.to_dict()
+        data['pairs'] = pairs
+        return LevelDef.from_dict(data)
+
+    def without_obstacles(self):
+        """Copy of this level with the whole frame free"""
+        data = self.to_dict()
+        data.pop('obstacles', None)
+        return LevelDef.from_dict(data)
+
+    def colors(self, count=None):
+        """Palette for this level's pairs"""
+        return generate_palette(count or self.pairs, self.palette or BASE_PALETTE)
+
+    def obstacle_shapes(self, frame_size):
+        """
+        Obstacles in pixels for a frame size
+
+        Returns:
+            List of ('rect', x0, y0, x1, y1) and ('circle', x, y, r) tuples
+        """
+        width, height = frame_size
+        shapes = []
+        for obstacle in self.obstacles:
+            if 'rect' in obstacle:
+                x, y, w, h = obstacle['rect']
+                shapes.append(('rect', x * width, y * height, (x + w) * width, (y + h) * height))
+            else:
+                x, y, r = obstacle['circle']
+                shapes.append(('circle', x * width, y * height, r * height))
+        return shapes
+
+
+class LevelPack:
+    """Ordered list of levels, extended past its end by adding pairs"""
+
+    def __init__(self, levels, name='default', pairs_step=1):
+        """
+        Args:
+            levels: List of LevelDef, first level first
+            name: Pack name shown in logs
+            pairs_step: Pairs added per level after the last defined one
+        """
+        if not levels:
+            raise ValueError("A level pack needs at least one level")
+        self.levels = list(levels)
+        self.name = name
+        self.pairs_step = int(pairs_step)
+
+    @classmethod
+    def default(cls):
+        """The original progression: 3 + level pairs, no time limit"""
+        return cls([LevelDef(pairs=4)])
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a pack from parsed JSON/TOML"""
+        return cls([LevelDef.from_dict(level) for level in data['levels']],
+                   name=data.get('name', 'default'),
+                   pairs_step=data.get('pairs_step', 1))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a pack from a .json or .toml file
+
+        Raises:
+            ValueError: If the file is not a valid level pack
+        """
+        if path.endswith('.toml'):
+            import tomllib
+            with open(path, 'rb') as f:
+                data = tomllib.load(f)
+        else:
+            with open(path) as f:
+                data = json.load(f)
+        try:
+            return cls.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid level pack {path}: {e}") from e
+
+    def to_dict(self):
+        """JSON-compatible form of the pack"""
+        return {'name': self.name, 'pairs_step': self.pairs_step,
+                'levels': [level.to_dict() for level in self.levels]}
+
+    def level(self, number):
+        """Settings for a level (1-based)"""
+        if number <= len(self.levels):
+            return self.levels[number - 1]
+        last = self.levels[-1]
+        return last.with_pairs(last.pairs + (number - len(self.levels)) * self.pairs_step)
+
+
+class Layout:
+    """Ball positions, the pair (color slot) of each ball and the ball radius"""
+
+    __slots__ = ('positions', 'pairs', 'radius')
+
+    def __init__(self, positions, pairs, radius):
+        self.positions = positions
+        self.pairs = pairs
+        self.radius = radius
+
+
+def layout_key(level, level_number, frame_size, seed, deal=0):
+    """
+    Cache key for a level's layout
+
+    The layout is a pure function of the key, so it can be built ahead of
+    time, on another thread or in another process.
+
+    Args:
+        level: LevelDef being laid out
+        level_number: 1-based level number
+        frame_size: (width, height) of the play field
+        seed: Game seed (ignored when the level has a fixed seed)
+        deal: How many boards of this level were dealt before this one
+              in the session
+    """
+    if level.seed is not None:
+        source = f"fixed:{level.seed}:{level_number}:{deal}"
+    else:
+        source = f"{seed}:{level_number}:{deal}"
+    settings = {'level': level.to_dict(), 'frame_size': list(frame_size), 'seed': source}
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+
+def build_layout(level, frame_size, key, rng=None):
+    """
+    Sample a layout for a level
+
+    A level with more balls than the frame holds is laid out with smaller
+    balls (down to MIN_RADIUS) and, if they still do not fit, with as many
+    pairs as do, so progression never runs out of room.
+
+    Args:
+        level: LevelDef to lay out
+        frame_size: (width, height) of the play field
+        key: layout_key(), which seeds the sampling
+        rng: random.Random-compatible generator to use instead
+
+    Returns:
+        Layout
+
+    Raises:
+        PlacementError: If not even one pair fits
+    """
+    if rng is None:
+        rng = random.Random(key)
+
+    num_pairs = level.pairs
+    radius = level.radius
+    obstacles = level.obstacle_shapes(frame_size)
+    pairs = [i for i in range(num_pairs) for _ in range(2)]
+    rng.shuffle(pairs)
+
+    while True:
+        try:
+            positions = place_balls(
+                len(pairs), frame_size,
+                spacing=radius * 3.5,
+                min_spacing=radius * 2.2,
+                ball_radius=radius,
+                obstacles=obstacles,
+                rng=rng)
+            break
+        except PlacementError as error:
+            if radius > MIN_RADIUS:
+                radius = max(int(radius * 0.8), MIN_RADIUS)
+                continue
+            if num_pairs <= 1:
+                raise
+            num_pairs = max(min(error.fitted // 2, num_pairs - 1), 1)
+            pairs = [i for i in range(num_pairs) for _ in range(2)]
+            rng.shuffle(pairs)
+    return Layout(positions, np.array(pairs, dtype=np.int32), radius)
+
+
+class LayoutCache:
+    """
+    Memory and disk cache of layouts keyed by layout_key()
+
+    A hit costs a dictionary lookup (or one small .npz read after a
+    restart), so level transitions do no sampling. prefetch() builds the
+    next level's layout on a background thread while the current one is
+    being played. Both memory and disk are bounded: the least recently
+    used layouts are dropped first. A layout that cannot be built fails
+    once: get() raises the same error (PlacementError, or whatever broke a
+    prefetch) whether the failure came from the foreground or the
+    background thread, and the last max_entries failures are kept.
+    """
+
+    def __init__(self, directory=None, max_entries=16, max_files=1000):
+        """
+        Args:
+            directory: Folder for .npz layout files (memory only if None)
+            max_entries: Layouts kept in memory
+            max_files: Layout files kept in directory (None keeps all)
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self.memory = OrderedDict()
+        self.pending = {}  # key -> Event set once its prefetch finishes
+        self.failed = OrderedDict()  # key -> exception raised while building it
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.worker = None  # Prefetch thread, started on first use
+        self.stats = {'memory': 0, 'disk': 0, 'built': 0}
+
+    def get(self, key, level, frame_size):
+        """
+        Layout for a key, building (and storing) it on a miss
+
+        Args:
+            key: layout_key() for the level
+            level: LevelDef the key was made from
+            frame_size: (width, height) the key was made for
+
+        Raises:
+            PlacementError: If the level does not fit the frame
+            Exception: Whatever made a prefetch of this key fail
+        """
+        with self.lock:
+            done = self.pending.get(key)
+        if done is not None:
+            done.wait()
+
+        with self.lock:
+            if key in self.failed:
+                raise self.failed[key]
+            layout = self.memory.get(key)
+            if layout is not None:
+                self.memory.move_to_end(key)
+                self.stats['memory'] += 1
+                return layout
+
+        layout = self._load(key)
+        if layout is not None:
+            source = 'disk'
+        else:
+            layout = self._build(key, level, frame_size)
+            source = 'built'
+
+        with self.lock:
+            self.stats[source] += 1
+            self._remember(key, layout)
+        return layout
+
+    def prefetch(self, key, level, frame_size):
+        """Start building a layout in the background if it is not cached"""
+        with self.lock:
+            if key in self.memory or key in self.pending or key in self.failed:
+                return
+            self.pending[key] = threading.Event()
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._prefetch_loop,
+                                               name="layout-prefetch", daemon=True)
+                self.worker.start()
+        self.requests.put((key, level, frame_size))
+
+    def _prefetch_loop(self):
+        while True:
+            key, level, frame_size = self.requests.get()
+            try:
+                layout = self._load(key)
+                if layout is None:
+                    layout = self._build(key, level, frame_size)
+                with self.lock:
+                    self._remember(key, layout)
+            except Exception as error:
+                # Raised by get() so the failure is reported, not rebuilt
+                with self.lock:
+                    self._fail(key, error)
+            finally:
+                with self.lock:
+                    self.pending.pop(key).set()
+
+    def _build(self, key, level, frame_size):
+        """Build and save a layout, remembering a placement failure"""
+        try:
+            layout = build_layout(level, frame_size, key)
+        except PlacementError as error:
+            with self.lock:
+                self._fail(key, error)
+            raise
+        self._save(key, layout)
+        return layout
+
+    def _remember(self, key, layout):
+        """Keep a layout in memory, dropping the least recently used (lock held)"""
+        self.memory[key] = layout
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _fail(self, key, error):
+        """Remember a build failure, dropping the oldest ones (lock held)"""
+        self.failed[key] = error
+        self.failed.move_to_end(key)
+        while len(self.failed) > self.max_entries:
+            self.failed.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                layout = Layout(data['positions'], data['pairs'], int(data['radius']))
+            os.utime(self._path(key))  # Mark as recently used for eviction
+            return layout
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, key, layout):
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so a concurrent reader never sees half a file
+            temp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp, 'wb') as f:
+                np.savez(f, positions=layout.positions, pairs=layout.pairs, radius=layout.radius)
+            os.replace(temp, self._path(key))
+            self._evict()
+        except OSError:
+            pass  # A read-only cache only costs the sampling time
+
+    def _evict(self):
+        """Delete the least recently used files beyond max_files"""
+        if self.max_files is None:
+            return
+        with os.scandir(self.directory) as entries:
+            files = [(entry.stat().st_mtime, entry.path) for entry in entries
+                     if entry.name.endswith('.npz')]
+        if len(files) <= self.max_files:
+            return
+        files.sort()
+        for _, path in files[:len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already evicted by another process
+
+
+def precompute(pack, frame_sizes, seeds, cache, levels=None, deals=1):
+    """
+    Fill a cache with the first boards of every level
+
+    The keys are the ones GameManager looks up: with a fixed --seed, the
+    n-th board of a level in a session (after resets, time-outs or stuck
+    re-deals) is deal n - 1, whatever happened on other levels.
+
+    Args:
+        pack: LevelPack to lay out
+        frame_sizes: (width, height) sizes to cover
+        seeds: Game seeds to cover (levels with a fixed seed need just one)
+        cache: LayoutCache to fill
+        levels: Number of levels (defaults to the levels in the pack)
+        deals: Boards per level to cover
+
+    Returns:
+        Number of layouts written
+    """
+    count = 0
+    for number in range(1, (levels or len(pack.levels)) + 1):
+        level = pack.level(number)
+        for frame_size in frame_sizes:
+            for seed in seeds if level.seed is None else seeds[:1]:
+                for deal in range(deals):
+                    cache.get(layout_key(level, number, frame_size, seed, deal), level, frame_size)
+                    count += 1
+    return count
+
+
+def parse_size(text):
+    """Parse WIDTHxHEIGHT"""
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Level pack tools")
+    parser.add_argument("pack", nargs='?', help="level pack (.json or .toml)")
+    parser.add_argument("--precompute", action="store_true",
+                        help="write every level's layout to the layout cache")
+    parser.add_argument("--levels", type=int, help="number of levels to precompute")
+    parser.add_argument("--seeds", type=int, nargs='+', default=[0],
+                        help="game seeds to precompute layouts for (play with game.py --seed)")
+    parser.add_argument("--deals", type=int, default=1,
+                        help="boards per level to precompute (re-deals after resets and time-outs)")
+    parser.add_argument("--size", type=parse_size, action='append',
+                        help="frame size WIDTHxHEIGHT (repeatable, default 1280x720)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="layout cache folder")
+    parser.add_argument("--palette", type=int, metavar='N',
+                        help="print an N-color palette and save a swatch as palette.png")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the level tools"""
+    args = parse_args(argv)
+
+    if args.palette:
+        palette = generate_palette(args.palette)
+        swatch = np.zeros((60, 40 * len(palette), 3), dtype=np.uint8)
+        for i, color in enumerate(palette):
+            swatch[:, 40 * i:40 * (i + 1)] = color
+            print(color)
+        cv2.imwrite('palette.png', swatch)
+
+    if args.pack:
+        pack = LevelPack.load(args.pack)
+        print(f"{pack.name}: {len(pack.levels)} levels")
+        for number, level in enumerate(pack.levels, 1):
+            print(f"  {number}: {level.to_dict()}")
+        if args.precompute:
+            cache = LayoutCache(args.cache_dir, max_files=None)
+            count = precompute(pack, args.size or [(1280, 720)], args.seeds, cache, args.levels,
+                               args.deals)
+            print(f"{count} layouts in {args.cache_dir} "
+                  f"({cache.stats['built']} built, {cache.stats['disk']} already cached)")
+
+
+if __name__ == "__main__":
+    main()
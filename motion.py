@@ -0,0 +1,113 @@
+"""
+Motion Gate Module
+Cheap presence detection that lets hand detection idle while nobody is
+in front of the camera
+"""
+
+import math
+
+import numpy as np
+
+import cv2
+
+
+class MotionGate:
+    """
+    Background-subtraction motion detector in front of hand detection
+
+    Each frame is shrunk to a thumbnail (a bilinear resize samples only a
+    few pixels per output pixel, so this stays in the tens of
+    microseconds) and compared against a running-average background. The
+    player counts as present while there is motion or a tracked hand, and
+    for hold_time seconds after. Once they leave, detection only runs as
+    a probe every probe_interval seconds (catching a hand held perfectly
+    still). The first frame with motion runs detection again.
+    """
+
+    def __init__(self, width=80, threshold=18, min_changed=0.002, learning_rate=0.05,
+                 hold_time=3.0, probe_interval=1.0):
+        """
+        Args:
+            width: Thumbnail width in pixels (height follows the frame's aspect)
+            threshold: Grey-level difference from the background that counts
+                       as a changed pixel
+            min_changed: Fraction of changed thumbnail pixels that counts as
+                         motion
+            learning_rate: Weight of each frame in the running background
+            hold_time: Seconds to stay active after the last motion or hand
+            probe_interval: Seconds between detections while idle
+        """
+        self.width = width
+        self.threshold = threshold
+        self.min_changed = min_changed
+        self.learning_rate = learning_rate
+        self.hold_time = hold_time
+        self.probe_interval = probe_interval
+
+        # Reused thumbnail buffers
+        self.small = None
+        self.gray = None
+        self.background = None  # float32 running average
+        self.background_u8 = None
+        self.difference = None
+
+        self.motion = 0.0  # Fraction of changed pixels in the last frame
+        self.last_active = -math.inf  # Last time there was motion or a hand
+        self.last_probe = -math.inf
+        self.active = True
+
+    def measure(self, frame):
+        """
+        Fraction of the frame that differs from the background
+
+        Args:
+            frame: BGR camera frame
+
+        Returns:
+            Fraction of changed thumbnail pixels (1.0 on the first frame)
+        """
+        height = max(1, round(self.width * frame.shape[0] / frame.shape[1]))
+        self.small = cv2.resize(frame, (self.width, height), dst=self.small,
+                                interpolation=cv2.INTER_LINEAR)
+        self.gray = cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        self.gray = cv2.GaussianBlur(self.gray, (3, 3), 0, dst=self.gray)
+
+        if self.background is None or self.background.shape != self.gray.shape:
+            self.background = self.gray.astype(np.float32)
+            self.background_u8 = np.empty_like(self.gray)
+            self.difference = np.empty_like(self.gray)
+            return 1.0
+
+        cv2.convertScaleAbs(self.background, dst=self.background_u8)
+        cv2.absdiff(self.gray, self.background_u8, dst=self.difference)
+        changed = np.count_nonzero(self.difference > self.threshold) / self.difference.size
+        cv2.accumulateWeighted(self.gray, self.background, self.learning_rate)
+        return changed
+
+    def update(self, frame, timestamp, has_hands=False):
+        """
+        Measure a frame and decide whether to run hand detection on it
+
+        Args:
+            frame: BGR camera frame
+            timestamp: Frame time in seconds
+            has_hands: Whether hands were tracked on the last detection
+
+        Returns:
+            True if detection should run (active, or an idle probe is due)
+        """
+        self.motion = self.measure(frame)
+        if self.motion >= self.min_changed or has_hands:
+            self.last_active = timestamp
+        self.active = timestamp - self.last_active < self.hold_time
+
+        if self.active:
+            return True
+        if timestamp - self.last_probe >= self.probe_interval:
+            self.last_probe = timestamp
+            return True
+        return False
+
+    def idle_for(self, timestamp):
+        """Seconds since the last motion or hand (0 while active)"""
+        return 0.0 if self.active else timestamp - self.last_active
@@ -0,0 +1,457 @@
+"""
+Multi-Camera Mode
+Runs one hand detector per camera in its own worker process, passing
+frames back through shared-memory rings, with one game per station
+
+Examples:
+    python multicam.py --sources 0 1 2
+    python multicam.py --sources a.mp4 b.mp4 --headless --frames 600
+    python multicam.py --sources clip.mp4 --benchmark 4 --frames 300 --output scaling.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import os
+import queue
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+from frame_source import open_frame_source, RecordedLandmarkDetector
+from game import GestureGame
+from landmarks import HandLandmarks
+from presenter import CvPresenter
+
+
+class FrameRing:
+    """
+    Fixed set of frame slots in shared memory
+
+    The worker that creates the ring writes frames into free slots and
+    sends only the slot index to the main process, which reads (and draws
+    on) the same memory before handing the slot back. No frame is pickled.
+    Only the creating process owns the block: it alone unlinks it, and
+    attaching does not leave a registration in this process's resource
+    tracker (which would otherwise unlink it, with a leak warning, when the
+    attaching process exits).
+    """
+
+    def __init__(self, shape, slots, name=None, shared_tracker=False):
+        """
+        Args:
+            shape: Frame shape (height, width, 3)
+            slots: Number of frames held
+            name: Attach to an existing ring instead of creating one
+            shared_tracker: The creator uses this process's resource
+                            tracker (it is this process, or a multiprocessing
+                            parent or child of it), so its registration
+                            already covers the block and must be kept
+        """
+        self.shape = tuple(shape)
+        self.slots = slots
+        size = slots * int(np.prod(self.shape))
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        elif sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == 'posix' and not shared_tracker:
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        """Shared memory block name used to attach from another process"""
+        return self.shm.name
+
+    def __getitem__(self, slot):
+        return self.frames[slot]
+
+    def close(self):
+        """Unmap the ring (and free it, from the creating process)"""
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def build_detector(options):
+    """Create a station's hand detector inside its worker process"""
+    if options['landmarks'] == 'synthetic':
+        return RecordedLandmarkDetector.synthetic(options['width'], options['height'])
+    if options['landmarks']:
+        return RecordedLandmarkDetector.load(options['landmarks'])
+
+    from gesture_detector import GestureDetector
+    return GestureDetector(inference_scale=options['inference_scale'],
+                           roi_tracking=options['roi'],
+                           max_num_hands=options['hands'])
+
+
+def station_worker(index, source_spec, options, slots, free_slots, results):
+    """
+    Worker process: capture, mirror and detect hands for one camera
+
+    Args:
+        index: Station number
+        source_spec: Frame source specification (see open_frame_source)
+        options: Dictionary of detector and source settings
+        slots: Number of ring slots
+        free_slots: Queue of slot indices the main process has released
+                    (None asks the worker to stop)
+        results: Queue shared by all stations for ('ready' | 'frame' | 'end') messages
+    """
+    source = open_frame_source(source_spec, loop=options['loop'],
+                               width=options['width'], height=options['height'])
+    detector = build_detector(options)
+    ring = None
+    buffer = None
+    frames = 0
+
+    try:
+        success, frame = source.read()
+        if not success:
+            results.put(('end', index))
+            return
+
+        ring = FrameRing(frame.shape, slots)
+        results.put(('ready', index, ring.name, frame.shape))
+
+        while options['max_frames'] is None or frames < options['max_frames']:
+            slot = free_slots.get()
+            if slot is None:
+                break
+
+            if frame is None:
+                success, frame = source.read(buffer)
+                if not success:
+                    break
+            capture_time = time.perf_counter()
+
+            # Detect on the frame as captured (landmarks come back mirrored)
+            start = time.perf_counter()
+            hand_landmarks, _ = detector.detect_hands(frame)
+            detect_time = time.perf_counter() - start
+
+            # The only flip writes the display copy straight into shared memory
+            cv2.flip(frame, 1, dst=ring[slot])
+            buffer, frame = frame, None
+
+            results.put(('frame', index, slot, hand_landmarks.points,
+                         hand_landmarks.visibility, capture_time, detect_time))
+            frames += 1
+
+        results.put(('end', index))
+    finally:
+        detector.release()
+        source.release()
+        if ring is not None:
+            # The main process keeps its own mapping until it has finished
+            ring.close()
+
+
+class WorkerDetector:
+    """
+    Main-process stand-in for a detector running in a station worker
+
+    Detection results arrive from the worker; only pointer extraction
+    happens locally.
+    """
+
+    def __init__(self):
+        self.profiler = None
+
+    def get_gesture_points(self, hand_landmarks):
+        """Use the index fingertip of each hand as its pointer"""
+        return [(pointer, hand_id)
+                for hand_id, pointer in enumerate(hand_landmarks.pointers())]
+
+    def release(self):
+        """Nothing to release; the worker owns the real detector"""
+        pass
+
+
+class Station:
+    """Main-process state of one camera: its worker, ring and game"""
+
+    def __init__(self, index, source_spec, max_hands=2):
+        self.index = index
+        self.source_spec = source_spec
+        self.process = None
+        self.free_slots = None
+        self.ring = None
+        self.finished = False
+
+        window_name = f"Station {index + 1}: {source_spec}"
+        self.game = GestureGame(gesture_detector=WorkerDetector(), max_hands=max_hands,
+                                presenter=CvPresenter(window_name))
+        self.game.window_name = window_name
+
+        self.frames = 0
+        self.detect_time = 0.0
+        self.first_frame_time = None
+        self.last_frame_time = None
+
+
+class MultiCameraGame:
+    """
+    Several independent game stations sharing one host
+
+    Each camera gets a worker process (its own interpreter, so MediaPipe's
+    Python wrapper does not contend for one GIL) that captures and detects.
+    The main process runs every station's GameManager, draws into the
+    shared frame and shows it.
+    """
+
+    def __init__(self, sources, options, slots=3, display=True, max_hands=2):
+        """
+        Args:
+            sources: Frame source specification per station
+            options: Detector and source settings passed to the workers
+            slots: Frames in flight per station (shared-memory ring size)
+            display: Draw and show each station's window
+            max_hands: Hands that can hold selections at once per station
+        """
+        self.options = options
+        self.slots = slots
+        self.display = display
+        self.stations = [Station(i, spec, max_hands) for i, spec in enumerate(sources)]
+        self.context = multiprocessing.get_context('spawn')
+        self.results = None
+        self.is_running = False
+
+    def start(self):
+        """Launch one worker process per station"""
+        self.results = self.context.Queue()
+        for station in self.stations:
+            station.free_slots = self.context.Queue()
+            station.process = self.context.Process(
+                target=station_worker,
+                args=(station.index, station.source_spec, self.options, self.slots,
+                      station.free_slots, self.results),
+                name=f"station-{station.index}",
+                daemon=True)
+            station.process.start()
+        self.is_running = True
+
+    def stop(self):
+        """Ask the workers to exit and release the rings"""
+        self.is_running = False
+        for station in self.stations:
+            if station.process is None:
+                continue
+            station.free_slots.put(None)
+            station.process.join(timeout=5.0)
+            if station.process.is_alive():
+                station.process.terminate()
+            if station.ring is not None:
+                station.ring.close()
+                station.ring = None
+        if self.display:
+            cv2.destroyAllWindows()
+
+    def run(self):
+        """Process results from every station until all sources end or Q is pressed"""
+        self.start()
+        try:
+            while self.is_running and not all(s.finished for s in self.stations):
+                try:
+                    message = self.results.get(timeout=1.0)
+                except queue.Empty:
+                    if not any(s.process.is_alive() for s in self.stations):
+                        print("All station workers exited")
+                        break
+                    continue
+                self._handle(message)
+        finally:
+            self.stop()
+
+    def _handle(self, message):
+        kind, index = message[0], message[1]
+        station = self.stations[index]
+
+        if kind == 'ready':
+            _, _, name, shape = message
+            # Spawned workers report to this process's resource tracker
+            station.ring = FrameRing(shape, self.slots, name=name, shared_tracker=True)
+            for slot in range(self.slots):
+                station.free_slots.put(slot)
+        elif kind == 'frame':
+            _, _, slot, points, visibility, capture_time, detect_time = message
+            self._process_frame(station, slot, HandLandmarks(points, visibility), capture_time)
+            station.detect_time += detect_time
+            station.free_slots.put(slot)
+        elif kind == 'end':
+            station.finished = True
+
+    def _process_frame(self, station, slot, hand_landmarks, capture_time):
+        """Run one station's game on a frame still held in its ring slot"""
+        game = station.game
+        frame = station.ring[slot]
+
+        if self.display:
+            game.apply_detections(frame, hand_landmarks, capture_time)
+        else:
+            game.update_game(hand_landmarks, capture_time)
+        game.game_manager.update(frame.shape)
+
+        now = time.perf_counter()
+        if station.first_frame_time is None:
+            station.first_frame_time = now
+        station.last_frame_time = now
+        station.frames += 1
+
+        if self.display:
+            game.update_fps(time.time())
+            game.presenter.present(frame)
+            key = game.presenter.poll_key() & 0xFF
+            if key == ord('q') or key == 27:
+                self.is_running = False
+            elif key == ord('r'):
+                for other in self.stations:
+                    other.game.game_manager.reset_game()
+
+    def get_stats(self):
+        """
+        Throughput of each station and of the host as a whole
+
+        Returns:
+            Dictionary with aggregate 'fps' and a per-station list of
+            frames, fps and mean detection milliseconds
+        """
+        stations = []
+        for station in self.stations:
+            elapsed = (station.last_frame_time or 0) - (station.first_frame_time or 0)
+            stations.append({
+                'source': station.source_spec,
+                'frames': station.frames,
+                'fps': (station.frames - 1) / elapsed if elapsed > 0 else 0.0,
+                'detect_ms': 1000.0 * station.detect_time / station.frames if station.frames else 0.0,
+            })
+
+        starts = [s.first_frame_time for s in self.stations if s.first_frame_time is not None]
+        ends = [s.last_frame_time for s in self.stations if s.last_frame_time is not None]
+        total = sum(s.frames for s in self.stations)
+        elapsed = max(ends) - min(starts) if starts else 0.0
+        return {
+            'fps': (total - len(starts)) / elapsed if elapsed > 0 else 0.0,
+            'stations': stations,
+        }
+
+
+def run_scaling_benchmark(sources, options, max_stations, slots=3):
+    """
+    Measure aggregate throughput with 1..max_stations headless stations
+
+    Args:
+        sources: File-backed source specs, reused round-robin across stations
+        options: Worker settings (max_frames bounds each run)
+        max_stations: Largest number of concurrent stations to try
+        slots: Ring size per station
+
+    Returns:
+        Dictionary with one entry per station count: aggregate fps, speedup
+        over one station and scaling efficiency (speedup / stations)
+    """
+    runs = []
+    base_fps = None
+    for count in range(1, max_stations + 1):
+        specs = [sources[i % len(sources)] for i in range(count)]
+        game = MultiCameraGame(specs, options, slots=slots, display=False)
+        game.run()
+        stats = game.get_stats()
+
+        if base_fps is None:
+            base_fps = stats['fps']
+        speedup = stats['fps'] / base_fps if base_fps else 0.0
+        runs.append({
+            'stations': count,
+            'fps': stats['fps'],
+            'speedup': speedup,
+            'efficiency': speedup / count,
+            'per_station': stats['stations'],
+        })
+        print(f"{count} station(s): {stats['fps']:.1f} fps total, "
+              f"speedup {speedup:.2f}x, efficiency {100 * speedup / count:.0f}%")
+    return {'runs': runs}
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Multi-camera gesture game")
+    parser.add_argument("--sources", nargs="+", default=["0"],
+                        help="one camera index, video file, image directory or 'synthetic' per station")
+    parser.add_argument("--landmarks",
+                        help="replay a landmark recording instead of running MediaPipe "
+                             "('synthetic' generates one)")
+    parser.add_argument("--inference-scale", type=float, default=1.0,
+                        help="downsample frames by this factor before hand detection")
+    parser.add_argument("--roi", action="store_true",
+                        help="run detection on a crop around the previously tracked hands")
+    parser.add_argument("--hands", type=int, default=2,
+                        help="number of hands that can play at once per station")
+    parser.add_argument("--slots", type=int, default=3,
+                        help="frames in flight per station (shared-memory ring size)")
+    parser.add_argument("--headless", action="store_true", help="do not draw or open windows")
+    parser.add_argument("--frames", type=int, help="stop each station after this many frames")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="measure throughput scaling with 1..N headless stations")
+    parser.add_argument("--width", type=int, default=1280, help="synthetic frame width")
+    parser.add_argument("--height", type=int, default=720, help="synthetic frame height")
+    parser.add_argument("--output", help="write benchmark results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for multi-camera mode"""
+    args = parse_args(argv)
+    options = {
+        'landmarks': args.landmarks,
+        'inference_scale': args.inference_scale,
+        'roi': args.roi,
+        'hands': args.hands,
+        'width': args.width,
+        'height': args.height,
+        'loop': True,
+        'max_frames': args.frames,
+    }
+
+    if args.benchmark:
+        if options['max_frames'] is None:
+            options['max_frames'] = 300
+        results = run_scaling_benchmark(args.sources, options, args.benchmark, slots=args.slots)
+        results['config'] = {
+            'sources': args.sources,
+            'landmarks': args.landmarks or 'mediapipe',
+            'inference_scale': args.inference_scale,
+            'frames': options['max_frames'],
+            'cpus': multiprocessing.cpu_count(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+        }
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        return
+
+    game = MultiCameraGame(args.sources, options, slots=args.slots,
+                           display=not args.headless, max_hands=args.hands)
+    try:
+        game.run()
+    except KeyboardInterrupt:
+        print("\nGame interrupted by user")
+    finally:
+        for station in game.get_stats()['stations']:
+            print(f"{station['source']}: {station['frames']} frames, {station['fps']:.1f} fps, "
+                  f"detect {station['detect_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Ball Physics Module
+Drifting, bouncing balls advanced in fixed time steps with batched NumPy
+operations and a uniform-grid broadphase for ball-ball collisions
+
+Examples:
+    python physics.py --balls 200 --frames 600
+    python physics.py --balls 50 100 200 400 --output physics.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import time
+
+import numpy as np
+
+from balls import BallStore
+from utils import percentile
+
+# Cells tested against each ball's own cell: itself and half of the ring
+# around it, so every pair of neighbouring cells is visited exactly once
+NEIGHBOUR_CELLS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+NEIGHBOUR_OFFSETS = np.array(NEIGHBOUR_CELLS, dtype=np.int64)
+
+
+class BallPhysics:
+    """
+    Moves the unmatched balls of a BallStore
+
+    advance() is called once per rendered frame with the frame time and
+    runs as many fixed steps of step_time seconds as have accumulated, so
+    ball motion is the same at 15 or 120 FPS (and on replay). Each step
+    integrates every ball at once, reflects balls off the play area edges
+    and the level's obstacles, and resolves ball-ball contacts as equal-mass
+    collisions. Contact candidates come from a uniform grid with cells one
+    ball diameter wide, so only balls in neighbouring cells are compared.
+    """
+
+    def __init__(self, speed=120.0, step_time=1 / 120, max_steps=8, restitution=1.0,
+                 margins=(0, 100, 0, 0)):
+        """
+        Args:
+            speed: Launch speed of each ball in pixels per second (each
+                   ball gets 60-100% of it in a random direction)
+            step_time: Seconds simulated per fixed step
+            max_steps: Most steps run for one frame; time beyond that (a
+                       stall) is dropped instead of being caught up
+            restitution: Fraction of the approach speed kept by a bounce
+            margins: (left, top, right, bottom) pixels of the frame kept
+                     free of balls (the top strip holds the HUD)
+        """
+        self.speed = speed
+        self.step_time = step_time
+        self.max_steps = max_steps
+        self.restitution = restitution
+        self.margins = tuple(margins)
+
+        self.accumulator = 0.0  # Simulated time owed to the balls
+        self.last_time = None
+        self.contacts = 0  # Ball-ball contacts resolved in the last step
+
+    def settings(self):
+        """Constructor arguments, for session logs"""
+        return {'speed': self.speed, 'step_time': self.step_time, 'max_steps': self.max_steps,
+                'restitution': self.restitution, 'margins': list(self.margins)}
+
+    def launch(self, balls, rng):
+        """
+        Give every ball a random velocity and restart the clock
+
+        Args:
+            balls: BallStore to set velocities on
+            rng: numpy.random.Generator
+        """
+        count = len(balls)
+        angles = rng.uniform(0.0, 2 * math.pi, count)
+        speeds = self.speed * rng.uniform(0.6, 1.0, count)
+        balls.velocities[:, 0] = np.cos(angles) * speeds
+        balls.velocities[:, 1] = np.sin(angles) * speeds
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self, balls, frame_size, obstacles, timestamp):
+        """
+        Run the fixed steps due by a frame time
+
+        Args:
+            balls: BallStore whose unmatched balls move
+            frame_size: (width, height) of the frame
+            obstacles: ('rect', x0, y0, x1, y1) and ('circle', x, y, r) tuples
+            timestamp: Frame time in seconds
+
+        Returns:
+            Number of steps run
+        """
+        if self.last_time is None:
+            self.last_time = timestamp
+            return 0
+        self.accumulator += max(timestamp - self.last_time, 0.0)
+        self.last_time = timestamp
+
+        steps = int(self.accumulator // self.step_time)
+        self.accumulator -= steps * self.step_time
+        if steps > self.max_steps:
+            steps = self.max_steps
+        active = balls.unmatched()
+        if steps == 0 or len(active) == 0:
+            return 0
+
+        # Step on compact copies of the moving balls, then write them back
+        positions = balls.positions[active]
+        velocities = balls.velocities[active]
+        radii = balls.radii[active].astype(np.float64)
+        left, top, right, bottom = self.margins
+        lower = np.column_stack((left + radii, top + radii))
+        upper = np.column_stack((frame_size[0] - right - radii, frame_size[1] - bottom - radii))
+        for _ in range(steps):
+            self.step(positions, velocities, radii, lower, upper, obstacles)
+        balls.positions[active] = positions
+        balls.velocities[active] = velocities
+        return steps
+
+    def step(self, positions, velocities, radii, lower, upper, obstacles=()):
+        """
+        Advance balls by one fixed step (arrays are updated in place)
+
+        Args:
+            positions: (n, 2) ball centres
+            velocities: (n, 2) velocities in pixels per second
+            radii: (n,) ball radii
+            lower: (n, 2) smallest allowed centre of each ball
+            upper: (n, 2) largest allowed centre of each ball
+            obstacles: ('rect', x0, y0, x1, y1) and ('circle', x, y, r) tuples
+        """
+        positions += velocities * self.step_time
+        self._bounce_walls(positions, velocities, lower, upper)
+        for kind, *shape in obstacles:
+            if kind == 'rect':
+                x0, y0, x1, y1 = shape
+                closest = np.column_stack((np.clip(positions[:, 0], x0, x1),
+                                           np.clip(positions[:, 1], y0, y1)))
+                self._push_out(positions, velocities, closest, radii)
+            else:
+                x, y, r = shape
+                self._push_out(positions, velocities, np.array([x, y]), radii + r)
+        self.contacts = self._collide(positions, velocities, radii)
+
+    def _bounce_walls(self, positions, velocities, lower, upper):
+        """Mirror balls that left the play area back inside it"""
+        below = positions < lower
+        above = positions > upper
+        np.copyto(positions, 2 * lower - positions, where=below)
+        np.copyto(positions, 2 * upper - positions, where=above)
+        np.copyto(velocities, np.abs(velocities) * self.restitution, where=below)
+        np.copyto(velocities, -np.abs(velocities) * self.restitution, where=above)
+        np.clip(positions, lower, np.maximum(lower, upper), out=positions)
+
+    def _push_out(self, positions, velocities, closest, reach):
+        """Move balls closer than reach to a static point out, reflecting their velocity"""
+        offset = positions - closest
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        hit = np.flatnonzero((distance < reach) & (distance > 0))
+        if len(hit) == 0:
+            return
+        normal = offset[hit] / distance[hit, None]
+        positions[hit] += normal * (reach[hit] - distance[hit])[:, None]
+        approach = np.minimum(np.einsum('ij,ij->i', velocities[hit], normal), 0.0)
+        velocities[hit] -= ((1 + self.restitution) * approach)[:, None] * normal
+
+    def _collide(self, positions, velocities, radii):
+        """
+        Separate overlapping balls and exchange momentum along each contact
+
+        Returns:
+            Number of contacts resolved
+        """
+        first, second = contact_candidates(positions, 2.0 * float(radii.max()))
+        if len(first) == 0:
+            return 0
+
+        # Narrow phase on the candidate pairs
+        offset = positions[second] - positions[first]
+        distance_sq = np.einsum('ij,ij->i', offset, offset)
+        reach = radii[first] + radii[second]
+        touching = np.flatnonzero(distance_sq < reach * reach)
+        if len(touching) == 0:
+            return 0
+        first, second, offset = first[touching], second[touching], offset[touching]
+        distance = np.sqrt(distance_sq[touching])
+        reach = reach[touching]
+
+        # Unit normal from the first ball to the second (any axis if concentric)
+        normal = np.empty_like(offset)
+        normal[:] = (1.0, 0.0)
+        np.divide(offset, distance[:, None], out=normal, where=distance[:, None] > 0)
+
+        # Each ball moves half the overlap apart
+        push = (0.5 * (reach - distance))[:, None] * normal
+        np.subtract.at(positions, first, push)
+        np.add.at(positions, second, push)
+
+        # Equal-mass impulse for pairs still approaching
+        approach = np.einsum('ij,ij->i', velocities[second] - velocities[first], normal)
+        impulse = (0.5 * (1 + self.restitution) * np.minimum(approach, 0.0))[:, None] * normal
+        np.add.at(velocities, first, impulse)
+        np.subtract.at(velocities, second, impulse)
+        return len(touching)
+
+
+def contact_candidates(positions, cell_size):
+    """
+    Pairs of points in the same or neighbouring grid cells
+
+    Points are counting-sorted into a dense table of cells, then every
+    point looks up the runs of points in the cells of NEIGHBOUR_CELLS
+    around its own, and the runs are expanded into index pairs. All of it
+    is a fixed number of array operations, with no Python loop over
+    points or cells.
+
+    Args:
+        positions: (n, 2) point coordinates (non-negative)
+        cell_size: Grid cell side, at least the largest contact distance
+
+    Returns:
+        Tuple (first, second) of index arrays, each unordered pair once
+    """
+    count = len(positions)
+    if count < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Cell coordinates padded by one cell on every side so neighbour keys
+    # stay inside the table
+    cells = np.floor_divide(positions, cell_size).astype(np.int64)
+    np.maximum(cells, 0, out=cells)
+    cells += 1
+    stride = int(cells[:, 1].max()) + 2
+    keys = cells[:, 0] * stride + cells[:, 1]
+    cell_count = np.bincount(keys, minlength=(int(cells[:, 0].max()) + 2) * stride)
+    cell_start = np.cumsum(cell_count) - cell_count
+    order = np.argsort(keys, kind='stable')
+
+    # Runs of points in each neighbouring cell of each point
+    targets = (keys[:, None] + NEIGHBOUR_OFFSETS[:, 0] * stride + NEIGHBOUR_OFFSETS[:, 1]).ravel()
+    counts = cell_count[targets]
+    total = int(counts.sum())
+    run_start = np.repeat(cell_start[targets] - (np.cumsum(counts) - counts), counts)
+    owner = np.repeat(np.repeat(np.arange(count), len(NEIGHBOUR_CELLS)), counts)
+    other = order[run_start + np.arange(total)]
+
+    # Within a cell each pair appears twice (and each point with itself)
+    other_cell = np.repeat(np.tile(NEIGHBOUR_OFFSETS.any(axis=1), count), counts)
+    keep = np.flatnonzero(other_cell | (other > owner))
+    return owner[keep], other[keep]
+
+
+def run_benchmark(num_balls, frames=600, fps=30.0, frame_size=(1280, 720), radius=12,
+                  physics=None, seed=0):
+    """
+    Time physics for one board over simulated frames
+
+    Frame times advance by exactly 1/fps, so every frame runs the same
+    number of steps regardless of how fast this machine is.
+
+    Args:
+        num_balls: Balls on the board
+        frames: Frames simulated
+        fps: Simulated render rate
+        frame_size: (width, height) of the play area
+        radius: Ball radius in pixels
+        physics: BallPhysics to time (defaults to BallPhysics())
+        seed: Seed for the starting layout and velocities
+
+    Returns:
+        Dictionary with per-frame physics time statistics in milliseconds,
+        steps per frame and average contacts per step
+    """
+    physics = physics if physics is not None else BallPhysics()
+    rng = np.random.default_rng(seed)
+
+    # Non-overlapping start on a jittered lattice
+    left, top, right, bottom = physics.margins
+    width, height = frame_size[0] - left - right, frame_size[1] - top - bottom
+    columns = max(1, int(math.ceil(math.sqrt(num_balls * width / height))))
+    rows = int(math.ceil(num_balls / columns))
+    pitch = min(width / columns, height / rows)
+    grid = np.indices((rows, columns)).reshape(2, -1).T[:num_balls][:, ::-1]
+    positions = ((grid + 0.5) * pitch + (left, top)
+                 + rng.uniform(-0.1, 0.1, (num_balls, 2)) * max(pitch - 2 * radius, 0))
+    balls = BallStore(positions, np.full(num_balls, radius), np.zeros(num_balls), [(0, 0, 0)])
+    physics.launch(balls, rng)
+
+    times = []
+    steps = 0
+    contacts = 0
+    timestamp = 0.0
+    physics.advance(balls, frame_size, (), timestamp)
+    for _ in range(frames):
+        timestamp += 1.0 / fps
+        start = time.perf_counter()
+        frame_steps = physics.advance(balls, frame_size, (), timestamp)
+        times.append((time.perf_counter() - start) * 1000.0)
+        steps += frame_steps
+        contacts += physics.contacts * frame_steps
+
+    return {
+        'balls': num_balls,
+        'frames': frames,
+        'fps': fps,
+        'steps_per_frame': steps / frames if frames else 0.0,
+        'contacts_per_step': contacts / steps if steps else 0.0,
+        'mean_ms': sum(times) / len(times) if times else 0.0,
+        'p50_ms': percentile(times, 50),
+        'p95_ms': percentile(times, 95),
+        'p99_ms': percentile(times, 99),
+        'max_ms': max(times) if times else 0.0,
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Ball physics benchmark")
+    parser.add_argument("--balls", type=int, nargs='+', default=[200],
+                        help="board sizes to time")
+    parser.add_argument("--frames", type=int, default=600, help="frames simulated per board")
+    parser.add_argument("--fps", type=float, default=30.0, help="simulated render rate")
+    parser.add_argument("--step", type=float, default=1 / 120, help="physics step in seconds")
+    parser.add_argument("--budget", type=float, default=2.0,
+                        help="per-frame budget in milliseconds checked against p95")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the physics benchmark; exits non-zero over budget"""
+    args = parse_args(argv)
+    results = [run_benchmark(count, args.frames, args.fps,
+                             physics=BallPhysics(step_time=args.step))
+               for count in args.balls]
+
+    print(f"{'balls':>6}{'steps':>7}{'contacts':>10}{'mean':>9}{'p50':>9}{'p95':>9}"
+          f"{'p99':>9}{'max':>9}")
+    for result in results:
+        print(f"{result['balls']:>6}{result['steps_per_frame']:>7.1f}"
+              f"{result['contacts_per_step']:>10.1f}{result['mean_ms']:>9.3f}"
+              f"{result['p50_ms']:>9.3f}{result['p95_ms']:>9.3f}{result['p99_ms']:>9.3f}"
+              f"{result['max_ms']:>9.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'platform': platform.platform(), 'python': platform.python_version(),
+                       'budget_ms': args.budget, 'results': results}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    over = [result['balls'] for result in results if result['p95_ms'] > args.budget]
+    if over:
+        print(f"over the {args.budget:.1f} ms budget at p95: {over} balls")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""
+Frame Pipeline Module
+Runs capture, hand detection and game rendering as overlapping stages
+"""
+
+import threading
+import time
+from collections import deque
+
+from buffers import BufferPool
+from profiler import NULL_PROFILER
+
+
+class LatestQueue:
+    """Bounded hand-off queue that drops the oldest item when full"""
+
+    def __init__(self, maxsize=1, on_drop=None):
+        """
+        Args:
+            maxsize: Maximum number of items held before dropping the oldest
+            on_drop: Called with each item discarded to make room
+        """
+        self.maxsize = max(1, maxsize)
+        self.on_drop = on_drop
+        self.items = deque()
+        self.dropped = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def put(self, item):
+        """Add an item, discarding the oldest one if the queue is full"""
+        with self.condition:
+            dropped = None
+            if len(self.items) >= self.maxsize:
+                dropped = self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.condition.notify()
+
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped)
+
+    def get(self, timeout=None):
+        """
+        Take the oldest item from the queue
+
+        Args:
+            timeout: Seconds to wait for an item (None waits forever)
+
+        Returns:
+            The item, or None if the queue timed out or was closed
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.items or self.closed, timeout)
+            if not self.items:
+                return None
+            return self.items.popleft()
+
+    def close(self):
+        """Wake up any waiting consumers and stop accepting waits"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class StageStats:
+    """Rolling timing statistics for one pipeline stage"""
+
+    def __init__(self, name, window=60):
+        """
+        Args:
+            name: Stage name
+            window: Number of recent samples to keep
+        """
+        self.name = name
+        self.durations = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, duration):
+        """Record one stage execution time in seconds"""
+        self.durations.append(duration)
+        self.count += 1
+
+    @property
+    def mean_ms(self):
+        """Average stage time over the window in milliseconds"""
+        if not self.durations:
+            return 0.0
+        return 1000.0 * sum(self.durations) / len(self.durations)
+
+    @property
+    def max_ms(self):
+        """Worst stage time over the window in milliseconds"""
+        if not self.durations:
+            return 0.0
+        return 1000.0 * max(self.durations)
+
+
+class FramePipeline:
+    """
+    Capture -> detection -> render pipeline
+
+    Capture and detection run on worker threads and hand frames forward
+    through drop-oldest queues, so capture never waits on inference and the
+    render stage (on the caller's thread) always acts on the freshest result.
+
+    Frames are captured into a fixed pool of buffers and travel unflipped
+    (the detector mirrors landmarks); the render stage gives each frame's
+    buffer back with release_frame() once it has made its display copy.
+    """
+
+    def __init__(self, capture, gesture_detector, queue_size=1, profiler=NULL_PROFILER,
+                 motion_gate=None):
+        """
+        Args:
+            capture: Frame source with a cv2.VideoCapture-style read()
+            gesture_detector: GestureDetector used by the detection stage
+            queue_size: Capacity of each inter-stage queue
+            profiler: StageProfiler receiving cap.read timings
+            motion_gate: Optional MotionGate deciding which frames are
+                         worth detecting while nobody is playing
+        """
+        self.capture = capture
+        self.gesture_detector = gesture_detector
+        self.profiler = profiler
+        self.motion_gate = motion_gate
+        self.hands_seen = False  # Whether the last detection found hands
+
+        # One buffer per queue slot, plus one each for capture, detection
+        # and render to be working on
+        self.buffer_pool = BufferPool(2 * queue_size + 3)
+        self.frame_queue = LatestQueue(queue_size,
+                                       on_drop=lambda item: self.release_frame(item[0]))
+        self.result_queue = LatestQueue(queue_size,
+                                        on_drop=lambda item: self.release_frame(item[0]))
+        self.stats = {
+            'capture': StageStats('capture'),
+            'detect': StageStats('detect'),
+            'render': StageStats('render'),
+        }
+
+        self.is_running = False
+        self.capture_failed = False
+        self.threads = []
+
+    def start(self):
+        """Start the capture and detection worker threads"""
+        self.is_running = True
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._detect_loop, name="detect", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        """Stop the worker threads and wait for them to exit"""
+        self.is_running = False
+        self.frame_queue.close()
+        self.result_queue.close()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+        self.threads = []
+
+    def _capture_loop(self):
+        """Read frames from the capture device into pooled buffers"""
+        while self.is_running:
+            acquired, buffer = self.buffer_pool.acquire(timeout=0.1)
+            if not acquired:
+                continue  # Every buffer is in flight; render is behind
+
+            start = time.perf_counter()
+            with self.profiler.stage('cap.read'):
+                success, frame = self.capture.read(buffer)
+            if not success:
+                self.buffer_pool.release(buffer)
+                self.capture_failed = True
+                self.result_queue.close()
+                break
+
+            self.stats['capture'].record(time.perf_counter() - start)
+            self.frame_queue.put((frame, start))
+
+    def _detect_loop(self):
+        """Run hand detection on the newest captured frame"""
+        while self.is_running:
+            item = self.frame_queue.get(timeout=0.1)
+            if item is None:
+                continue
+
+            frame, capture_time = item
+            if getattr(self.gesture_detector, 'loading', False):
+                # Model still loading (or failed to): keep frames flowing undetected
+                self.result_queue.put((frame, None, None, capture_time))
+                continue
+            if self.motion_gate is not None and not self.motion_gate.update(
+                    frame, capture_time, self.hands_seen):
+                # Nobody in front of the camera: pass the frame on undetected
+                self.result_queue.put((frame, None, None, capture_time))
+                continue
+
+            start = time.perf_counter()
+            hand_landmarks, handedness = self.gesture_detector.detect_hands(frame)
+            self.stats['detect'].record(time.perf_counter() - start)
+            self.hands_seen = bool(hand_landmarks)
+            self.result_queue.put((frame, hand_landmarks, handedness, capture_time))
+
+    def get_result(self, timeout=0.5):
+        """
+        Get the newest detection result for rendering
+
+        Returns:
+            Tuple (frame, hand_landmarks, handedness, capture_time) or None;
+            hand_landmarks and handedness are None on frames the motion
+            gate skipped or that arrived before the model was ready
+        """
+        return self.result_queue.get(timeout=timeout)
+
+    def release_frame(self, frame):
+        """Return a captured frame's buffer to the pool for reuse"""
+        self.buffer_pool.release(frame)
+
+    def get_stats(self):
+        """
+        Snapshot of per-stage timing and queue state
+
+        Returns:
+            Dictionary keyed by stage name with mean/max milliseconds,
+            processed frame count, queue depth and dropped frame count
+        """
+        queues = {
+            'capture': self.frame_queue,
+            'detect': self.result_queue,
+            'render': None,
+        }
+        snapshot = {}
+        for name, stats in self.stats.items():
+            queue = queues[name]
+            snapshot[name] = {
+                'mean_ms': stats.mean_ms,
+                'max_ms': stats.max_ms,
+                'frames': stats.count,
+                'queue_depth': len(queue) if queue is not None else 0,
+                'dropped': queue.dropped if queue is not None else 0,
+            }
+        return snapshot
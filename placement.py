@@ -0,0 +1,197 @@
+"""
+Ball Placement Module
+Poisson-disc sampling (Bridson's algorithm) for non-overlapping ball layouts
+"""
+
+import math
+import random
+
+import numpy as np
+
+
+class PlacementError(ValueError):
+    """Raised when the requested balls cannot fit in the play area"""
+
+    def __init__(self, message, fitted=0):
+        """
+        Args:
+            message: Error message
+            fitted: Balls that did fit at the smallest spacing tried
+        """
+        super().__init__(message)
+        self.fitted = fitted
+
+
+def poisson_disc_sample(bounds, min_distance, attempts=30, rng=random):
+    """
+    Generate a maximal Poisson-disc point set with Bridson's algorithm
+
+    Every point is at least min_distance from every other. A background
+    grid with cells of min_distance / sqrt(2) holds at most one point per
+    cell, so each candidate is checked against a fixed neighbourhood. Each
+    accepted point is tried as a parent at most once with a fixed number
+    of candidates, so the run always terminates after at most
+    attempts * (number of points) candidate draws.
+
+    Args:
+        bounds: (x_min, y_min, x_max, y_max) rectangle for the points
+        min_distance: Minimum distance between any two points
+        attempts: Candidates tried around each active point (k)
+        rng: random.Random-style generator (defaults to random module)
+
+    Returns:
+        Array of shape (n, 2) with the sampled points
+    """
+    x_min, y_min, x_max, y_max = bounds
+    width = x_max - x_min
+    height = y_max - y_min
+    if width < 0 or height < 0:
+        return np.empty((0, 2))
+
+    cell = min_distance / math.sqrt(2)
+    cols = int(width / cell) + 1
+    rows = int(height / cell) + 1
+
+    # Grid stores the index of the point in each cell, or -1; padded by 2
+    # cells on every side so neighbourhood slices never go out of range
+    grid = np.full((rows + 4, cols + 4), -1, dtype=np.int64)
+    points = np.zeros((rows * cols + 1, 2))
+    count = 0
+
+    def add_point(x, y):
+        nonlocal count
+        points[count] = (x, y)
+        grid[int((y - y_min) / cell) + 2, int((x - x_min) / cell) + 2] = count
+        count += 1
+
+    # Bulk draws come from a NumPy generator seeded from rng, so layouts
+    # stay reproducible from the caller's generator
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+
+    add_point(x_min + np_rng.random() * width, y_min + np_rng.random() * height)
+    active = [0]
+    min_sq = min_distance * min_distance
+
+    while active:
+        slot = int(np_rng.integers(len(active)))
+        parent = points[active[slot]]
+
+        # All k candidates for this parent in the annulus [r, 2r), at once
+        angles, spreads = np_rng.random((2, attempts))
+        angles *= 2 * math.pi
+        radii = min_distance * np.sqrt(1 + 3 * spreads)
+        candidates = np.empty((attempts, 2))
+        candidates[:, 0] = parent[0] + np.cos(angles) * radii
+        candidates[:, 1] = parent[1] + np.sin(angles) * radii
+
+        inside = ((candidates[:, 0] >= x_min) & (candidates[:, 0] <= x_max) &
+                  (candidates[:, 1] >= y_min) & (candidates[:, 1] <= y_max))
+        candidates = candidates[inside]
+
+        accepted = False
+        if len(candidates):
+            # Neighbourhood covering every cell within 2r of the parent
+            px = int((parent[0] - x_min) / cell) + 2
+            py = int((parent[1] - y_min) / cell) + 2
+            block = grid[max(py - 5, 0):py + 6, max(px - 5, 0):px + 6]
+            neighbours = points[block[block >= 0]]
+
+            dx = candidates[:, 0, None] - neighbours[:, 0]
+            dy = candidates[:, 1, None] - neighbours[:, 1]
+            clear = ((dx * dx + dy * dy) >= min_sq).all(axis=1)
+
+            valid = np.flatnonzero(clear)
+            if len(valid):
+                x, y = candidates[valid[0]]
+                add_point(x, y)
+                active.append(count - 1)
+                accepted = True
+
+        if not accepted:
+            active[slot] = active[-1]
+            active.pop()
+
+    return points[:count].copy()
+
+
+def outside_obstacles(points, obstacles, clearance=0.0):
+    """
+    Mask of points clear of every obstacle
+
+    Args:
+        points: Array of shape (n, 2)
+        obstacles: ('rect', x0, y0, x1, y1) and ('circle', x, y, r) tuples
+        clearance: Extra distance kept from each obstacle (e.g. ball radius)
+
+    Returns:
+        Boolean array of shape (n,)
+    """
+    clear = np.ones(len(points), dtype=bool)
+    for kind, *shape in obstacles:
+        if kind == 'rect':
+            x0, y0, x1, y1 = shape
+            # Distance from each point to the rectangle (0 inside it)
+            dx = np.maximum(np.maximum(x0 - points[:, 0], points[:, 0] - x1), 0)
+            dy = np.maximum(np.maximum(y0 - points[:, 1], points[:, 1] - y1), 0)
+            clear &= dx * dx + dy * dy > clearance * clearance
+        else:
+            x, y, r = shape
+            clear &= np.hypot(points[:, 0] - x, points[:, 1] - y) > r + clearance
+    return clear
+
+
+def place_balls(num_balls, frame_size, spacing, min_spacing=None, margins=(50, 100, 50, 50),
+                ball_radius=0, attempts=30, shrink_factor=0.9, obstacles=(), rng=random):
+    """
+    Choose non-overlapping ball positions inside the play area
+
+    Args:
+        num_balls: Number of ball centres needed
+        frame_size: (width, height) of the frame
+        spacing: Preferred minimum distance between ball centres
+        min_spacing: Smallest spacing allowed when shrinking to fit
+                     (defaults to spacing, i.e. never shrink)
+        margins: (left, top, right, bottom) pixels kept free of balls
+        ball_radius: Ball radius, kept clear of the margins as well
+        attempts: Bridson candidates per active point
+        shrink_factor: Spacing multiplier applied after each failed attempt
+        obstacles: Areas kept free of balls (see outside_obstacles)
+        rng: Random number generator (defaults to random module)
+
+    Returns:
+        Array of shape (num_balls, 2) with ball centres
+
+    Raises:
+        PlacementError: If the balls cannot fit even at min_spacing
+    """
+    width, height = frame_size
+    left, top, right, bottom = margins
+    bounds = (left + ball_radius, top + ball_radius,
+              width - right - ball_radius, height - bottom - ball_radius)
+    if min_spacing is None:
+        min_spacing = spacing
+
+    # A maximal Poisson-disc set has roughly 0.7 / r^2 points per unit area.
+    # Start from the widest spacing that still yields ~1.5x the balls needed,
+    # which spreads small levels across the field and keeps the sample (and
+    # so the sampling time) proportional to num_balls; skip straight past
+    # spacings that clearly cannot fit them all
+    area = max(bounds[2] - bounds[0], 0) * max(bounds[3] - bounds[1], 0)
+    if num_balls > 0 and area > 0:
+        spacing = max(spacing, math.sqrt(0.7 * area / (1.5 * num_balls)))
+        spacing = max(min(spacing, math.sqrt(0.75 * area / num_balls)), min_spacing)
+
+    while True:
+        points = poisson_disc_sample(bounds, spacing, attempts, rng)
+        if obstacles:
+            points = points[outside_obstacles(points, obstacles, ball_radius)]
+        if len(points) >= num_balls:
+            # Random subset so the layout is spread over the whole field
+            chosen = rng.sample(range(len(points)), num_balls)
+            return points[chosen]
+
+        if spacing <= min_spacing:
+            raise PlacementError(
+                f"Cannot fit {num_balls} balls in a {width}x{height} frame "
+                f"at spacing {spacing:.1f}px (only {len(points)} fit)", fitted=len(points))
+        spacing = max(spacing * shrink_factor, min_spacing)
@@ -0,0 +1,208 @@
+"""
+Presenter Module
+Frame display, deadline-based pacing and non-blocking key input
+"""
+
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+import cv2
+
+NO_KEY = -1
+
+
+class FramePacer:
+    """
+    Presents frames on a fixed grid of deadlines and measures the result
+
+    With a target rate, frames that are ready early wait for their slot
+    (sleeping most of the way, then spinning the last spin seconds since
+    sleep overshoots by a fraction of a millisecond). A late frame goes out
+    immediately and the next deadline snaps to the following slot on the
+    same grid, the way vsync drops a frame instead of bunching the next
+    ones together. Without a target rate frames go out as soon as they are
+    ready and only the statistics are kept.
+    """
+
+    def __init__(self, target_fps=None, window=300, spin=0.0005):
+        """
+        Args:
+            target_fps: Presentation rate (None presents immediately)
+            window: Number of recent frame intervals kept for statistics
+            spin: Seconds before a deadline to stop sleeping and spin
+        """
+        self.interval = 1.0 / target_fps if target_fps else None
+        self.spin = spin
+        self.deadline = None
+        self.last_present = None
+        self.intervals = deque(maxlen=window)  # Seconds between presents
+        self.presented = 0
+        self.missed = 0  # Deadlines that passed without a frame
+
+    def wait(self):
+        """
+        Block until the next frame slot
+
+        Returns:
+            time.perf_counter() at which the frame is presented
+        """
+        now = time.perf_counter()
+        if self.interval is not None:
+            if self.deadline is None:
+                self.deadline = now
+            remaining = self.deadline - now
+            if remaining >= 0:
+                if remaining > self.spin:
+                    time.sleep(remaining - self.spin)
+                while time.perf_counter() < self.deadline:
+                    pass
+                now = time.perf_counter()
+                self.deadline += self.interval
+            else:
+                missed = math.floor(-remaining / self.interval) + 1
+                self.missed += missed
+                self.deadline += missed * self.interval
+
+        if self.last_present is not None:
+            self.intervals.append(now - self.last_present)
+        self.last_present = now
+        self.presented += 1
+        return now
+
+    def reset(self):
+        """Forget the deadline grid and statistics (e.g. after a pause)"""
+        self.deadline = None
+        self.last_present = None
+        self.intervals.clear()
+        self.presented = 0
+        self.missed = 0
+
+    def stats(self):
+        """
+        Frame interval statistics over the recent window
+
+        Returns:
+            Dictionary with fps, mean/std/percentile intervals in
+            milliseconds, jitter (mean change between consecutive
+            intervals) and the number of missed deadlines
+        """
+        if not self.intervals:
+            return {'fps': 0.0, 'mean_ms': 0.0, 'std_ms': 0.0, 'p50_ms': 0.0,
+                    'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0, 'jitter_ms': 0.0,
+                    'missed': self.missed}
+        ms = np.fromiter(self.intervals, dtype=np.float64, count=len(self.intervals)) * 1000.0
+        p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+        mean = float(ms.mean())
+        return {
+            'fps': 1000.0 / mean if mean > 0 else 0.0,
+            'mean_ms': mean,
+            'std_ms': float(ms.std()),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(ms.max()),
+            'jitter_ms': float(np.abs(np.diff(ms)).mean()) if len(ms) > 1 else 0.0,
+            'missed': self.missed,
+        }
+
+
+class Presenter:
+    """
+    Base presenter: paces frames and reports no window or keys
+
+    The frame loop calls pace() then show() once per frame (present() does
+    both) and poll_key() to read input. Subclasses decide where frames go.
+    """
+
+    def __init__(self, target_fps=None, window=300):
+        """
+        Args:
+            target_fps: Presentation rate for deadline pacing (None
+                        presents every frame as soon as it is ready)
+            window: Number of recent frame intervals kept for statistics
+        """
+        self.pacer = FramePacer(target_fps=target_fps, window=window)
+
+    def open(self):
+        """Prepare the output (e.g. create the window)"""
+
+    def pace(self):
+        """Wait for the next frame slot; returns the presentation time"""
+        return self.pacer.wait()
+
+    def show(self, frame):
+        """Display a frame now, without pacing (used for splash screens)"""
+
+    def present(self, frame):
+        """Wait for the next frame slot and display the frame"""
+        timestamp = self.pace()
+        self.show(frame)
+        return timestamp
+
+    def poll_key(self):
+        """Return the next pending key code, or NO_KEY without waiting"""
+        return NO_KEY
+
+    def stats(self):
+        """Frame pacing statistics (see FramePacer.stats)"""
+        return self.pacer.stats()
+
+    def close(self):
+        """Release the output"""
+
+
+class CvPresenter(Presenter):
+    """Displays frames in an OpenCV window and polls its keyboard events"""
+
+    def __init__(self, window_name, target_fps=None, window=300):
+        """
+        Args:
+            window_name: Title of the OpenCV window
+            target_fps: Presentation rate for deadline pacing
+            window: Number of recent frame intervals kept for statistics
+        """
+        super().__init__(target_fps=target_fps, window=window)
+        self.window_name = window_name
+
+    def open(self):
+        cv2.namedWindow(self.window_name, cv2.WINDOW_AUTOSIZE)
+
+    def show(self, frame):
+        cv2.imshow(self.window_name, frame)
+
+    def poll_key(self):
+        # pollKey pumps window events like waitKey but never sleeps
+        return cv2.pollKey()
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class NullPresenter(Presenter):
+    """
+    Headless presenter for servers, soak runs and tests
+
+    Frames are paced and measured like on screen but not displayed; the
+    last one is kept for inspection. Key codes given as keys are returned
+    by poll_key() one per call, as if typed into the window.
+    """
+
+    def __init__(self, target_fps=None, window=300, keys=()):
+        """
+        Args:
+            target_fps: Presentation rate for deadline pacing
+            window: Number of recent frame intervals kept for statistics
+            keys: Key codes (or one-character strings) to feed to poll_key()
+        """
+        super().__init__(target_fps=target_fps, window=window)
+        self.keys = deque(ord(key) if isinstance(key, str) else key for key in keys)
+        self.last_frame = None
+
+    def show(self, frame):
+        self.last_frame = frame
+
+    def poll_key(self):
+        return self.keys.popleft() if self.keys else NO_KEY
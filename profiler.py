@@ -0,0 +1,220 @@
+"""
+Profiler Module
+Low-overhead per-stage timing, rolling statistics and trace export
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from utils import percentile
+
+
+class _StageTimer:
+    """Context manager timing one execution of a stage"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NullTimer:
+    """Shared no-op timer used while profiling is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageProfiler:
+    """
+    Collects per-stage latencies for the frame loop
+
+    Wrap each stage in `with profiler.stage('name'):`. Durations are kept
+    in a rolling window per stage for live statistics, per-frame totals are
+    kept to find which stage caused a slow frame, and (optionally) every
+    span is kept for Chrome trace / Perfetto or CSV export. Stages may be
+    timed from any thread (capture and detection workers included); a lock
+    keeps the shared samples and frame totals consistent.
+    """
+
+    def __init__(self, enabled=True, window=300, record_events=False, max_events=200000,
+                 spike_factor=2.0):
+        """
+        Args:
+            enabled: Collect timings (when False stage() is a no-op)
+            window: Number of recent samples kept per stage
+            record_events: Keep individual spans for export
+            max_events: Most spans kept (oldest are dropped)
+            spike_factor: A frame slower than this times the rolling median
+                          frame time is reported as a spike
+        """
+        self.enabled = enabled
+        self.window = window
+        self.record_events = record_events
+        self.spike_factor = spike_factor
+
+        self.samples = {}  # stage name -> deque of durations in ms
+        self.events = deque(maxlen=max_events)  # (name, thread id, start ns, duration ns)
+        self.origin_ns = time.perf_counter_ns()
+
+        self.frame_stages = {}  # stage name -> ms accumulated in the current frame
+        self.frame_start = None
+        self.last_spike = None  # (frame ms, {stage: ms}) of the latest slow frame
+        self.median_frame_ms = None  # Refreshed every 30 frames
+        self.frame_count = 0
+        self.lock = threading.Lock()  # Guards samples, events and frame_stages
+
+    def stage(self, name):
+        """Context manager timing one stage execution"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        """Record one stage span measured with time.perf_counter_ns()"""
+        with self.lock:
+            self._record(name, start_ns, end_ns)
+
+    def _record(self, name, start_ns, end_ns):
+        duration_ms = (end_ns - start_ns) / 1e6
+
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(duration_ms)
+        self.frame_stages[name] = self.frame_stages.get(name, 0.0) + duration_ms
+
+        if self.record_events:
+            self.events.append((name, threading.get_ident(), start_ns, end_ns - start_ns))
+
+    def begin_frame(self):
+        """Mark the start of a frame"""
+        if self.enabled:
+            with self.lock:
+                self.frame_start = time.perf_counter_ns()
+                self.frame_stages = {}
+
+    def end_frame(self):
+        """Mark the end of a frame and check it for a latency spike"""
+        if not self.enabled or self.frame_start is None:
+            return
+
+        with self.lock:
+            stages = self.frame_stages
+            self.frame_stages = {}
+            self._record('frame', self.frame_start, time.perf_counter_ns())
+            frames = list(self.samples['frame'])
+        frame_ms = frames[-1]
+
+        self.frame_count += 1
+        if self.frame_count % 30 == 0:
+            self.median_frame_ms = percentile(frames, 50)
+        if self.median_frame_ms is not None and frame_ms > self.spike_factor * self.median_frame_ms:
+            self.last_spike = (frame_ms, stages)
+        self.frame_start = None
+
+    def summary(self):
+        """
+        Rolling statistics per stage
+
+        Returns:
+            Dictionary of stage name -> mean/p50/p95/p99/max in milliseconds
+        """
+        with self.lock:
+            snapshot = {name: list(samples) for name, samples in self.samples.items()}
+        stats = {}
+        for name, values in snapshot.items():
+            if not values:
+                continue
+            stats[name] = {
+                'mean_ms': sum(values) / len(values),
+                'p50_ms': percentile(values, 50),
+                'p95_ms': percentile(values, 95),
+                'p99_ms': percentile(values, 99),
+                'max_ms': max(values),
+            }
+        return stats
+
+    def histogram(self, name, bins=(0, 1, 2, 5, 10, 20, 33, 50, 100, float('inf'))):
+        """
+        Histogram of a stage's recent durations
+
+        Args:
+            name: Stage name
+            bins: Bucket edges in milliseconds
+
+        Returns:
+            List of counts, one per bucket
+        """
+        with self.lock:
+            values = np.array(self.samples.get(name, ()), dtype=np.float64)
+        counts, _ = np.histogram(values, bins=np.asarray(bins))
+        return counts.tolist()
+
+    def export_chrome_trace(self, path):
+        """
+        Write recorded spans as a Chrome trace (loadable in Perfetto or
+        chrome://tracing)
+        """
+        pid = os.getpid()
+        trace_events = [
+            {
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self.origin_ns) / 1000.0,
+                'dur': duration / 1000.0,
+                'pid': pid,
+                'tid': tid,
+            }
+            for name, tid, start, duration in self._spans()
+        ]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+
+    def export_csv(self, path):
+        """Write recorded spans as CSV (stage, thread, start_us, duration_us)"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['stage', 'thread', 'start_us', 'duration_us'])
+            for name, tid, start, duration in self._spans():
+                writer.writerow([name, tid, (start - self.origin_ns) / 1000.0, duration / 1000.0])
+
+    def _spans(self):
+        """Copy of the recorded spans"""
+        with self.lock:
+            return list(self.events)
+
+    def export(self, path):
+        """Export spans, choosing CSV or Chrome trace JSON by file extension"""
+        if path.lower().endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_chrome_trace(path)
+
+
+# Shared disabled profiler for components created without one
+NULL_PROFILER = StageProfiler(enabled=False)
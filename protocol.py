@@ -0,0 +1,320 @@
+"""
+State Protocol Module
+Compact binary encoding of per-frame landmarks and game-state deltas
+"""
+
+import struct
+
+import numpy as np
+
+from balls import BallStore
+from landmarks import NUM_LANDMARKS
+
+MAGIC = b'GG'
+VERSION = 2
+
+# Message types
+MSG_FRAME = 1  # Per-frame landmarks, cursors and events since the last frame
+MSG_SNAPSHOT = 2  # Full board state, sent to new (or lagging) clients
+
+# Event types
+EVENT_LAYOUT = 1
+EVENT_SELECT = 2
+EVENT_RELEASE = 3
+EVENT_MATCH = 4
+EVENT_LEVEL = 5
+EVENT_BLOCKED = 6
+EVENT_TIMEOUT = 7
+EVENT_STUCK = 8
+EVENT_ATTRACT = 9
+EVENT_WAKE = 10
+
+# GameManager events the protocol can carry
+EVENTS = ('layout', 'select', 'release', 'match', 'level', 'blocked', 'timeout', 'stuck',
+          'attract', 'wake')
+
+# Events carrying only a level number, and those carrying nothing
+_LEVEL_EVENTS = {'level': EVENT_LEVEL, 'timeout': EVENT_TIMEOUT, 'stuck': EVENT_STUCK}
+_EMPTY_EVENTS = {'attract': EVENT_ATTRACT, 'wake': EVENT_WAKE}
+
+NO_BALL = 0xFFFF
+
+LENGTH = struct.Struct('<I')
+HEADER = struct.Struct('<2sBBIdiHH')  # magic, version, type, frame id, time, score, level, combo
+COUNT8 = struct.Struct('<B')
+COUNT16 = struct.Struct('<H')
+CURSOR = struct.Struct('<iffH')  # hand id, x, y, selected ball
+LAYOUT = struct.Struct('<HHHH')  # ball count, radius, frame width, frame height
+HAND_BALL = struct.Struct('<iH')  # hand id, ball id
+MATCH = struct.Struct('<iHH')  # hand id, ball 1, ball 2
+LEVEL = struct.Struct('<H')
+PAIR = struct.Struct('<HH')
+
+
+def frame_message(message):
+    """Prefix an encoded message with its length for stream transport"""
+    return LENGTH.pack(len(message)) + message
+
+
+def _encode_layout(data):
+    """Encode a 'layout' event payload"""
+    positions = np.asarray(data['positions'], dtype='<f4').reshape(-1, 2)
+    colors = np.asarray(data['colors'], dtype=np.uint8).reshape(-1, 3)
+    width, height = data['frame_size']
+    return (LAYOUT.pack(len(positions), int(data['radius']), int(width), int(height))
+            + positions.tobytes() + colors.tobytes())
+
+
+def _decode_layout(buffer, offset):
+    """Decode a 'layout' payload, returning (data, new offset)"""
+    count, radius, width, height = LAYOUT.unpack_from(buffer, offset)
+    offset += LAYOUT.size
+    positions = np.frombuffer(buffer, dtype='<f4', count=count * 2, offset=offset).reshape(count, 2)
+    offset += count * 8
+    colors = np.frombuffer(buffer, dtype=np.uint8, count=count * 3, offset=offset).reshape(count, 3)
+    offset += count * 3
+    data = {
+        'positions': positions.astype(np.float64),
+        'colors': [tuple(int(c) for c in color) for color in colors],
+        'radius': radius,
+        'frame_size': (width, height),
+    }
+    return data, offset
+
+
+def encode_event(event, data):
+    """Encode one GameManager event"""
+    if event == 'layout':
+        return COUNT8.pack(EVENT_LAYOUT) + _encode_layout(data)
+    if event == 'select':
+        return COUNT8.pack(EVENT_SELECT) + HAND_BALL.pack(data['hand_id'], data['ball_id'])
+    if event == 'release':
+        return COUNT8.pack(EVENT_RELEASE) + HAND_BALL.pack(data['hand_id'], data['ball_id'])
+    if event in ('match', 'blocked'):
+        event_type = EVENT_MATCH if event == 'match' else EVENT_BLOCKED
+        return COUNT8.pack(event_type) + MATCH.pack(data['hand_id'], data['ball1_id'],
+                                                    data['ball2_id'])
+    if event in _LEVEL_EVENTS:
+        return COUNT8.pack(_LEVEL_EVENTS[event]) + LEVEL.pack(data['level'])
+    if event in _EMPTY_EVENTS:
+        return COUNT8.pack(_EMPTY_EVENTS[event])
+    raise ValueError(f"Unknown event: {event}")
+
+
+def _decode_event(buffer, offset):
+    """Decode one event, returning ((event, data), new offset)"""
+    (event_type,) = COUNT8.unpack_from(buffer, offset)
+    offset += COUNT8.size
+
+    if event_type == EVENT_LAYOUT:
+        data, offset = _decode_layout(buffer, offset)
+        return ('layout', data), offset
+    if event_type in (EVENT_SELECT, EVENT_RELEASE):
+        hand_id, ball_id = HAND_BALL.unpack_from(buffer, offset)
+        event = 'select' if event_type == EVENT_SELECT else 'release'
+        return (event, {'hand_id': hand_id, 'ball_id': ball_id}), offset + HAND_BALL.size
+    if event_type in (EVENT_MATCH, EVENT_BLOCKED):
+        hand_id, ball1_id, ball2_id = MATCH.unpack_from(buffer, offset)
+        data = {'hand_id': hand_id, 'ball1_id': ball1_id, 'ball2_id': ball2_id}
+        event = 'match' if event_type == EVENT_MATCH else 'blocked'
+        return (event, data), offset + MATCH.size
+    for event, level_type in _LEVEL_EVENTS.items():
+        if event_type == level_type:
+            (level,) = LEVEL.unpack_from(buffer, offset)
+            return (event, {'level': level}), offset + LEVEL.size
+    for event, empty_type in _EMPTY_EVENTS.items():
+        if event_type == empty_type:
+            return (event, {}), offset
+    raise ValueError(f"Unknown event type: {event_type}")
+
+
+def _header(message_type, frame_id, timestamp, game_manager):
+    return HEADER.pack(MAGIC, VERSION, message_type, frame_id & 0xFFFFFFFF, timestamp,
+                       game_manager.score, game_manager.level, game_manager.combo)
+
+
+def encode_frame(frame_id, timestamp, game_manager, hand_landmarks, hand_ids, events):
+    """
+    Encode one frame's landmarks, cursors and game events
+
+    Args:
+        frame_id: Frame counter
+        timestamp: Capture time in seconds
+        game_manager: GameManager (for score, level, combo and cursors)
+        hand_landmarks: HandLandmarks of the frame
+        hand_ids: Track id of each hand in hand_landmarks
+        events: List of (event, data) emitted since the previous frame
+
+    Returns:
+        bytes
+    """
+    parts = [_header(MSG_FRAME, frame_id, timestamp, game_manager)]
+
+    points = hand_landmarks.points if hand_landmarks else np.empty((0, NUM_LANDMARKS, 3))
+    parts.append(COUNT8.pack(len(points)))
+    parts.append(np.asarray(hand_ids, dtype='<i4').tobytes())
+    parts.append(np.ascontiguousarray(points, dtype='<f4').tobytes())
+
+    cursors = [session for session in game_manager.sessions.values()
+               if session.cursor_pos is not None]
+    parts.append(COUNT8.pack(len(cursors)))
+    for session in cursors:
+        ball = session.first_selected_ball
+        parts.append(CURSOR.pack(session.hand_id, session.cursor_pos[0], session.cursor_pos[1],
+                                 ball['id'] if ball is not None else NO_BALL))
+
+    parts.append(COUNT16.pack(len(events)))
+    parts.extend(encode_event(event, data) for event, data in events)
+    return b''.join(parts)
+
+
+def encode_snapshot(frame_id, timestamp, game_manager):
+    """Encode the full board state so a client can start rendering"""
+    parts = [_header(MSG_SNAPSHOT, frame_id, timestamp, game_manager)]
+    parts.append(_encode_layout({
+        'positions': game_manager.ball_positions,
+        'colors': game_manager.balls.colors(),
+        'radius': game_manager.ball_radius,
+        'frame_size': game_manager.frame_size,
+    }))
+
+    parts.append(COUNT16.pack(len(game_manager.matched_pairs)))
+    for pair in game_manager.matched_pairs:
+        parts.append(PAIR.pack(pair['ball1_id'], pair['ball2_id']))
+
+    parts.append(COUNT8.pack(len(game_manager.ball_owner)))
+    for ball_id, hand_id in game_manager.ball_owner.items():
+        parts.append(HAND_BALL.pack(hand_id, ball_id))
+    return b''.join(parts)
+
+
+def decode_message(buffer):
+    """
+    Decode a message produced by encode_frame or encode_snapshot
+
+    Returns:
+        Dictionary with 'type', 'frame_id', 'timestamp', 'score', 'level',
+        'combo' and the type-specific fields
+    """
+    magic, version, message_type, frame_id, timestamp, score, level, combo = \
+        HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a game state message")
+
+    message = {'type': message_type, 'frame_id': frame_id, 'timestamp': timestamp,
+               'score': score, 'level': level, 'combo': combo}
+    offset = HEADER.size
+
+    if message_type == MSG_SNAPSHOT:
+        message['layout'], offset = _decode_layout(buffer, offset)
+
+        (count,) = COUNT16.unpack_from(buffer, offset)
+        offset += COUNT16.size
+        message['pairs'] = [PAIR.unpack_from(buffer, offset + i * PAIR.size) for i in range(count)]
+        offset += count * PAIR.size
+
+        (count,) = COUNT8.unpack_from(buffer, offset)
+        offset += COUNT8.size
+        message['selected'] = [HAND_BALL.unpack_from(buffer, offset + i * HAND_BALL.size)
+                               for i in range(count)]
+        return message
+
+    (num_hands,) = COUNT8.unpack_from(buffer, offset)
+    offset += COUNT8.size
+    message['hand_ids'] = np.frombuffer(buffer, dtype='<i4', count=num_hands, offset=offset)
+    offset += num_hands * 4
+    size = num_hands * NUM_LANDMARKS * 3
+    message['landmarks'] = np.frombuffer(buffer, dtype='<f4', count=size,
+                                         offset=offset).reshape(num_hands, NUM_LANDMARKS, 3)
+    offset += size * 4
+
+    (count,) = COUNT8.unpack_from(buffer, offset)
+    offset += COUNT8.size
+    cursors = []
+    for _ in range(count):
+        hand_id, x, y, ball_id = CURSOR.unpack_from(buffer, offset)
+        cursors.append((hand_id, (x, y), None if ball_id == NO_BALL else ball_id))
+        offset += CURSOR.size
+    message['cursors'] = cursors
+
+    (count,) = COUNT16.unpack_from(buffer, offset)
+    offset += COUNT16.size
+    events = []
+    for _ in range(count):
+        event, offset = _decode_event(buffer, offset)
+        events.append(event)
+    message['events'] = events
+    return message
+
+
+class RemoteBoard:
+    """
+    Client-side mirror of the game board rebuilt from snapshots and deltas
+
+    Exposes the same attributes the renderer reads from GameManager
+    (balls, matched_pairs, obstacles, physics, score, level, combo,
+    state_version).
+    """
+
+    def __init__(self):
+        self.balls = BallStore()
+        self.matched_pairs = []
+        self.obstacles = []  # Not sent; drawn only by the game itself
+        self.physics = None  # Remote balls do not move
+        self.attract = False  # The game is waiting for a player
+        self.score = 0
+        self.level = 1
+        self.combo = 0
+        self.frame_size = (1280, 720)
+        self.state_version = 0
+        self.synced = False  # True once a snapshot has been applied
+
+        self.landmarks = np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.cursors = []  # (hand_id, (x, y), selected ball id or None)
+
+    def apply(self, message):
+        """Update the mirror from a decoded message"""
+        if message['type'] == MSG_SNAPSHOT:
+            self._set_layout(message['layout'])
+            for ball1_id, ball2_id in message['pairs']:
+                self._match(ball1_id, ball2_id)
+            for hand_id, ball_id in message['selected']:
+                self.balls.selected[ball_id] = True
+            self.synced = True
+        elif self.synced:
+            self.landmarks = message['landmarks']
+            self.cursors = message['cursors']
+            for event, data in message['events']:
+                if event == 'layout':
+                    self._set_layout(data)
+                elif event == 'select':
+                    self.balls.selected[data['ball_id']] = True
+                elif event == 'release':
+                    self.balls.selected[data['ball_id']] = False
+                elif event == 'match':
+                    self._match(data['ball1_id'], data['ball2_id'])
+                elif event in ('attract', 'wake'):
+                    self.attract = event == 'attract'
+            if message['events']:
+                self.state_version += 1
+
+        if (message['score'], message['level'], message['combo']) != (self.score, self.level, self.combo):
+            self.score, self.level, self.combo = message['score'], message['level'], message['combo']
+            self.state_version += 1
+
+    def current_lines(self):
+        """Rubber-band lines from each hand's selected ball to its cursor"""
+        return [(tuple(self.balls.positions[ball_id]), position)
+                for _, position, ball_id in self.cursors
+                if ball_id is not None and ball_id < len(self.balls)]
+
+    def _set_layout(self, layout):
+        self.frame_size = layout['frame_size']
+        self.balls = BallStore.from_colors(layout['positions'], layout['radius'], layout['colors'])
+        self.matched_pairs = []
+        self.state_version += 1
+
+    def _match(self, ball1_id, ball2_id):
+        self.balls.matched[[ball1_id, ball2_id]] = True
+        self.matched_pairs.append({'ball1_id': ball1_id, 'ball2_id': ball2_id,
+                                   'color': self.balls.color(ball1_id)})
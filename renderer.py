@@ -0,0 +1,192 @@
+"""
+Renderer Module
+Retained-mode layer for the static game board and HUD
+"""
+
+import numpy as np
+
+import cv2
+from landmarks import FINGER_TIPS, HAND_CONNECTIONS
+from utils import draw_text
+
+# Hand drawing level of detail
+SKELETON_FULL = 'full'  # Bones and every joint
+SKELETON_TIPS = 'tips'  # Fingertips only
+SKELETON_OFF = 'off'
+SKELETON_LEVELS = (SKELETON_FULL, SKELETON_TIPS, SKELETON_OFF)
+
+
+class BoardLayer:
+    """
+    Pre-rendered layer holding everything that only changes on game events
+
+    Balls, matched-pair lines and the score HUD are drawn once into an
+    off-screen image and re-drawn only when GameManager.state_version (or
+    the frame size) changes. Each frame the layer is copied onto the camera
+    image through its mask in a single vectorized operation. Balls that
+    move (GameManager.physics is set) are left out of the layer and drawn
+    straight onto each frame instead.
+    """
+
+    def __init__(self):
+        self.image = None  # BGR layer contents
+        self.mask = None  # uint8 mask, non-zero where the layer is opaque
+        self.key = None  # (state_version, frame shape) the layer was drawn for
+
+    def composite(self, frame, game_manager):
+        """
+        Blend the static layer onto a frame, re-rendering it if stale
+
+        Args:
+            frame: BGR frame drawn on in place
+            game_manager: GameManager providing the board state
+        """
+        key = (game_manager.state_version, frame.shape)
+        if key != self.key:
+            self.render(frame.shape, game_manager)
+            self.key = key
+
+        cv2.copyTo(self.image, self.mask, frame)
+        if game_manager.physics is not None:
+            draw_balls(frame, game_manager)
+
+    def render(self, shape, game_manager):
+        """Draw the static board and HUD into the layer"""
+        if self.image is None or self.image.shape != shape:
+            self.image = np.zeros(shape, dtype=np.uint8)
+        else:
+            self.image.fill(0)
+
+        draw_board(self.image, game_manager)
+        draw_hud(self.image, game_manager)
+
+        # Opaque wherever any channel was drawn
+        b, g, r = cv2.split(self.image)
+        self.mask = cv2.max(cv2.max(b, g), r)
+
+
+def draw_board(canvas, game_manager):
+    """Draw obstacles, matched-pair lines and (unless they move) unmatched balls"""
+    balls = game_manager.balls
+
+    for kind, *shape in game_manager.obstacles:
+        if kind == 'rect':
+            x0, y0, x1, y1 = map(int, shape)
+            cv2.rectangle(canvas, (x0, y0), (x1, y1), (90, 90, 90), -1)
+            cv2.rectangle(canvas, (x0, y0), (x1, y1), (160, 160, 160), 2)
+        else:
+            x, y, r = map(int, shape)
+            cv2.circle(canvas, (x, y), r, (90, 90, 90), -1)
+            cv2.circle(canvas, (x, y), r, (160, 160, 160), 2)
+
+    # Integer centres for every ball, converted once
+    centers = balls.positions.astype(np.int32).tolist()
+
+    # Draw matched pairs with lines
+    for pair in game_manager.matched_pairs:
+        cv2.line(canvas, centers[pair['ball1_id']], centers[pair['ball2_id']],
+                 pair['color'], 3)
+
+    if game_manager.physics is None:
+        draw_balls(canvas, game_manager, centers)
+
+
+def draw_balls(canvas, game_manager, centers=None):
+    """Draw unmatched balls with a white border, highlighting selected ones"""
+    balls = game_manager.balls
+    if centers is None:
+        centers = balls.positions.astype(np.int32).tolist()
+
+    unmatched = balls.unmatched()
+    palette = balls.palette
+    for i, radius, color_id, selected in zip(unmatched.tolist(), balls.radii[unmatched].tolist(),
+                                             balls.color_ids[unmatched].tolist(),
+                                             balls.selected[unmatched].tolist()):
+        if selected:
+            cv2.circle(canvas, centers[i], radius + 5, (255, 255, 255), 3)
+        cv2.circle(canvas, centers[i], radius, palette[color_id], -1)
+        cv2.circle(canvas, centers[i], radius, (255, 255, 255), 2)
+
+
+def draw_hud(canvas, game_manager):
+    """Draw score, level, pair count and combo"""
+    # Score
+    score_text = f"Score: {game_manager.score}"
+    draw_text(canvas, score_text, (10, 30), color=(0, 255, 0), font_size=1)
+
+    # Level
+    level_text = f"Level: {game_manager.level}"
+    draw_text(canvas, level_text, (10, 60), color=(0, 255, 0), font_size=1)
+
+    # Remaining pairs
+    total_pairs = len(game_manager.balls) // 2
+    matched_pairs = len(game_manager.matched_pairs)
+    remaining_text = f"Pairs: {matched_pairs}/{total_pairs}"
+    draw_text(canvas, remaining_text, (10, 90),
+              color=(255, 200, 0), font_size=1)
+
+    # Combo
+    if game_manager.combo > 0:
+        combo_text = f"Combo: {game_manager.combo}x"
+        draw_text(canvas, combo_text, (10, 120),
+                  color=(0, 165, 255), font_size=1)
+
+
+def _disk_offsets(radius):
+    """(k, 2) integer x/y offsets covering a filled disk"""
+    span = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(span, span)
+    inside = dx * dx + dy * dy <= radius * radius
+    return np.stack([dx[inside], dy[inside]], axis=1)
+
+
+_DISK_CACHE = {}
+
+
+def splat_points(canvas, points, radius, color):
+    """
+    Draw filled dots at many points with one vectorized pixel write
+
+    Args:
+        canvas: BGR image drawn on in place
+        points: (n, 2) x, y pixel positions
+        radius: Dot radius in pixels
+        color: BGR color
+    """
+    offsets = _DISK_CACHE.get(radius)
+    if offsets is None:
+        offsets = _DISK_CACHE[radius] = _disk_offsets(radius)
+
+    # (points, disk pixels) coordinates; pixels off the canvas are dropped
+    # (landmarks of a partly visible hand or an overshooting prediction)
+    h, w = canvas.shape[:2]
+    centers = np.rint(points).astype(np.intp)
+    xs = centers[:, :1] + offsets[:, 0]
+    ys = centers[:, 1:] + offsets[:, 1]
+    valid = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+    canvas[ys[valid], xs[valid]] = color
+
+
+def draw_hands(canvas, xy, detail=SKELETON_FULL, joint_color=(0, 255, 0),
+               bone_color=(0, 200, 0)):
+    """
+    Draw every hand's skeleton in two OpenCV/NumPy calls
+
+    Args:
+        canvas: BGR image drawn on in place
+        xy: (hands, 21, 2) landmark pixel positions
+        detail: SKELETON_FULL, SKELETON_TIPS or SKELETON_OFF
+        joint_color: BGR color of the joint dots
+        bone_color: BGR color of the bones
+    """
+    if detail == SKELETON_OFF or len(xy) == 0:
+        return
+
+    if detail == SKELETON_TIPS:
+        splat_points(canvas, xy[:, FINGER_TIPS].reshape(-1, 2), 4, joint_color)
+        return
+
+    # All bones of all hands as two-point polylines in a single call
+    bones = np.rint(xy[:, HAND_CONNECTIONS]).astype(np.int32).reshape(-1, 2, 2)
+    cv2.polylines(canvas, bones, False, bone_color, 1)
+    splat_points(canvas, xy.reshape(-1, 2), 3, joint_color)
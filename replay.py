@@ -0,0 +1,214 @@
+"""
+Session Record and Replay
+Append-only log of everything that drives GameManager, and a replay that
+re-runs a logged session without a camera or MediaPipe
+
+Examples:
+    python game.py --record session.jsonl
+    python replay.py session.jsonl
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from game_manager import GameManager
+from levels import LevelPack
+from physics import BallPhysics
+
+LOG_VERSION = 4
+
+# Output events checked on replay ('layout' is implied by the seed)
+VERIFIED_EVENTS = ('select', 'release', 'match', 'blocked', 'level', 'timeout', 'stuck')
+
+
+class SessionRecorder:
+    """
+    Line-delimited JSON log of a GameManager session
+
+    The first line holds the log version (stamped here) and the seed and
+    settings needed to rebuild the GameManager; every later line is either an input (cursor update, frame
+    resize, physics tick, dropped hand, reset) or an output event with the
+    score after it. Records are handed to a writer thread that serializes and writes
+    them in batches, so logging costs the game loop one deque append.
+    """
+
+    def __init__(self, path, flush_interval=0.5):
+        """
+        Args:
+            path: Output file (overwritten)
+            flush_interval: Seconds between batched writes
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.file = open(path, 'w', buffering=1 << 16)
+        self.pending = deque()
+        self.wakeup = threading.Event()
+        self.is_running = True
+        self.thread = threading.Thread(target=self._write_loop, name="session-log", daemon=True)
+        self.thread.start()
+
+    def record(self, kind, **data):
+        """Queue one record (called from the game thread)"""
+        data['k'] = kind
+        if kind == 'start':
+            data['version'] = LOG_VERSION
+        self.pending.append(data)
+
+    def on_event(self, game_manager):
+        """Listener recording GameManager output events with the running score"""
+        def listener(event, data):
+            if event in VERIFIED_EVENTS:
+                self.record('event', e=event, d=data, score=game_manager.score)
+        return listener
+
+    def close(self):
+        """Write everything still queued and close the file"""
+        self.is_running = False
+        self.wakeup.set()
+        self.thread.join()
+        self.file.close()
+
+    def _write_loop(self):
+        while True:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            lines = []
+            while self.pending:
+                lines.append(json.dumps(self.pending.popleft(), separators=(',', ':')))
+            if lines:
+                self.file.write("\n".join(lines) + "\n")
+            if not self.is_running and not self.pending:
+                break
+
+
+def load_session(path):
+    """
+    Read a session log
+
+    Returns:
+        Tuple (header record, list of later records)
+    """
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records or records[0].get('k') != 'start':
+        raise ValueError(f"Not a session log: {path}")
+    if records[0].get('version') != LOG_VERSION:
+        raise ValueError(f"Unsupported session log version: {records[0].get('version')}")
+    return records[0], records[1:]
+
+
+def replay_session(header, records):
+    """
+    Re-drive a fresh GameManager from a session log
+
+    Args:
+        header: 'start' record from load_session
+        records: Remaining records
+
+    Returns:
+        Dictionary with the final game manager, frames replayed, replay
+        time, and the index and contents of the first output event that
+        differs from the log (None when the replay matches exactly)
+    """
+    game_manager = GameManager(frame_size=header['frame_size'],
+                               max_hands=header['max_hands'],
+                               selection_mode=header['selection_mode'],
+                               dwell_time=header['dwell_time'],
+                               seed=header['seed'],
+                               levels=LevelPack.from_dict(header['levels']),
+                               no_crossing=header.get('no_crossing', False),
+                               physics=(BallPhysics(**header['physics'])
+                                        if header.get('physics') else None))
+    actual = []
+    game_manager.add_listener(
+        lambda event, data: actual.append((event, data, game_manager.score))
+        if event in VERIFIED_EVENTS else None)
+
+    expected = []
+    frames = 0
+    start = time.perf_counter()
+
+    for record in records:
+        kind = record['k']
+        if kind == 'cursors':
+            points = [(np.array(position), hand_id) for hand_id, *position in record['p']]
+            gestures = ({hand_id: (pinch, pointing) for hand_id, pinch, pointing in record['g']}
+                        if 'g' in record else None)
+            game_manager.update_cursors(points, gestures, record['t'])
+            frames += 1
+        elif kind == 'resize':
+            game_manager.resize(tuple(record['shape']))
+        elif kind == 'tick':
+            game_manager.advance(record['t'])
+        elif kind == 'drop':
+            game_manager.drop_hand(record['hand'])
+        elif kind == 'reset':
+            game_manager.reset_game()
+        elif kind == 'attract':
+            game_manager.set_attract(record['active'])
+        elif kind == 'event':
+            expected.append((record['e'], record['d'], record['score']))
+
+    elapsed = time.perf_counter() - start
+
+    # JSON turns tuples into lists; compare in that form
+    actual = json.loads(json.dumps(actual))
+    expected = json.loads(json.dumps(expected))
+    mismatch = None
+    for i in range(max(len(actual), len(expected))):
+        got = actual[i] if i < len(actual) else None
+        want = expected[i] if i < len(expected) else None
+        if got != want:
+            mismatch = {'index': i, 'expected': want, 'actual': got}
+            break
+
+    return {
+        'game_manager': game_manager,
+        'frames': frames,
+        'events': len(actual),
+        'elapsed': elapsed,
+        'mismatch': mismatch,
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Replay a recorded game session")
+    parser.add_argument("log", help="session log written with game.py --record")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for replay; exits non-zero if the replay diverges"""
+    args = parse_args(argv)
+    header, records = load_session(args.log)
+    result = replay_session(header, records)
+    game_manager = result['game_manager']
+
+    duration = 0.0
+    timestamps = [r['t'] for r in records if r['k'] == 'cursors']
+    if len(timestamps) > 1:
+        duration = timestamps[-1] - timestamps[0]
+    speed = duration / result['elapsed'] if result['elapsed'] > 0 else 0.0
+
+    print(f"frames: {result['frames']}  events: {result['events']}  "
+          f"replayed in {result['elapsed'] * 1000:.1f} ms ({speed:.0f}x real time)")
+    print(f"final score: {game_manager.score}  level: {game_manager.level}")
+
+    mismatch = result['mismatch']
+    if mismatch is None:
+        print("replay matches the log")
+        return 0
+
+    print(f"replay diverges at event {mismatch['index']}: "
+          f"expected {mismatch['expected']}, got {mismatch['actual']}")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
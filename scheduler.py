@@ -0,0 +1,122 @@
+"""
+Inference Scheduler Module
+Decides per frame whether to run hand detection or reuse/predict results
+"""
+
+import math
+import time
+from collections import deque
+
+INFER = 'infer'  # Run MediaPipe on this frame
+TRACK = 'track'  # Advance tracked hands along their predicted paths
+REUSE = 'reuse'  # Keep the last results unchanged
+
+
+class InferenceScheduler:
+    """
+    Adaptive frame-skipping scheduler for hand detection
+
+    Keeps running averages of inference time and of the rest of the frame's
+    work. When inference on every frame would miss the target frame time,
+    inference is spread over several frames (the others use cheap tracker
+    predictions); as headroom returns the interval shrinks back to 1.
+    """
+
+    def __init__(self, target_fps=30.0, adaptive=True, interval=1, max_interval=6,
+                 smoothing=0.1):
+        """
+        Args:
+            target_fps: Display frame rate to protect
+            adaptive: Adjust the inference interval to the measured load;
+                      when False, infer every `interval` frames
+            interval: Fixed (or starting) number of frames per inference
+            max_interval: Longest run of frames without inference
+            smoothing: Weight of each new sample in the running averages
+        """
+        self.target_fps = target_fps
+        self.adaptive = adaptive
+        self.interval = max(1, interval)
+        self.max_interval = max(self.interval, max_interval)
+        self.smoothing = smoothing
+
+        self.inference_time = None  # Running average, seconds
+        self.frame_work_time = None  # Running average of non-inference work, seconds
+        self.frames_since_inference = math.inf
+        self.inference_times = deque()  # Timestamps of inferences in the last second
+
+    def decide(self, has_tracks=True):
+        """
+        Choose what to do for the next frame
+
+        Args:
+            has_tracks: Whether any hand is currently tracked
+
+        Returns:
+            INFER, TRACK or REUSE
+        """
+        if self.frames_since_inference >= self.interval:
+            return INFER
+        return TRACK if has_tracks else REUSE
+
+    def record_inference(self, duration=None, timestamp=None):
+        """
+        Note that inference ran
+
+        Args:
+            duration: Inference time in seconds, if measured
+            timestamp: When it ran (defaults to now)
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        self.frames_since_inference = 0
+        self.inference_times.append(timestamp)
+        self._prune(timestamp)
+        if duration is not None:
+            self.inference_time = self._average(self.inference_time, duration)
+
+    def record_frame(self, work_time, inference_duration=0.0):
+        """
+        Note a finished frame and update the inference interval
+
+        Args:
+            work_time: Seconds of processing this frame took (excluding
+                       waiting for the camera)
+            inference_duration: Part of work_time spent on inference
+        """
+        self.frames_since_inference += 1
+        self.frame_work_time = self._average(self.frame_work_time,
+                                             max(work_time - inference_duration, 0.0))
+        if self.adaptive:
+            self.interval = self._target_interval()
+
+    def _target_interval(self):
+        """Smallest interval that keeps the average frame within budget"""
+        if self.inference_time is None or self.frame_work_time is None:
+            return 1
+
+        budget = 1.0 / self.target_fps
+        spare = budget - self.frame_work_time
+        if spare <= 0:
+            return self.max_interval
+
+        # Over N frames: N * work + inference <= N * budget
+        needed = math.ceil(self.inference_time / spare)
+        return int(min(max(needed, 1), self.max_interval))
+
+    def _average(self, current, sample):
+        """Exponential moving average update"""
+        if current is None:
+            return sample
+        return current + self.smoothing * (sample - current)
+
+    @property
+    def inference_rate(self):
+        """Inferences per second over the last second"""
+        self._prune(time.perf_counter())
+        return float(len(self.inference_times))
+
+    def _prune(self, now):
+        """Forget inferences older than the one-second rate window"""
+        while self.inference_times and now - self.inference_times[0] > 1.0:
+            self.inference_times.popleft()
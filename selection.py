@@ -0,0 +1,145 @@
+"""
+Selection Module
+Per-hand state machine deciding when hovering a ball counts as selecting it
+"""
+
+# Confirmation modes
+INSTANT = 'instant'  # Select as soon as the cursor reaches a ball
+DWELL = 'dwell'  # Hold the cursor on a ball for dwell_time
+PINCH = 'pinch'  # Pinch thumb and index together while over a ball
+POINT = 'point'  # Only a pointing hand (index out, middle curled) selects
+
+SELECTION_MODES = (INSTANT, DWELL, PINCH, POINT)
+
+# States
+IDLE = 'idle'  # Cursor is not over a selectable ball
+HOVER = 'hover'  # Over a ball, waiting for confirmation
+CONFIRMED = 'confirmed'  # Selection fired; latched until the cursor leaves
+
+
+class SelectionFSM:
+    """
+    Hover -> confirm state machine for one hand
+
+    The hovered ball is kept while the cursor stays within a larger exit
+    radius (hysteresis, applied by GameManager), and gesture signals only
+    change after they have held for debounce_frames updates, so jitter at a
+    boundary cannot fire or cancel a selection. Each update is a handful of
+    comparisons regardless of board size.
+    """
+
+    __slots__ = ('mode', 'dwell_time', 'pinch_on', 'pinch_off', 'debounce_frames',
+                 'state', 'target', 'since', 'pinched', 'pointing',
+                 'pinch_count', 'point_count', 'pinch_started')
+
+    def __init__(self, mode=DWELL, dwell_time=0.3, pinch_on=0.3, pinch_off=0.45,
+                 debounce_frames=2):
+        """
+        Args:
+            mode: One of SELECTION_MODES
+            dwell_time: Seconds the cursor must rest on a ball in DWELL mode
+            pinch_on: Thumb-index distance (relative to palm size) below
+                      which an open hand counts as pinching
+            pinch_off: Distance above which a pinch counts as released
+            debounce_frames: Consecutive updates a gesture change must hold
+        """
+        if mode not in SELECTION_MODES:
+            raise ValueError(f"Unknown selection mode: {mode}")
+
+        self.mode = mode
+        self.dwell_time = dwell_time
+        self.pinch_on = pinch_on
+        self.pinch_off = pinch_off
+        self.debounce_frames = debounce_frames
+
+        self.state = IDLE
+        self.target = None  # Ball id being hovered
+        self.since = 0.0  # When the current target was entered
+        self.pinched = False
+        self.pointing = False
+        self.pinch_count = 0
+        self.point_count = 0
+        self.pinch_started = False  # Pinch closed during this update
+
+    def update(self, target, timestamp, pinch_ratio=None, pointing=None):
+        """
+        Advance one frame
+
+        Args:
+            target: Id of the ball under the cursor, or None
+            timestamp: Time of the frame in seconds
+            pinch_ratio: Thumb-index distance over palm size, if known
+            pointing: Whether the hand is pointing, if known
+
+        Returns:
+            True if the hovered ball should be selected this frame
+        """
+        self._update_gestures(pinch_ratio, pointing)
+
+        if target != self.target:
+            self.target = target
+            self.since = timestamp
+            self.state = HOVER if target is not None else IDLE
+
+        if self.state != HOVER:
+            return False
+
+        if self.mode == INSTANT:
+            confirmed = True
+        elif self.mode == DWELL:
+            confirmed = timestamp - self.since >= self.dwell_time
+        elif self.mode == PINCH:
+            confirmed = self.pinch_started
+        else:
+            confirmed = self.pointing
+
+        if confirmed:
+            self.state = CONFIRMED
+        return confirmed
+
+    @property
+    def selects_on_contact(self):
+        """Whether passing over a ball can select it (no dwell or pinch needed)"""
+        return self.mode in (INSTANT, POINT)
+
+    def reset(self):
+        """Forget the hovered ball (e.g. after the board is regenerated)"""
+        self.state = IDLE
+        self.target = None
+
+    def cancel(self, timestamp):
+        """Undo a confirmation that could not be applied, restarting the hover"""
+        if self.state == CONFIRMED:
+            self.state = HOVER
+            self.since = timestamp
+
+    def progress(self, timestamp):
+        """Fraction of the dwell completed on the hovered ball (0 outside DWELL)"""
+        if self.mode != DWELL or self.state != HOVER or self.dwell_time <= 0:
+            return 0.0
+        return min((timestamp - self.since) / self.dwell_time, 1.0)
+
+    def _update_gestures(self, pinch_ratio, pointing):
+        """Debounce the gesture signals"""
+        self.pinch_started = False
+
+        if pinch_ratio is not None:
+            # Separate close/open thresholds so a ratio near one cannot flicker
+            threshold = self.pinch_off if self.pinched else self.pinch_on
+            if (pinch_ratio < threshold) != self.pinched:
+                self.pinch_count += 1
+                if self.pinch_count >= self.debounce_frames:
+                    self.pinched = not self.pinched
+                    self.pinch_started = self.pinched
+                    self.pinch_count = 0
+            else:
+                self.pinch_count = 0
+
+        if pointing is not None:
+            if bool(pointing) != self.pointing:
+                self.point_count += 1
+                if self.point_count >= self.debounce_frames:
+                    self.pointing = not self.pointing
+                    self.point_count = 0
+            else:
+                self.point_count = 0
@@ -0,0 +1,363 @@
+"""
+Headless Game Server
+Runs hand detection and game logic without a window and streams
+landmarks plus game-state deltas to any number of display clients
+
+Examples:
+    python server.py --listen 127.0.0.1:5055
+    python server.py --listen unix:/tmp/gesture-game.sock --source clip.mp4
+    python client.py --connect 127.0.0.1:5055
+"""
+
+import argparse
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+from frame_source import open_frame_source, RecordedLandmarkDetector
+from game import GestureGame
+from protocol import EVENTS, encode_frame, encode_snapshot, frame_message
+
+
+def parse_address(address):
+    """
+    Parse a "host:port" or "unix:/path" address
+
+    Returns:
+        Tuple (socket family, address for bind/connect)
+    """
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class _Client:
+    """Per-connection outbound state"""
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.queue = deque()  # Framed messages waiting to be sent
+        self.pending = None  # memoryview of the message being sent
+        self.needs_snapshot = True
+        self.dropped = 0
+        self.writing = False
+
+
+class StateServer:
+    """
+    Non-blocking fan-out of encoded game state to socket clients
+
+    publish() only appends to per-client queues and never waits on the
+    network; a selector thread does the sends. A client whose queue fills up
+    (a slow consumer) has its backlog discarded and is sent a fresh snapshot
+    instead, so it catches up without holding back the game or the other
+    clients.
+    """
+
+    def __init__(self, address, max_queue=8):
+        """
+        Args:
+            address: "host:port" or "unix:/path" to listen on
+            max_queue: Messages buffered per client before it is resynced
+        """
+        self.family, self.address = parse_address(address)
+        self.max_queue = max_queue
+
+        self.clients = {}  # socket -> _Client
+        self.lock = threading.Lock()
+        self.selector = selectors.DefaultSelector()
+        self.listener = None
+        self.wakeup_recv, self.wakeup_send = socket.socketpair()
+        self.is_running = False
+        self.thread = None
+
+    def start(self):
+        """Bind the listening socket and start the network thread"""
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+
+        self.listener = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(self.address)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        if self.family == socket.AF_INET:
+            self.address = self.listener.getsockname()
+
+        self.wakeup_recv.setblocking(False)
+        self.wakeup_send.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ, 'accept')
+        self.selector.register(self.wakeup_recv, selectors.EVENT_READ, 'wakeup')
+
+        self.is_running = True
+        self.thread = threading.Thread(target=self._serve, name="state-server", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Close every connection and stop the network thread"""
+        self.is_running = False
+        self._wake()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+        with self.lock:
+            for client in list(self.clients.values()):
+                self._close(client)
+        self.selector.close()
+        self.listener.close()
+        self.wakeup_recv.close()
+        self.wakeup_send.close()
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    @property
+    def num_clients(self):
+        """Number of connected clients"""
+        return len(self.clients)
+
+    def publish(self, message, snapshot):
+        """
+        Queue one frame's message for every client
+
+        Args:
+            message: Encoded frame message (protocol.encode_frame)
+            snapshot: Callable returning an encoded snapshot; only called
+                      if a new or lagging client needs one
+        """
+        framed = frame_message(message)
+        snapshot_message = None
+
+        with self.lock:
+            for client in self.clients.values():
+                if client.needs_snapshot:
+                    if snapshot_message is None:
+                        snapshot_message = frame_message(snapshot())
+                    client.queue.append(snapshot_message)
+                    client.needs_snapshot = False
+                elif len(client.queue) >= self.max_queue:
+                    # Slow consumer: drop its backlog and resync next frame
+                    client.dropped += len(client.queue)
+                    client.queue.clear()
+                    client.needs_snapshot = True
+                else:
+                    client.queue.append(framed)
+
+        if self.clients:
+            self._wake()
+
+    def _wake(self):
+        """Interrupt the selector so it picks up new outbound data"""
+        try:
+            self.wakeup_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # A wakeup is already pending
+
+    def _serve(self):
+        """Network thread: accept clients and flush their queues"""
+        while self.is_running:
+            for key, events in self.selector.select(timeout=0.5):
+                if key.data == 'accept':
+                    self._accept()
+                elif key.data == 'wakeup':
+                    self._drain_wakeups()
+                else:
+                    client = key.data
+                    if events & selectors.EVENT_READ:
+                        self._read(client)
+                    if events & selectors.EVENT_WRITE and client.sock in self.clients:
+                        self._flush(client)
+
+            # Ask for write readiness on clients that have something queued
+            with self.lock:
+                for client in list(self.clients.values()):
+                    wants_write = bool(client.pending is not None or client.queue)
+                    if wants_write != client.writing:
+                        events = selectors.EVENT_READ
+                        if wants_write:
+                            events |= selectors.EVENT_WRITE
+                        self.selector.modify(client.sock, events, client)
+                        client.writing = wants_write
+
+    def _accept(self):
+        try:
+            sock, address = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        if self.family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        client = _Client(sock, address)
+        with self.lock:
+            self.clients[sock] = client
+        self.selector.register(sock, selectors.EVENT_READ, client)
+
+    def _drain_wakeups(self):
+        try:
+            while self.wakeup_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read(self, client):
+        """Discard anything a client sends; an empty read means it left"""
+        try:
+            data = client.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            with self.lock:
+                self._close(client)
+
+    def _flush(self, client):
+        """Send as much queued data as the socket accepts without blocking"""
+        while True:
+            if client.pending is None:
+                with self.lock:
+                    if not client.queue:
+                        return
+                    client.pending = memoryview(client.queue.popleft())
+            try:
+                sent = client.sock.send(client.pending)
+            except BlockingIOError:
+                return
+            except OSError:
+                with self.lock:
+                    self._close(client)
+                return
+
+            client.pending = client.pending[sent:]
+            if not client.pending:
+                client.pending = None
+
+    def _close(self, client):
+        """Forget a client (caller holds the lock)"""
+        if self.clients.pop(client.sock, None) is None:
+            return
+        try:
+            self.selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+
+def run_server(game, server, max_frames=None, frame_interval=0.0):
+    """
+    Headless frame loop publishing every frame to the server
+
+    Args:
+        game: GestureGame whose capture, detector and game manager are used
+              (nothing is drawn or shown)
+        server: Started StateServer
+        max_frames: Stop after this many frames (None runs until the source ends)
+        frame_interval: Minimum seconds per frame, to pace file sources
+
+    Returns:
+        Number of frames processed
+    """
+    # Only events the protocol can carry; anything newer stays server-side
+    events = []
+    game.game_manager.add_listener(
+        lambda event, data: events.append((event, data)) if event in EVENTS else None)
+    frame_id = 0
+
+    def snapshot():
+        return encode_snapshot(frame_id, capture_time, game.game_manager)
+
+    while game.is_running and (max_frames is None or frame_id < max_frames):
+        game.profiler.begin_frame()
+        with game.profiler.stage('cap.read'):
+            success, frame = game.cap.read(game.capture_buffer)
+        capture_time = time.perf_counter()
+        if not success:
+            break
+        game.capture_buffer = frame
+
+        # Nothing is displayed, so the frame is never flipped
+        hand_landmarks = game.step(frame, capture_time)
+        game.game_manager.update(frame.shape)
+
+        with game.profiler.stage('publish'):
+            message = encode_frame(frame_id, capture_time, game.game_manager,
+                                   hand_landmarks, game.hand_track_ids, events)
+            events.clear()
+            server.publish(message, snapshot)
+
+        work_time = time.perf_counter() - capture_time
+        game.scheduler.record_frame(work_time, game.inference_duration)
+        game.profiler.end_frame()
+        frame_id += 1
+
+        if work_time < frame_interval:
+            time.sleep(frame_interval - work_time)
+    return frame_id
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Headless gesture game server")
+    parser.add_argument("--listen", default="127.0.0.1:5055",
+                        help="'host:port' or 'unix:/path/to/socket' to serve on")
+    parser.add_argument("--source", default="0",
+                        help="camera index, video file, image directory or 'synthetic'")
+    parser.add_argument("--landmarks",
+                        help="replay a landmark recording instead of running MediaPipe "
+                             "('synthetic' generates one)")
+    parser.add_argument("--inference-scale", type=float, default=1.0,
+                        help="downsample frames by this factor before hand detection")
+    parser.add_argument("--roi", action="store_true",
+                        help="run detection on a crop around the previously tracked hands")
+    parser.add_argument("--hands", type=int, default=2,
+                        help="number of hands that can play at once")
+    parser.add_argument("--fps", type=float,
+                        help="pace file and synthetic sources to this frame rate")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    parser.add_argument("--width", type=int, default=1280, help="synthetic frame width")
+    parser.add_argument("--height", type=int, default=720, help="synthetic frame height")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the headless server"""
+    args = parse_args(argv)
+    frame_source = open_frame_source(args.source, loop=True,
+                                     width=args.width, height=args.height)
+    if args.landmarks == 'synthetic':
+        detector = RecordedLandmarkDetector.synthetic(args.width, args.height)
+    elif args.landmarks:
+        detector = RecordedLandmarkDetector.load(args.landmarks)
+    else:
+        from gesture_detector import GestureDetector
+        detector = GestureDetector(inference_scale=args.inference_scale,
+                                   roi_tracking=args.roi,
+                                   max_num_hands=args.hands)
+
+    game = GestureGame(frame_source=frame_source, gesture_detector=detector,
+                       max_hands=args.hands)
+    server = StateServer(args.listen)
+    server.start()
+    print(f"Serving game state on {args.listen}")
+
+    try:
+        run_server(game, server, max_frames=args.frames,
+                   frame_interval=1.0 / args.fps if args.fps else 0.0)
+    except KeyboardInterrupt:
+        print("\nServer interrupted by user")
+    finally:
+        server.stop()
+        frame_source.release()
+        detector.release()
+        print("Server closed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Spatial Index Module
+Uniform grids for fast radius queries over ball positions and crossing
+tests over line segments
+"""
+
+import math
+
+import numpy as np
+
+from utils import line_intersection
+
+
+class UniformGrid:
+    """
+    Uniform grid over a fixed set of points
+
+    Points are bucketed into square cells once when the grid is built, so
+    a radius query only inspects the few cells the query circle overlaps
+    and its cost stays flat as the number of points grows.
+    """
+
+    def __init__(self, positions, cell_size):
+        """
+        Args:
+            positions: Array of shape (n, 2) with point coordinates
+            cell_size: Side length of each grid cell in pixels
+        """
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        self.cells = {}
+
+        if len(self.positions) == 0:
+            return
+
+        # Sort points by cell so each bucket is one contiguous index slice
+        keys = np.floor(self.positions / self.cell_size).astype(np.int64)
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0) != 0, axis=1)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(order)]))
+        for start, end in zip(starts, ends):
+            cx, cy = sorted_keys[start]
+            self.cells[(int(cx), int(cy))] = order[start:end]
+
+    def candidates(self, x_min, y_min, x_max, y_max):
+        """
+        Indices of points in cells overlapping an axis-aligned box
+
+        Returns:
+            Integer array of candidate indices (may include points outside
+            the box itself)
+        """
+        cx0 = int(np.floor(x_min / self.cell_size))
+        cx1 = int(np.floor(x_max / self.cell_size))
+        cy0 = int(np.floor(y_min / self.cell_size))
+        cy1 = int(np.floor(y_max / self.cell_size))
+
+        buckets = [
+            self.cells[(cx, cy)]
+            for cx in range(cx0, cx1 + 1)
+            for cy in range(cy0, cy1 + 1)
+            if (cx, cy) in self.cells
+        ]
+        if not buckets:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(buckets)
+
+    def query_radius(self, point, radius):
+        """
+        Find points within a radius of a query point
+
+        Args:
+            point: Query point (x, y)
+            radius: Search radius in pixels
+
+        Returns:
+            Tuple (indices, distances) for points strictly within radius
+        """
+        x, y = float(point[0]), float(point[1])
+        indices = self.candidates(x - radius, y - radius, x + radius, y + radius)
+        if len(indices) == 0:
+            return indices, np.empty(0)
+
+        offsets = self.positions[indices] - (x, y)
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        inside = distances < radius
+        return indices[inside], distances[inside]
+
+    def nearest_within(self, point, radius, exclude=None):
+        """
+        Find the nearest point within a radius
+
+        Args:
+            point: Query point (x, y)
+            radius: Search radius in pixels
+            exclude: Optional boolean array of length n marking points to skip
+
+        Returns:
+            Index of the nearest point, or None if there is none in range
+        """
+        indices, distances = self.query_radius(point, radius)
+        if exclude is not None and len(indices):
+            keep = ~exclude[indices]
+            indices = indices[keep]
+            distances = distances[keep]
+
+        if len(indices) == 0:
+            return None
+        return int(indices[np.argmin(distances)])
+
+
+class SegmentGrid:
+    """
+    Uniform grid of line segments for crossing tests
+
+    Each segment is registered in every cell it passes through, so testing
+    a new segment only checks the segments sharing one of its cells. The
+    cost depends on the segment's length in cells, not on how many
+    segments the grid holds.
+    """
+
+    def __init__(self, cell_size):
+        """
+        Args:
+            cell_size: Side length of each grid cell in pixels
+        """
+        self.cell_size = float(cell_size)
+        self.cells = {}  # (cx, cy) -> list of segment indices
+        self.segments = []
+
+    def __len__(self):
+        return len(self.segments)
+
+    def cells_on(self, p1, p2):
+        """Cells a segment passes through, in order (grid traversal)"""
+        x1, y1 = p1[0] / self.cell_size, p1[1] / self.cell_size
+        x2, y2 = p2[0] / self.cell_size, p2[1] / self.cell_size
+        cx, cy = math.floor(x1), math.floor(y1)
+        end_x, end_y = math.floor(x2), math.floor(y2)
+        dx, dy = x2 - x1, y2 - y1
+
+        # Distance along the segment (as a fraction) to the next x / y cell
+        # boundary, and between successive boundaries
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        next_x = ((cx + (dx > 0)) - x1) / dx if dx else math.inf
+        next_y = ((cy + (dy > 0)) - y1) / dy if dy else math.inf
+        delta_x = abs(1 / dx) if dx else math.inf
+        delta_y = abs(1 / dy) if dy else math.inf
+
+        cells = [(cx, cy)]
+        for _ in range(abs(end_x - cx) + abs(end_y - cy)):
+            if next_x < next_y:
+                cx += step_x
+                next_x += delta_x
+            else:
+                cy += step_y
+                next_y += delta_y
+            cells.append((cx, cy))
+        return cells
+
+    def insert(self, p1, p2):
+        """
+        Add a segment
+
+        Returns:
+            Index of the new segment
+        """
+        index = len(self.segments)
+        self.segments.append(((float(p1[0]), float(p1[1])), (float(p2[0]), float(p2[1]))))
+        for cell in self.cells_on(p1, p2):
+            self.cells.setdefault(cell, []).append(index)
+        return index
+
+    def crosses(self, p1, p2):
+        """
+        Check whether a segment crosses (or touches) any stored segment
+
+        Args:
+            p1, p2: End points of the segment to test
+
+        Returns:
+            bool: True if it intersects a stored segment
+        """
+        if not self.segments:
+            return False
+
+        checked = set()
+        for cell in self.cells_on(p1, p2):
+            for index in self.cells.get(cell, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                q1, q2 = self.segments[index]
+                if line_intersection(p1, p2, q1, q2):
+                    return True
+        return False
@@ -0,0 +1,153 @@
+"""
+Startup Benchmark
+Breaks cold start of the game down into import, model init, camera open
+and first-frame latency, each run in a fresh interpreter
+
+Examples:
+    python startup.py --source 0
+    python startup.py --source clip.mp4 --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+PHASES = ('import', 'camera_open', 'first_frame', 'first_display',
+          'mediapipe_import', 'model_init', 'model_ready', 'first_detection', 'hands_ready')
+
+
+def measure_startup(source, width=1280, height=720):
+    """
+    Time one cold start, in the same order GestureGame.run() uses
+
+    The model loads on a background thread while the camera opens, so
+    first_display (the first camera frame drawn, with a loading overlay)
+    does not wait for mediapipe.
+
+    Returns:
+        Dictionary of phase name -> milliseconds. 'import', 'camera_open',
+        'first_frame', 'mediapipe_import', 'model_init' and
+        'first_detection' are durations; 'first_display', 'model_ready' and
+        'hands_ready' are times since the start of this function.
+    """
+    start = time.perf_counter()
+    results = {}
+
+    t = time.perf_counter()
+    from frame_source import open_frame_source
+    from game import GestureGame
+    from gesture_detector import GestureDetector
+    results['import'] = time.perf_counter() - t
+
+    detector = GestureDetector()
+    game = GestureGame(gesture_detector=detector)
+    detector.load_async()
+
+    t = time.perf_counter()
+    game.cap = open_frame_source(source, width=width, height=height)
+    results['camera_open'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    success, frame = game.cap.read()
+    results['first_frame'] = time.perf_counter() - t
+    if not success:
+        raise IOError(f"Could not read a frame from {source}")
+
+    game.process_frame(frame)
+    results['first_display'] = time.perf_counter() - start
+
+    detector.load_thread.join()
+    if detector.load_error is not None:
+        raise detector.load_error
+    results['model_ready'] = time.perf_counter() - start
+    results['mediapipe_import'] = detector.load_times['import']
+    results['model_init'] = detector.load_times['model']
+
+    success, frame = game.cap.read()
+    t = time.perf_counter()
+    detector.detect_hands(frame)
+    results['first_detection'] = time.perf_counter() - t
+    results['hands_ready'] = time.perf_counter() - start
+
+    game.cap.release()
+    detector.release()
+    return {phase: 1000.0 * seconds for phase, seconds in results.items()}
+
+
+def run_startup_benchmark(source, runs, width=1280, height=720):
+    """
+    Measure several cold starts, each in a new interpreter
+
+    Returns:
+        Dictionary with the per-run results, the median of each phase and
+        the median wall time of the whole child process
+    """
+    samples = []
+    wall_times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        child = subprocess.run(
+            [sys.executable, __file__, '--child', '--source', source,
+             '--width', str(width), '--height', str(height)],
+            capture_output=True, text=True)
+        wall_times.append(1000.0 * (time.perf_counter() - t))
+        if child.returncode != 0:
+            error = child.stderr.strip().splitlines()
+            raise RuntimeError(f"Startup run failed: {error[-1] if error else child.returncode}")
+        samples.append(json.loads(child.stdout.strip().splitlines()[-1]))
+
+    from utils import percentile
+    median = {phase: percentile([s[phase] for s in samples], 50) for phase in PHASES}
+    return {
+        'runs': samples,
+        'median_ms': median,
+        'process_wall_ms': percentile(wall_times, 50),
+    }
+
+
+def print_report(results):
+    """Print the median of each phase"""
+    median = results['median_ms']
+    print(f"{'phase':<18}{'median ms':>10}")
+    for phase in PHASES:
+        print(f"{phase:<18}{median[phase]:>10.1f}")
+    print(f"{'process wall':<18}{results['process_wall_ms']:>10.1f}")
+
+    # What the player waited before this change: everything in series
+    sequential = (median['import'] + median['mediapipe_import'] + median['model_init']
+                  + median['camera_open'] + median['first_frame'])
+    print(f"first frame on screen after {median['first_display']:.0f} ms "
+          f"(loading everything first would take {sequential:.0f} ms)")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--source", default="synthetic",
+                        help="camera index, video file, image directory or 'synthetic'")
+    parser.add_argument("--runs", type=int, default=3, help="number of cold starts")
+    parser.add_argument("--width", type=int, default=1280, help="synthetic frame width")
+    parser.add_argument("--height", type=int, default=720, help="synthetic frame height")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Entry point for the startup benchmark"""
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(measure_startup(args.source, args.width, args.height)))
+        return
+
+    results = run_startup_benchmark(args.source, args.runs, args.width, args.height)
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Hand-made boards for GameManager tests"""
+
+import numpy as np
+
+from balls import BallStore
+from spatial import UniformGrid, SegmentGrid
+
+PALETTE = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+
+def set_board(game_manager, positions, color_ids, radius=25):
+    """Replace the current board with balls at fixed positions"""
+    game_manager.balls = BallStore(positions, np.full(len(positions), radius), color_ids, PALETTE)
+    game_manager.ball_index = UniformGrid(game_manager.ball_positions,
+                                          game_manager.selection_distance * 2)
+    game_manager.pair_lines = SegmentGrid(game_manager.pair_line_cell)
+    game_manager.matched_pairs = []
+    game_manager.ball_owner = {}
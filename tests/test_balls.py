@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from balls import BallStore
+
+
+def test_from_colors_builds_a_shared_palette():
+    red, blue = (0, 0, 255), (255, 0, 0)
+    store = BallStore.from_colors([(10, 10), (20, 20), (30, 30)], 25, [red, blue, red])
+
+    assert store.palette == [red, blue]
+    assert store.color_ids.tolist() == [0, 1, 0]
+    assert store.colors() == [red, blue, red]
+    assert store.radii.tolist() == [25, 25, 25]
+
+
+def test_views_read_and_write_the_arrays():
+    store = BallStore([(10, 10), (20, 20)], [25, 30], [0, 0], [(1, 2, 3)])
+    ball = store[1]
+    ball.pos = (50, 60)
+    ball['selected'] = True
+    store[0].matched = True
+
+    assert store.positions[1].tolist() == [50, 60]
+    assert store.selected.tolist() == [False, True]
+    assert store.unmatched().tolist() == [1]
+    assert ball['radius'] == 30 and ball.color == (1, 2, 3)
+    assert store[1] == ball and len({store[1], ball}) == 1
+
+
+def test_views_reject_unknown_balls_and_fields():
+    store = BallStore([(10, 10)], [25], [0], [(1, 2, 3)])
+
+    with pytest.raises(IndexError):
+        store[1]
+    assert store.get(1) is None and store.get(None) is None
+    with pytest.raises(KeyError):
+        store[0]['size']
+    with pytest.raises(KeyError):
+        store[0]['radius'] = 10
+
+
+def test_empty_store():
+    store = BallStore()
+
+    assert len(store) == 0
+    assert store.positions.shape == (0, 2)
+    assert list(store) == []
+    assert store.unmatched().size == 0
+    assert np.array_equal(store.velocities, np.zeros((0, 2)))
@@ -0,0 +1,27 @@
+import json
+import math
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_headless_benchmark_writes_a_finite_report(tmp_path):
+    output = tmp_path / 'results.json'
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'benchmark.py'), '--source', 'synthetic',
+         '--landmarks', 'synthetic', '--width', '320', '--height', '240',
+         '--frames', '30', '--warmup', '2', '--moving-balls', '--output', str(output)],
+        cwd=str(tmp_path), capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+
+    results = json.loads(output.read_text())
+    assert results['frames'] == 30
+    assert math.isfinite(results['fps']) and results['fps'] > 0
+    assert set(results['stages']) == {'detect', 'update', 'draw'}
+    for stats in [results['frame'], *results['stages'].values()]:
+        latencies = [stats['p50_ms'], stats['p95_ms'], stats['p99_ms']]
+        assert all(math.isfinite(value) and value >= 0 for value in latencies)
+        assert latencies == sorted(latencies)
+    assert results['config']['landmarks'] == 'synthetic'
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from buffers import BufferPool, FrameBuffers
+from frame_source import SyntheticSource
+from landmarks import HandLandmarks, NUM_LANDMARKS
+
+
+def test_frame_buffers_reallocate_only_on_shape_change():
+    buffers = FrameBuffers()
+    first = buffers.get('rgb', (4, 6, 3))
+
+    assert buffers.get('rgb', (4, 6, 3)) is first
+    assert buffers.get('rgb', (8, 6, 3)) is not first
+    assert buffers.get('rgb', (8, 6, 3), np.float32).dtype == np.float32
+
+
+def test_buffer_pool_recycles_and_bounds_buffers():
+    pool = BufferPool(2)
+    assert pool.acquire() == (True, None)
+    acquired, _ = pool.acquire()
+    assert acquired
+    assert pool.acquire(timeout=0.01) == (False, None)
+
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    pool.release(frame)
+    acquired, buffer = pool.acquire(timeout=0.01)
+    assert acquired and buffer is frame
+
+
+def test_sources_read_into_the_given_buffer():
+    source = SyntheticSource(64, 48)
+    _, buffer = source.read()
+    success, frame = source.read(buffer)
+
+    assert success and frame is buffer
+
+
+def test_mirrored_landmarks_match_the_flipped_frame():
+    # One hand at normalized x=0.25 inside the right half of a 200 px frame
+    landmark = SimpleNamespace(x=0.25, y=0.5, z=0.1, visibility=1.0)
+    hand = SimpleNamespace(landmark=[landmark] * NUM_LANDMARKS)
+    region = (100, 0, 200, 100)
+
+    plain = HandLandmarks.from_mediapipe([hand], region)
+    mirrored = HandLandmarks.from_mediapipe([hand], region, mirror_width=200)
+
+    assert plain.points[0, 0, 0] == 125
+    assert mirrored.points[0, 0, 0] == 200 - 125
+    np.testing.assert_allclose(mirrored.points[0, 0, 1:], plain.points[0, 0, 1:])
@@ -0,0 +1,54 @@
+import numpy as np
+
+from filtering import HandTracker, OneEuroFilter
+
+
+def test_one_euro_filter_smooths_jitter_on_a_still_hand():
+    rng = np.random.default_rng(2)
+    one_euro = OneEuroFilter()
+    measured = 300 + rng.normal(0, 4, size=(120, 2))
+    filtered = np.array([one_euro.filter(point, i / 30).copy()
+                         for i, point in enumerate(measured)])
+
+    assert filtered[30:].std(axis=0).max() < measured[30:].std(axis=0).min() / 2
+
+
+def test_one_euro_filter_predicts_along_its_velocity():
+    one_euro = OneEuroFilter(beta=1.0)
+    for i in range(60):
+        position = one_euro.filter((100 + 300 * i / 30, 200), i / 30)
+    ahead = one_euro.predict(59 / 30 + 0.1)
+
+    assert ahead[0] > position[0] + 20
+    assert abs(ahead[1] - 200) < 1
+    assert OneEuroFilter().predict(1.0) is None
+
+
+def test_tracker_keeps_ids_when_hands_swap_order():
+    tracker = HandTracker()
+    ids, _ = tracker.update([(100, 100), (600, 100)], [(100, 80), (600, 80)], 0.0)
+    swapped, lost = tracker.update([(610, 105), (105, 100)], [(610, 85), (105, 80)], 1 / 30)
+
+    assert swapped == ids[::-1]
+    assert lost == []
+
+
+def test_tracker_drops_hands_after_the_timeout():
+    tracker = HandTracker(timeout=0.5)
+    (first,), _ = tracker.update([(100, 100)], [(100, 80)], 0.0)
+    _, lost = tracker.update(np.empty((0, 2)), np.empty((0, 2)), 1.0)
+    (second,), _ = tracker.update([(100, 100)], [(100, 80)], 1.1)
+
+    assert lost == [first]
+    assert second != first
+
+
+def test_tracker_limits_extrapolation():
+    tracker = HandTracker(max_prediction=0.1, beta=1.0)
+    for i in range(30):
+        x = 100 + 10 * i
+        tracker.update([(x, 300)], [(x, 280)], i / 30)
+    (near, _), = tracker.cursors(29 / 30 + 0.1)
+    (far, _), = tracker.cursors(29 / 30 + 5.0)
+
+    np.testing.assert_allclose(far, near)
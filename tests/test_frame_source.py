@@ -0,0 +1,69 @@
+import cv2
+import numpy as np
+
+from frame_source import (ImageDirectorySource, LandmarkRecorder, RecordedLandmarkDetector,
+                          SyntheticSource, open_frame_source)
+from landmarks import HandLandmarks
+
+
+def test_synthetic_source_fills_the_callers_buffer_and_ends():
+    source = SyntheticSource(160, 120, num_frames=3)
+    success, frame = source.read()
+    assert success and frame.shape == (120, 160, 3)
+
+    buffer = np.zeros_like(frame)
+    success, second = source.read(buffer)
+    assert success and second is buffer
+    assert (second != frame).any()  # The square moved
+
+    assert source.read(buffer)[0]
+    assert source.read(buffer) == (False, None)
+
+
+def test_image_directory_is_read_in_name_order(tmp_path):
+    for value, name in ((30, 'b.png'), (10, '0.png'), (20, 'a.jpg')):
+        cv2.imwrite(str(tmp_path / name), np.full((8, 12, 3), value, dtype=np.uint8))
+    (tmp_path / 'notes.txt').write_text("not an image")
+
+    source = open_frame_source(str(tmp_path), loop=True)
+    assert isinstance(source, ImageDirectorySource)
+    values = [int(source.read()[1].mean()) for _ in range(4)]
+    assert values == [10, 20, 30, 10]
+
+    source = ImageDirectorySource(str(tmp_path), preload=False)
+    for _ in range(3):
+        assert source.read()[0]
+    assert source.read() == (False, None)
+
+
+def test_synthetic_recording_sweeps_inside_the_frame():
+    detector = RecordedLandmarkDetector.synthetic(320, 240, num_frames=50)
+    pointers = []
+    for _ in range(50):
+        hand_landmarks, handedness = detector.detect_hands(None)
+        assert len(hand_landmarks) == 1 and handedness == ['Right']
+        [(pointer, hand_id)] = detector.get_gesture_points(hand_landmarks)
+        assert hand_id == 0
+        pointers.append(pointer)
+
+    pointers = np.array(pointers)
+    assert ((pointers >= 0) & (pointers < (320, 240))).all()
+    assert len(np.unique(pointers, axis=0)) > 40
+    # The recording loops
+    np.testing.assert_array_equal(detector.detect_hands(None)[0].pointers()[0], pointers[0])
+
+
+def test_recorded_landmarks_play_back(tmp_path):
+    path = tmp_path / 'hands.jsonl'
+    source = RecordedLandmarkDetector.synthetic(320, 240, num_frames=5)
+    source.frames.insert(2, (HandLandmarks(), []))  # A frame without hands
+    recorder = LandmarkRecorder(source, str(path))
+    recorded = [recorder.detect_hands(None) for _ in range(6)]
+    recorder.release()
+
+    replay = RecordedLandmarkDetector.load(str(path), loop=False)
+    for hand_landmarks, handedness in recorded:
+        replayed, replayed_handedness = replay.detect_hands(None)
+        np.testing.assert_array_equal(replayed.points, hand_landmarks.points)
+        assert replayed_handedness == handedness
+    assert not replay.detect_hands(None)[0]
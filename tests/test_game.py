@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import game as game_module
+from frame_source import SyntheticSource
+from game import GestureGame
+from gesture_detector import GestureDetector
+from presenter import NullPresenter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_game_imports_without_mediapipe():
+    result = subprocess.run(
+        [sys.executable, '-c',
+         "import sys, game, gesture_detector; print('mediapipe' in sys.modules)"],
+        cwd=ROOT, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'False'
+
+
+@pytest.mark.parametrize('pipelined', [False, True])
+def test_failed_model_load_is_shown_instead_of_the_loading_splash(monkeypatch, pipelined):
+    detector = GestureDetector()
+
+    def broken_load():
+        raise ImportError("No module named 'mediapipe'")
+    monkeypatch.setattr(detector, 'load', broken_load)
+
+    texts = []
+    draw_text = game_module.draw_text
+
+    def recorded_draw_text(frame, text, *args, **kwargs):
+        texts.append(text)
+        draw_text(frame, text, *args, **kwargs)
+    monkeypatch.setattr(game_module, 'draw_text', recorded_draw_text)
+
+    presenter = NullPresenter()
+    game = GestureGame(pipelined=pipelined, frame_source=SyntheticSource(320, 240, num_frames=60),
+                       gesture_detector=detector, presenter=presenter)
+    game.run()  # Runs until the source ends, without raising
+
+    assert isinstance(detector.load_error, ImportError)
+    assert presenter.last_frame is not None
+    assert "Hand tracking failed to load" in texts
+    assert "No module named 'mediapipe'" in texts
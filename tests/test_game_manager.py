@@ -0,0 +1,118 @@
+import numpy as np
+
+from boards import set_board
+from game_manager import GameManager
+from levels import LevelPack, MIN_RADIUS
+from renderer import BoardLayer
+from selection import INSTANT
+
+
+def test_stuck_redeal_drops_other_hands_pending_hits():
+    game_manager = GameManager(selection_mode=INSTANT, seed=1, no_crossing=True)
+    # Joining the horizontal pair blocks the vertical one, so the board gets stuck
+    set_board(game_manager, [(100, 400), (900, 400), (500, 200), (500, 600)], [0, 0, 1, 1])
+    events = []
+    game_manager.add_listener(lambda event, data: events.append(event))
+
+    game_manager.update_cursors([((100, 400), 0)], timestamp=1.0)
+    assert game_manager.sessions[0].first_selected_ball.id == 0
+
+    # Hand 0 completes the match (closest, resolved first); hand 1's hit is pending
+    game_manager.update_cursors([((900, 400), 0), ((505, 200), 1)], timestamp=1.1)
+
+    assert 'stuck' in events
+    assert 'select' not in events[events.index('stuck'):]
+    for session in game_manager.sessions.values():
+        assert session.first_selected_ball is None
+    assert not game_manager.balls.selected.any()
+    assert game_manager.ball_owner == {}
+
+
+def test_level_up_drops_pending_hits():
+    game_manager = GameManager(selection_mode=INSTANT, seed=1)
+    set_board(game_manager, [(100, 400), (900, 400)], [0, 0])
+    game_manager.update_cursors([((100, 400), 0)], timestamp=1.0)
+    game_manager.update_cursors([((900, 400), 0), ((905, 400), 1)], timestamp=1.1)
+
+    assert game_manager.level == 2
+    assert all(session.first_selected_ball is None
+               for session in game_manager.sessions.values())
+
+
+def assert_no_overlap(game_manager):
+    positions = game_manager.ball_positions
+    offsets = positions[:, None] - positions[None]
+    distances = np.hypot(offsets[..., 0], offsets[..., 1])[np.triu_indices(len(positions), 1)]
+    assert distances.min() >= 2 * game_manager.ball_radius
+
+
+def test_progression_past_frame_capacity_shrinks_balls():
+    # 640x480 holds about 30 balls at the default radius (level 13 used to crash)
+    game_manager = GameManager(frame_size=(640, 480), seed=4)
+    for _ in range(25):
+        game_manager.level_complete()
+
+    assert game_manager.level == 26
+    assert len(game_manager.balls) == 2 * game_manager.levels.level(26).pairs
+    assert game_manager.ball_radius < game_manager.levels.level(26).radius
+    assert_no_overlap(game_manager)
+
+
+def test_progression_past_smallest_balls_caps_pairs():
+    pack = LevelPack.from_dict({'levels': [{'pairs': 4}], 'pairs_step': 60})
+    game_manager = GameManager(frame_size=(640, 480), seed=4, levels=pack)
+    for _ in range(4):
+        game_manager.level_complete()
+
+    balls = len(game_manager.balls)
+    assert 2 <= balls < 2 * pack.level(5).pairs
+    assert balls % 2 == 0
+    assert np.bincount(game_manager.balls.color_ids).tolist() == [2] * (balls // 2)
+    assert game_manager.ball_radius == MIN_RADIUS
+    assert_no_overlap(game_manager)
+
+
+def test_drop_hand_refreshes_its_combo_on_the_layer():
+    game_manager = GameManager(selection_mode=INSTANT, seed=1)
+    set_board(game_manager, [(100, 400), (900, 400), (500, 200), (500, 600)], [0, 0, 1, 1])
+    game_manager.update_cursors([((100, 400), 0)], timestamp=1.0)
+    game_manager.update_cursors([((900, 400), 0)], timestamp=1.1)
+    assert game_manager.combo == 1
+
+    layer = BoardLayer()
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    layer.composite(frame, game_manager)
+    drawn = layer.image.copy()
+
+    game_manager.drop_hand(0)
+    layer.composite(frame, game_manager)
+
+    assert game_manager.combo == 0
+    assert (layer.image != drawn).any()
+
+
+def test_fast_sweep_selects_and_matches_in_path_order():
+    game_manager = GameManager(selection_mode=INSTANT, seed=1)
+    set_board(game_manager, [(300, 400), (500, 400), (700, 400), (500, 100)], [0, 0, 1, 1])
+    events = []
+    game_manager.add_listener(lambda event, data: events.append((event, data)))
+
+    game_manager.update_cursors([((100, 400), 0)], timestamp=1.0)
+    # One frame later the cursor is past the first pair, which it swept over
+    game_manager.update_cursors([((600, 400), 0)], timestamp=1.03)
+
+    assert [event for event, _ in events] == ['select', 'match', 'release']
+    assert game_manager.balls.matched.tolist() == [True, True, False, False]
+
+
+def test_sweep_ignores_jumps_and_matched_balls():
+    game_manager = GameManager(selection_mode=INSTANT, seed=1)
+    set_board(game_manager, [(300, 400), (500, 400), (200, 100), (900, 100)], [0, 0, 1, 1])
+    session = game_manager.get_session(0)
+    session.cursor_pos = (700, 400)
+
+    assert [ball.id for *_, ball in game_manager.swept_hits(session, (100, 400))] == [0, 1]
+    game_manager.balls.matched[0] = True
+    assert [ball.id for *_, ball in game_manager.swept_hits(session, (100, 400))] == [1]
+    session.cursor_pos = (100 + game_manager.max_sweep + 1, 400)
+    assert game_manager.swept_hits(session, (100, 400)) == []
@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from gesture_detector import GestureDetector
+
+FRAME_SIZE = (480, 640)
+MARKER = 8  # Side of the square the stub model "detects" as a hand
+
+
+class StubHands:
+    """Stands in for mediapipe Hands: finds a bright square in the RGB image it is given"""
+
+    def __init__(self):
+        self.sizes = []  # (height, width) of every image processed
+
+    def process(self, image):
+        assert not image.flags.writeable
+        self.sizes.append(image.shape[:2])
+        ys, xs = np.nonzero(image[:, :, 0] > 128)
+        if not len(xs):
+            return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+        # Every landmark sits on the square's center, normalized to this image
+        h, w = image.shape[:2]
+        point = SimpleNamespace(x=(xs.mean() + 0.5) / w, y=(ys.mean() + 0.5) / h, z=0.0,
+                                visibility=1.0)
+        hand = SimpleNamespace(landmark=[point] * 21)
+        label = SimpleNamespace(classification=[SimpleNamespace(label='Left')])
+        return SimpleNamespace(multi_hand_landmarks=[hand], multi_handedness=[label])
+
+    def close(self):
+        pass
+
+
+def frame_with_hand(x, y):
+    """Unmirrored camera frame with the marker's top-left corner at (x, y)"""
+    frame = np.zeros(FRAME_SIZE + (3,), dtype=np.uint8)
+    frame[y:y + MARKER, x:x + MARKER] = 255
+    return frame
+
+
+def stub_detector(**kwargs):
+    detector = GestureDetector(**kwargs)
+    detector.hands = StubHands()
+    return detector
+
+
+def test_cropped_downscaled_landmarks_map_back_to_the_mirrored_frame():
+    detector = stub_detector(inference_scale=0.5, roi_tracking=True)
+    frame = frame_with_hand(300, 200)
+    width = FRAME_SIZE[1]
+
+    hand_landmarks, handedness = detector.detect_hands(frame)
+    assert detector.hands.sizes == [(240, 320)]
+    np.testing.assert_allclose(hand_landmarks.pointers(), [[width - 304, 204]], atol=1)
+    assert handedness == ['Right']
+
+    # The next frame is searched in a crop around the hand, in unmirrored coordinates
+    x0, y0, x1, y1 = detector.roi
+    assert 0 < x0 <= 300 and 308 <= x1 < width and y0 <= 200 and 208 <= y1
+    hand_landmarks, _ = detector.detect_hands(frame)
+    assert detector.hands.sizes[-1] == (round((y1 - y0) * 0.5), round((x1 - x0) * 0.5))
+    np.testing.assert_allclose(hand_landmarks.pointers(), [[width - 304, 204]], atol=1)
+    assert detector.frames_since_full == 1
+
+
+def test_unmirrored_crop_keeps_camera_coordinates():
+    detector = stub_detector(roi_tracking=True, mirror=False)
+    frame = frame_with_hand(400, 60)
+    detector.detect_hands(frame)
+    hand_landmarks, handedness = detector.detect_hands(frame)
+
+    assert detector.frames_since_full == 1
+    np.testing.assert_allclose(hand_landmarks.pointers(), [[404, 64]], atol=0.5)
+    assert handedness == ['Left']
+
+
+def test_hand_lost_in_the_crop_is_found_in_the_full_frame():
+    detector = stub_detector(inference_scale=0.5, roi_tracking=True)
+    detector.detect_hands(frame_with_hand(300, 200))
+    detector.detect_hands(frame_with_hand(300, 200))
+    crop = detector.hands.sizes[-1]
+
+    hand_landmarks, _ = detector.detect_hands(frame_with_hand(500, 40))
+    assert detector.hands.sizes[-2:] == [crop, (240, 320)]
+    np.testing.assert_allclose(hand_landmarks.pointers(), [[FRAME_SIZE[1] - 504, 44]], atol=1)
+    assert detector.frames_since_full == 0
+
+    # No hand anywhere: the crop is dropped and the next search covers the frame
+    assert not detector.detect_hands(np.zeros(FRAME_SIZE + (3,), dtype=np.uint8))[0]
+    assert detector.roi is None
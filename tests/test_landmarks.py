@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from landmarks import HandLandmarks, classify_gestures
+from utils import distance_between_points
+
+# Wrist at the bottom, fingers pointing up; thumb joints 1-4 lean out to the left
+WRIST = (0, 200)
+THUMB_OUT = [(-40, 180), (-60, 150), (-75, 125), (-90, 100)]
+FINGER_X = (-15, 5, 25, 45)  # Index, middle, ring, pinky
+
+
+def finger(x, extended):
+    """MCP, PIP, DIP and tip of one finger, straight up or folded down over the palm"""
+    if extended:
+        return [(x, 120), (x, 80), (x, 50), (x, 20)]
+    return [(x, 120), (x, 160), (x + 5, 170), (x + 5, 175)]
+
+
+def hand(extended, thumb=THUMB_OUT, offset=(0, 0)):
+    """21 landmarks with the given index..pinky fingers extended, moved by offset"""
+    points = [WRIST] + list(thumb)
+    for x, is_extended in zip(FINGER_X, extended):
+        points += finger(x, is_extended)
+    return [(x + offset[0], y + offset[1]) for x, y in points]
+
+
+@pytest.fixture
+def pointing():
+    return hand((True, False, False, False), offset=(300, 40))
+
+
+@pytest.fixture
+def open_hand():
+    return hand((True, True, True, True), offset=(-50, 100))
+
+
+@pytest.fixture
+def pinch():
+    # Index half bent towards the thumb tip
+    points = hand((False, False, False, False),
+                  thumb=[(-30, 180), (-45, 150), (-40, 115), (-24, 84)], offset=(120, 0))
+    points[6:9] = [(105, 95), (100, 85), (96, 82)]
+    return points
+
+
+def per_hand_gestures(landmarks, open_hand_distance=50):
+    """Reference classification, one hand at a time with scalar distances"""
+    # (tip, pip, mcp) of thumb, index, middle, ring and pinky
+    joints = [(4, 3, 2), (8, 6, 5), (12, 10, 9), (16, 14, 13), (20, 18, 17)]
+    extended = [
+        distance_between_points(landmarks[tip], landmarks[pip]) >
+        distance_between_points(landmarks[pip], landmarks[mcp])
+        for tip, pip, mcp in joints
+    ]
+    index, middle, ring, pinky = extended[1:]
+    palm = distance_between_points(landmarks[9], landmarks[0])
+    return {
+        'extended': extended,
+        'pointing': index and not middle,
+        'peace': index and middle,
+        'two_finger_point': index and middle and not ring and not pinky,
+        'open_hand': all(distance_between_points(landmarks[tip], landmarks[0]) >= open_hand_distance
+                         for tip in (4, 8, 12, 16, 20)),
+        'fist': not any(extended[1:]),
+        'pinch_ratio': distance_between_points(landmarks[4], landmarks[8]) / max(palm, 1.0),
+    }
+
+
+def test_batched_gestures_match_the_per_hand_logic(pointing, open_hand, pinch):
+    hands = [pointing, open_hand, pinch, hand((False,) * 4), hand((True, True, False, False))]
+    gestures = classify_gestures(HandLandmarks.from_lists(hands))
+
+    for hand_id, landmarks in enumerate(hands):
+        expected = per_hand_gestures(landmarks)
+        for name, value in expected.items():
+            np.testing.assert_allclose(gestures[name][hand_id], value, rtol=1e-5,
+                                       err_msg=f"{name} of hand {hand_id}")
+
+
+def test_fixture_shapes_are_recognized(pointing, open_hand, pinch):
+    gestures = classify_gestures(HandLandmarks.from_lists([pointing, open_hand, pinch]))
+
+    assert gestures['pointing'].tolist() == [True, False, False]
+    assert gestures['open_hand'].tolist() == [False, True, False]
+    assert gestures['pinch_ratio'][2] < 0.3 < gestures['pinch_ratio'][:2].min()
+
+
+def test_no_hands_classify_to_empty_arrays():
+    gestures = classify_gestures(HandLandmarks())
+
+    assert gestures['extended'].shape == (0, 5)
+    assert all(len(value) == 0 for value in gestures.values())
@@ -0,0 +1,139 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from game_manager import GameManager
+from levels import (LevelDef, LevelPack, LayoutCache, build_layout, generate_palette, layout_key,
+                    precompute)
+from placement import PlacementError
+
+
+def test_pack_round_trips_and_extends_past_its_last_level(tmp_path):
+    data = {'name': 'expo', 'pairs_step': 2, 'levels': [
+        {'pairs': 3, 'radius': 25, 'time_limit': 60},
+        {'pairs': 5, 'radius': 20, 'seed': 7, 'obstacles': [{'rect': [0.4, 0.3, 0.2, 0.4]}]},
+    ]}
+    path = tmp_path / 'expo.json'
+    path.write_text(json.dumps(data))
+    pack = LevelPack.load(str(path))
+
+    assert pack.to_dict() == data
+    assert pack.level(4).pairs == 9
+    assert pack.level(4).obstacles == data['levels'][1]['obstacles']
+
+
+def test_invalid_packs_are_rejected(tmp_path):
+    path = tmp_path / 'bad.json'
+    for data in ({'levels': []}, {'levels': [{'pairs': 3, 'speed': 2}]},
+                 {'levels': [{'pairs': 3, 'obstacles': [{'square': [0, 0, 1]}]}]}):
+        path.write_text(json.dumps(data))
+        with pytest.raises(ValueError):
+            LevelPack.load(str(path))
+
+
+def test_generated_palettes_stay_distinct():
+    palette = generate_palette(40)
+
+    assert len(set(palette)) == 40
+    assert generate_palette(5) == palette[:5]
+
+
+def test_layouts_are_reproducible_and_keep_obstacles_free():
+    level = LevelDef(6, obstacles=[{'circle': [0.5, 0.5, 0.2]}])
+    key = layout_key(level, 1, (640, 480), 3)
+    layout = build_layout(level, (640, 480), key)
+
+    np.testing.assert_array_equal(layout.positions, build_layout(level, (640, 480), key).positions)
+    assert sorted(layout.pairs.tolist()) == [i for i in range(6) for _ in range(2)]
+    assert (np.hypot(*(layout.positions - (320, 240)).T) >= 96 + layout.radius).all()
+
+
+def test_prefetch_keeps_max_entries():
+    cache = LayoutCache(max_entries=2)
+    level = LevelDef(3)
+    keys = [layout_key(level, 1, (640, 480), seed, 0) for seed in range(5)]
+    for key in keys:
+        cache.prefetch(key, level, (640, 480))
+    cache.get(keys[-1], level, (640, 480))
+
+    assert len(cache.memory) == 2
+    assert keys[-1] in cache.memory
+
+
+def test_disk_cache_keeps_max_files(tmp_path):
+    cache = LayoutCache(str(tmp_path), max_files=3)
+    level = LevelDef(3)
+    for seed in range(6):
+        cache.get(layout_key(level, 1, (640, 480), seed, 0), level, (640, 480))
+
+    files = [name for name in os.listdir(tmp_path) if name.endswith('.npz')]
+    assert len(files) == 3
+
+
+def test_precomputed_layouts_serve_the_game(tmp_path):
+    pack = LevelPack.from_dict({'levels': [{'pairs': 3}, {'pairs': 4}]})
+    count = precompute(pack, [(640, 480)], [7], LayoutCache(str(tmp_path)), deals=2)
+    assert count == 4
+
+    cache = LayoutCache(str(tmp_path))
+    game_manager = GameManager(frame_size=(640, 480), seed=7, levels=pack, layout_cache=cache)
+    game_manager.redeal('stuck')  # Second board of level 1
+    game_manager.level_complete()
+
+    # Level 2 may have been read by the prefetch thread before get()
+    assert cache.stats['built'] == 0
+    assert cache.stats['disk'] + cache.stats['memory'] == 3
+
+
+def test_redeals_of_a_level_differ():
+    game_manager = GameManager(frame_size=(640, 480), seed=7)
+    first = game_manager.ball_positions.copy()
+    game_manager.redeal('timeout')
+
+    assert game_manager.deal == 1
+    assert (game_manager.ball_positions != first).any()
+
+
+def test_prefetch_failure_is_raised_by_get():
+    cache = LayoutCache()
+    level = LevelDef(2, obstacles=[{'rect': [0, 0, 1, 1]}])
+    key = layout_key(level, 1, (640, 480), 0)
+    cache.prefetch(key, level, (640, 480))
+
+    with pytest.raises(PlacementError) as first:
+        cache.get(key, level, (640, 480))
+    with pytest.raises(PlacementError) as second:
+        cache.get(key, level, (640, 480))
+    assert second.value is first.value
+    assert cache.stats['built'] == 0
+
+
+def test_level_without_room_is_played_without_obstacles():
+    pack = LevelPack.from_dict({'levels': [
+        {'pairs': 3},
+        {'pairs': 3, 'obstacles': [{'rect': [0, 0, 1, 1]}]},
+    ]})
+    game_manager = GameManager(frame_size=(640, 480), seed=7, levels=pack)
+    game_manager.level_complete()  # Level 2 was prefetched (and failed) meanwhile
+
+    assert game_manager.level == 2
+    assert len(game_manager.balls) == 6
+    assert game_manager.obstacles == []
+
+
+def test_unexpected_prefetch_errors_reach_get(monkeypatch):
+    cache = LayoutCache(max_entries=2)
+    level = LevelDef(3)
+
+    def broken(*args):
+        raise RuntimeError("sampler broke")
+    monkeypatch.setattr('levels.build_layout', broken)
+    keys = [layout_key(level, 1, (640, 480), seed) for seed in range(4)]
+    for key in keys:
+        cache.prefetch(key, level, (640, 480))
+
+    with pytest.raises(RuntimeError, match="sampler broke"):
+        cache.get(keys[-1], level, (640, 480))
+    assert list(cache.failed) == keys[-2:]
@@ -0,0 +1,52 @@
+import numpy as np
+
+from game_manager import GameManager
+from motion import MotionGate
+
+
+def still_frame():
+    return np.full((120, 160, 3), 80, dtype=np.uint8)
+
+
+def moving_frame(offset):
+    frame = still_frame()
+    frame[40:80, offset:offset + 40] = 255
+    return frame
+
+
+def test_gate_idles_on_a_still_scene_and_probes():
+    gate = MotionGate(hold_time=1.0, probe_interval=0.5)
+    decisions = [gate.update(still_frame(), i / 10) for i in range(40)]
+
+    # Active for the hold time after the first frame, then one probe per interval
+    assert all(decisions[:10])
+    assert sum(decisions[10:]) == 6
+    assert not gate.active
+    assert gate.idle_for(3.9) > 2.5
+
+
+def test_motion_or_a_hand_keeps_the_gate_open():
+    gate = MotionGate(hold_time=1.0, probe_interval=10.0)
+    for i in range(30):
+        gate.update(still_frame(), i / 10)
+    assert not gate.active
+
+    assert gate.update(moving_frame(20), 3.0)
+    assert gate.motion >= gate.min_changed
+    for i in range(30):
+        assert gate.update(still_frame(), 3.1 + i / 10, has_hands=True)
+
+
+def test_wake_after_progress_starts_a_new_game():
+    game_manager = GameManager(seed=2)
+    game_manager.score = 300
+    events = []
+    game_manager.add_listener(lambda event, data: events.append(event))
+
+    game_manager.set_attract(True)
+    game_manager.set_attract(True)
+    game_manager.set_attract(False)
+
+    assert events.count('attract') == 1
+    assert events[-1] == 'wake'
+    assert game_manager.score == 0 and game_manager.level == 1
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from multicam import FrameRing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_attached_ring_shares_frames():
+    ring = FrameRing((4, 6, 3), 2)
+    attached = FrameRing((4, 6, 3), 2, name=ring.name, shared_tracker=True)
+    try:
+        ring[1][:] = 7
+        assert (attached[1] == 7).all()
+        attached[0][:] = 3
+        assert (ring[0] == 3).all()
+    finally:
+        attached.close()
+        ring.close()
+
+
+def test_closing_the_attached_side_keeps_the_ring():
+    ring = FrameRing((4, 6, 3), 2)
+    try:
+        ring[0][:] = 5
+        FrameRing((4, 6, 3), 2, name=ring.name, shared_tracker=True).close()
+        again = FrameRing((4, 6, 3), 2, name=ring.name, shared_tracker=True)
+        assert (again[0] == 5).all()
+        again.close()
+    finally:
+        ring.close()
+    with pytest.raises(FileNotFoundError):
+        FrameRing((4, 6, 3), 2, name=ring.name)
+
+
+def test_attaching_process_leaves_the_ring_to_its_owner():
+    ring = FrameRing((4, 6, 3), 2)
+    try:
+        ring[0][:] = 9
+        # A process that attaches and exits must neither free the block
+        # nor have its resource tracker report it as leaked
+        code = (f"from multicam import FrameRing; "
+                f"FrameRing((4, 6, 3), 2, name={ring.name!r}).close()")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=ROOT, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert 'leaked' not in result.stderr
+        again = FrameRing((4, 6, 3), 2, name=ring.name, shared_tracker=True)
+        assert (again[0] == 9).all()
+        again.close()
+    finally:
+        ring.close()
+
+
+SPAWN_SCRIPT = """
+import multiprocessing
+import sys
+
+sys.path.insert(0, {root!r})
+from multicam import FrameRing
+
+
+def worker(names, done):
+    ring = FrameRing((4, 6, 3), 2)
+    ring[0][:] = 4
+    names.put(ring.name)
+    done.wait()
+    ring.close()
+
+
+if __name__ == '__main__':
+    context = multiprocessing.get_context('spawn')
+    names, done = context.Queue(), context.Event()
+    process = context.Process(target=worker, args=(names, done))
+    process.start()
+    ring = FrameRing((4, 6, 3), 2, name=names.get(timeout=30), shared_tracker=True)
+    assert (ring[0] == 4).all()
+    ring.close()
+    done.set()
+    process.join(timeout=30)
+    sys.exit(process.exitcode)
+"""
+
+
+def test_spawned_worker_ring_leaves_the_tracker_clean(tmp_path):
+    # Like MultiCameraGame: a spawned worker creates the ring, the parent
+    # attaches, and both report to the parent's resource tracker
+    script = tmp_path / 'spawn_ring.py'
+    script.write_text(SPAWN_SCRIPT.format(root=ROOT))
+    result = subprocess.run([sys.executable, str(script)], capture_output=True, text=True,
+                            timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == ''
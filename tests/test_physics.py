@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from balls import BallStore
+from physics import BallPhysics, contact_candidates
+
+
+def moving_board(count=60, seed=0, frame_size=(640, 480), radius=12):
+    rng = np.random.default_rng(seed)
+    positions = np.column_stack((rng.uniform(radius, frame_size[0] - radius, count),
+                                 rng.uniform(100 + radius, frame_size[1] - radius, count)))
+    balls = BallStore(positions, np.full(count, radius), np.arange(count) // 2, [(0, 0, 0)])
+    physics = BallPhysics(speed=300)
+    physics.launch(balls, rng)
+    return balls, physics
+
+
+def test_contact_candidates_include_every_close_pair_once():
+    rng = np.random.default_rng(1)
+    positions = rng.uniform(0, 400, size=(300, 2))
+    first, second = contact_candidates(positions, 24.0)
+    found = {tuple(sorted(pair)) for pair in zip(first.tolist(), second.tolist())}
+
+    assert len(found) == len(first)
+    assert all(a != b for a, b in found)
+    distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    close = {(a, b) for a, b in zip(*np.nonzero(distance < 24.0)) if a < b}
+    assert close <= found
+
+
+def test_balls_stay_in_the_play_area_and_keep_their_speed():
+    balls, physics = moving_board(count=1)
+    speed = np.linalg.norm(balls.velocities[0])
+    for frame in range(300):
+        physics.advance(balls, (640, 480), [], frame / 30)
+        x, y = balls.positions[0]
+        assert 12 <= x <= 628 and 112 <= y <= 468
+
+    assert np.linalg.norm(balls.velocities[0]) == pytest.approx(speed)
+
+
+def test_head_on_collision_exchanges_velocities():
+    physics = BallPhysics()
+    positions = np.array([[100.0, 200.0], [124.0, 200.0]])
+    velocities = np.array([[50.0, 0.0], [-50.0, 0.0]])
+    radii = np.array([12.0, 12.0])
+    lower, upper = np.full((2, 2), 0.0), np.full((2, 2), 1000.0)
+    physics.step(positions, velocities, radii, lower, upper)
+
+    np.testing.assert_allclose(velocities, [[-50.0, 0.0], [50.0, 0.0]])
+    assert physics.contacts == 1
+    assert positions[1, 0] - positions[0, 0] >= 24.0
+
+
+def test_motion_does_not_depend_on_the_frame_rate():
+    slow, slow_physics = moving_board()
+    fast, fast_physics = moving_board()
+    for frame in range(61):
+        slow_physics.advance(slow, (640, 480), [], frame / 30)
+    for frame in range(121):
+        fast_physics.advance(fast, (640, 480), [], frame / 60)
+
+    np.testing.assert_allclose(slow.positions, fast.positions, atol=1e-6)
+
+
+def test_stalls_are_capped_and_matched_balls_stay():
+    balls, physics = moving_board()
+    balls.matched[:2] = True
+    still = balls.positions[:2].copy()
+    physics.advance(balls, (640, 480), [], 0.0)
+
+    assert physics.advance(balls, (640, 480), [], 5.0) == physics.max_steps
+    np.testing.assert_array_equal(balls.positions[:2], still)
+
+
+def test_obstacles_push_balls_out():
+    physics = BallPhysics()
+    positions = np.array([[220.0, 200.0], [335.0, 200.0]])
+    velocities = np.array([[0.0, 0.0], [-100.0, 0.0]])
+    radii = np.array([12.0, 12.0])
+    lower, upper = np.full((2, 2), 0.0), np.full((2, 2), 1000.0)
+    obstacles = [('circle', 200.0, 200.0, 30.0), ('rect', 280.0, 150.0, 330.0, 250.0)]
+    physics.step(positions, velocities, radii, lower, upper, obstacles)
+
+    assert np.hypot(*(positions[0] - (200, 200))) >= 42.0 - 1e-9
+    assert positions[1, 0] >= 342.0 - 1e-9
+    assert velocities[1, 0] > 0
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from frame_source import RecordedLandmarkDetector, SyntheticSource
+from pipeline import FramePipeline, LatestQueue
+
+
+def test_latest_queue_drops_the_oldest_item():
+    dropped = []
+    queue = LatestQueue(2, on_drop=dropped.append)
+    for item in range(5):
+        queue.put(item)
+
+    assert dropped == [0, 1, 2]
+    assert queue.dropped == 3
+    assert [queue.get(), queue.get()] == [3, 4]
+    assert queue.get(timeout=0.01) is None
+
+
+def test_closing_a_latest_queue_wakes_its_consumer():
+    queue = LatestQueue()
+    results = []
+    consumer = threading.Thread(target=lambda: results.append(queue.get()))
+    consumer.start()
+    time.sleep(0.05)
+    queue.close()
+    consumer.join(timeout=1.0)
+
+    assert not consumer.is_alive()
+    assert results == [None]
+
+
+def test_pipeline_delivers_detections_and_recycles_buffers():
+    capture = SyntheticSource(160, 120, num_frames=40)
+    pipeline = FramePipeline(capture, RecordedLandmarkDetector.synthetic(160, 120))
+    pool_size = pipeline.buffer_pool.available
+    pipeline.start()
+
+    rendered = 0
+    while True:
+        result = pipeline.get_result(timeout=0.5)
+        if result is None:
+            if pipeline.capture_failed and not len(pipeline.result_queue):
+                break
+            continue
+        frame, hand_landmarks, handedness, capture_time = result
+        assert frame.shape == (120, 160, 3)
+        assert len(hand_landmarks) == 1 and handedness == ['Right']
+        pipeline.release_frame(frame)
+        rendered += 1
+    pipeline.stop()
+    for queue in (pipeline.frame_queue, pipeline.result_queue):
+        while len(queue):
+            pipeline.release_frame(queue.get()[0])
+
+    stats = pipeline.get_stats()
+    assert rendered > 0
+    assert stats['capture']['frames'] == 40
+    assert rendered + stats['detect']['dropped'] <= stats['detect']['frames']
+    # Every buffer came back, whether rendered or dropped on the way
+    assert pipeline.buffer_pool.available == pool_size
@@ -0,0 +1,42 @@
+import random
+
+import numpy as np
+import pytest
+
+from placement import PlacementError, outside_obstacles, place_balls, poisson_disc_sample
+
+
+def pairwise_distances(points):
+    offsets = points[:, None] - points[None]
+    distances = np.hypot(offsets[..., 0], offsets[..., 1])
+    return distances[np.triu_indices(len(points), 1)]
+
+
+def test_poisson_disc_keeps_min_distance_and_bounds():
+    points = poisson_disc_sample((10, 20, 500, 300), 30, rng=random.Random(1))
+    assert len(points) > 50
+    assert pairwise_distances(points).min() >= 30
+    assert (points >= (10, 20)).all() and (points <= (500, 300)).all()
+
+
+def test_place_balls_is_reproducible_and_clear_of_margins():
+    first = place_balls(20, (1280, 720), spacing=80, ball_radius=25, rng=random.Random(5))
+    second = place_balls(20, (1280, 720), spacing=80, ball_radius=25, rng=random.Random(5))
+    np.testing.assert_array_equal(first, second)
+    assert len(first) == 20
+    assert (first[:, 0] >= 75).all() and (first[:, 1] >= 125).all()
+    assert (first[:, 0] <= 1205).all() and (first[:, 1] <= 645).all()
+
+
+def test_place_balls_avoids_obstacles():
+    obstacles = [('rect', 400, 200, 800, 500), ('circle', 200, 400, 80)]
+    points = place_balls(30, (1280, 720), spacing=60, ball_radius=20, obstacles=obstacles,
+                         rng=random.Random(2))
+    assert outside_obstacles(points, obstacles, 20).all()
+
+
+def test_place_balls_reports_how_many_fit():
+    with pytest.raises(PlacementError) as error:
+        place_balls(200, (640, 480), spacing=80, min_spacing=60, ball_radius=25,
+                    rng=random.Random(0))
+    assert 0 < error.value.fitted < 200
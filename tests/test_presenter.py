@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import presenter
+from presenter import NO_KEY, FramePacer, NullPresenter
+
+
+class FakeClock:
+    """Stands in for time.perf_counter/time.sleep so pacing is exact"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        self.now += 1e-6  # Spinning still advances time
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(presenter.time, 'perf_counter', clock.perf_counter)
+    monkeypatch.setattr(presenter.time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_pacer_holds_the_target_rate(clock):
+    pacer = FramePacer(target_fps=100)
+    for _ in range(30):
+        clock.sleep(0.004)  # Frame work well inside the budget
+        pacer.wait()
+    stats = pacer.stats()
+
+    assert stats['fps'] == pytest.approx(100, rel=1e-3)
+    assert stats['jitter_ms'] < 0.01
+    assert stats['missed'] == 0
+
+
+def test_late_frame_snaps_to_the_deadline_grid(clock):
+    pacer = FramePacer(target_fps=100)
+    start = pacer.wait()
+    clock.sleep(0.025)  # Misses the slots at 10 and 20 ms
+    pacer.wait()
+    presented = pacer.wait()
+
+    assert pacer.missed == 2
+    assert presented - start == pytest.approx(0.030, abs=1e-4)
+
+
+def test_unpaced_frames_are_only_measured():
+    pacer = FramePacer()
+    for _ in range(5):
+        pacer.wait()
+
+    assert pacer.presented == 5
+    assert len(pacer.intervals) == 4
+    pacer.reset()
+    assert pacer.stats()['fps'] == 0.0
+
+
+def test_null_presenter_keeps_frames_and_feeds_keys():
+    presenter = NullPresenter(keys=['q', 27])
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    presenter.present(frame)
+
+    assert presenter.last_frame is frame
+    assert [presenter.poll_key() for _ in range(3)] == [ord('q'), 27, NO_KEY]
@@ -0,0 +1,78 @@
+import csv
+import json
+import sys
+import threading
+
+from profiler import StageProfiler
+
+
+def test_stages_recorded_from_many_threads_all_count():
+    profiler = StageProfiler(window=100000, record_events=True)
+    profiler.begin_frame()
+    threads, spans = 8, 5000
+
+    def worker():
+        for _ in range(spans):
+            profiler.record('detect', 0, 1000000)  # 1 ms
+
+    # Switch threads as often as possible so unguarded updates interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(profiler.samples['detect']) == threads * spans
+    assert profiler.frame_stages['detect'] == threads * spans
+    assert len(profiler.events) == threads * spans
+
+
+def test_slow_frame_is_reported_with_its_stages():
+    profiler = StageProfiler()
+    for _ in range(30):
+        profiler.begin_frame()
+        profiler.end_frame()
+    profiler.begin_frame()
+    profiler.record('render', 0, 50000000)
+    profiler.frame_start -= 50000000  # The frame took at least 50 ms
+    profiler.end_frame()
+
+    frame_ms, stages = profiler.last_spike
+    assert frame_ms >= 50
+    assert stages == {'render': 50.0}
+    assert profiler.summary()['render']['max_ms'] == 50.0
+
+
+def test_export_formats(tmp_path):
+    profiler = StageProfiler(record_events=True)
+    with profiler.stage('capture'):
+        pass
+    with profiler.stage('render'):
+        pass
+
+    profiler.export(str(tmp_path / 'trace.json'))
+    profiler.export(str(tmp_path / 'trace.csv'))
+
+    with open(tmp_path / 'trace.json') as f:
+        events = json.load(f)['traceEvents']
+    assert [event['name'] for event in events] == ['capture', 'render']
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+    with open(tmp_path / 'trace.csv', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['stage', 'thread', 'start_us', 'duration_us']
+    assert [row[0] for row in rows[1:]] == ['capture', 'render']
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler(enabled=False)
+    profiler.begin_frame()
+    with profiler.stage('capture'):
+        pass
+    profiler.end_frame()
+
+    assert profiler.samples == {}
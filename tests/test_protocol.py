@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from boards import set_board
+from game_manager import GameManager
+from landmarks import HandLandmarks
+from levels import LevelPack
+from protocol import (EVENTS, MSG_SNAPSHOT, RemoteBoard, decode_message, encode_event,
+                      encode_frame, encode_snapshot)
+from selection import INSTANT
+
+
+def play_every_event():
+    """Drive a GameManager through every event it emits; returns (game manager, events)"""
+    pack = LevelPack.from_dict({'levels': [{'pairs': 2, 'time_limit': 10}]})
+    game_manager = GameManager(selection_mode=INSTANT, seed=3, no_crossing=True, levels=pack)
+    events = []
+    game_manager.add_listener(lambda event, data: events.append((event, data)))
+
+    # Wrong color: select then release
+    set_board(game_manager, [(100, 400), (900, 400), (500, 200), (500, 600)], [0, 0, 1, 1])
+    game_manager.update_cursors([((100, 400), 0)], timestamp=1.0)
+    game_manager.update_cursors([((500, 200), 0)], timestamp=1.1)
+
+    # Joining the vertical pair across a matched line is blocked
+    game_manager.pair_lines.insert((100, 400), (900, 400))
+    game_manager.update_cursors([((500, 600), 0)], timestamp=1.2)
+    game_manager.update_cursors([((500, 200), 0)], timestamp=1.3)
+    game_manager.drop_hand(0)
+
+    # Matching the horizontal pair leaves no legal move: stuck re-deal
+    set_board(game_manager, [(100, 400), (900, 400), (500, 200), (500, 600)], [0, 0, 1, 1])
+    game_manager.update_cursors([((100, 400), 1)], timestamp=1.4)
+    game_manager.update_cursors([((900, 400), 1)], timestamp=1.5)
+    game_manager.drop_hand(1)
+
+    # Clearing a board levels up
+    set_board(game_manager, [(100, 400), (900, 400)], [0, 0])
+    game_manager.update_cursors([((100, 400), 2)], timestamp=1.6)
+    game_manager.update_cursors([((900, 400), 2)], timestamp=1.7)
+
+    # The time limit runs out
+    game_manager.update_cursors([], timestamp=2.0)
+    game_manager.update_cursors([], timestamp=20.0)
+
+    game_manager.set_attract(True)
+    game_manager.set_attract(False)
+    return game_manager, events
+
+
+def test_game_emits_only_supported_events():
+    _, events = play_every_event()
+    assert {event for event, _ in events} == set(EVENTS)
+
+
+@pytest.mark.parametrize('event', EVENTS)
+def test_every_event_round_trips(event):
+    game_manager, events = play_every_event()
+    sample = [(name, data) for name, data in events if name == event][:1]
+    message = decode_message(encode_frame(7, 1.5, game_manager, HandLandmarks(), [], sample))
+
+    assert message['frame_id'] == 7
+    assert len(message['events']) == 1
+    name, data = message['events'][0]
+    assert name == event
+    expected = sample[0][1]
+    assert data.keys() == expected.keys()
+    for key, value in expected.items():
+        if key == 'positions':
+            np.testing.assert_allclose(data[key], value, atol=1e-3)
+        elif key == 'colors':
+            assert data[key] == [tuple(color) for color in value]
+        else:
+            assert tuple(np.atleast_1d(data[key])) == tuple(np.atleast_1d(value))
+
+
+def test_unknown_event_is_rejected():
+    with pytest.raises(ValueError):
+        encode_event('fireworks', {})
+
+
+def test_remote_board_follows_the_game():
+    game_manager = GameManager(selection_mode=INSTANT, seed=3)
+    board = RemoteBoard()
+    board.apply(decode_message(encode_snapshot(0, 0.0, game_manager)))
+    assert board.synced
+    np.testing.assert_allclose(board.balls.positions, game_manager.ball_positions, atol=1e-3)
+
+    _, events = play_every_event()
+    attract = [(event, data) for event, data in events if event == 'attract']
+    board.apply(decode_message(encode_frame(1, 0.1, game_manager, HandLandmarks(), [], attract)))
+    assert board.attract
+    snapshot = decode_message(encode_snapshot(2, 0.2, game_manager))
+    assert snapshot['type'] == MSG_SNAPSHOT
@@ -0,0 +1,82 @@
+import numpy as np
+
+from boards import set_board
+from frame_source import RecordedLandmarkDetector
+from game_manager import GameManager
+from renderer import (SKELETON_FULL, SKELETON_OFF, SKELETON_TIPS, BoardLayer, draw_hands,
+                      splat_points)
+from selection import INSTANT
+
+GREEN = (0, 255, 0)
+
+
+def test_splat_points_draws_filled_dots():
+    canvas = np.zeros((40, 40, 3), dtype=np.uint8)
+    splat_points(canvas, np.array([[10.2, 20.4], [30, 5]]), 3, GREEN)
+
+    assert (canvas[20, 10] == GREEN).all() and (canvas[5, 30] == GREEN).all()
+    assert (canvas[20, 13] == GREEN).all() and not canvas[20, 14].any()
+    # Two disks of radius 3 (29 pixels each)
+    assert np.count_nonzero(canvas[:, :, 1]) == 58
+
+
+def test_splat_points_drops_pixels_off_the_canvas():
+    canvas = np.zeros((40, 40, 3), dtype=np.uint8)
+    splat_points(canvas, np.array([[-20.0, 10.0], [60.0, 50.0], [1.0, 20.0]]), 3, GREEN)
+
+    # Only the dot straddling the left edge shows, without smearing along it
+    drawn_ys, drawn_xs = np.nonzero(canvas[:, :, 1])
+    assert drawn_xs.max() <= 4 and set(drawn_ys) == set(range(17, 24))
+    assert not canvas[10, 0].any()
+
+
+def test_draw_hands_levels_of_detail():
+    detector = RecordedLandmarkDetector.synthetic(320, 240, num_frames=10)
+    hand_landmarks, _ = detector.detect_hands(None)
+    xy = hand_landmarks.xy
+
+    drawn = {}
+    for detail in (SKELETON_FULL, SKELETON_TIPS, SKELETON_OFF):
+        canvas = np.zeros((240, 320, 3), dtype=np.uint8)
+        draw_hands(canvas, xy, detail)
+        drawn[detail] = np.count_nonzero(canvas.any(axis=2))
+
+    assert drawn[SKELETON_FULL] > drawn[SKELETON_TIPS] > drawn[SKELETON_OFF] == 0
+    canvas = np.zeros((240, 320, 3), dtype=np.uint8)
+    draw_hands(canvas, xy, SKELETON_FULL)
+    x, y = np.rint(xy[0, 8]).astype(int)
+    assert (canvas[y, x] == GREEN).all()
+
+
+def test_board_layer_redraws_on_select_match_and_resize(monkeypatch):
+    game_manager = GameManager(frame_size=(640, 480), selection_mode=INSTANT, seed=1)
+    set_board(game_manager, [(100, 240), (540, 240), (320, 60), (320, 420)], [0, 0, 1, 1])
+    layer = BoardLayer()
+    renders = []
+    render = layer.render
+
+    def counted_render(shape, game_manager):
+        renders.append(shape)
+        render(shape, game_manager)
+    monkeypatch.setattr(layer, 'render', counted_render)
+
+    def composite(shape=(480, 640, 3)):
+        layer.composite(np.zeros(shape, dtype=np.uint8), game_manager)
+        return layer.image.copy()
+
+    idle = composite()
+    assert (composite() == idle).all() and len(renders) == 1
+
+    game_manager.update_cursors([((100, 240), 0)], timestamp=1.0)
+    selected = composite()
+    assert len(renders) == 2 and (selected != idle).any()
+
+    # The pair line crosses the middle of the board, where nothing was drawn before
+    game_manager.update_cursors([((540, 240), 0)], timestamp=1.1)
+    matched = composite()
+    assert len(renders) == 3
+    assert not selected[240, 320].any() and matched[240, 320].any()
+
+    resized = composite((360, 480, 3))
+    assert len(renders) == 4 and resized.shape == (360, 480, 3)
+    assert layer.key == (game_manager.state_version, (360, 480, 3))
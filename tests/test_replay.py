@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pytest
+
+from game_manager import GameManager
+from physics import BallPhysics
+from replay import LOG_VERSION, SessionRecorder, load_session, replay_session
+from selection import INSTANT
+
+
+def play_session(path, physics=None):
+    """Record a session of one hand touching pair after pair"""
+    recorder = SessionRecorder(path)
+    game_manager = GameManager(frame_size=(640, 480), selection_mode=INSTANT, seed=11,
+                               recorder=recorder, physics=physics)
+    timestamp = 0.0
+    for _ in range(30):
+        unmatched = game_manager.balls.unmatched()
+        pair = unmatched[game_manager.balls.color_ids[unmatched]
+                         == game_manager.balls.color_ids[unmatched[0]]]
+        for ball in pair:
+            timestamp += 1 / 30
+            game_manager.update((480, 640, 3), timestamp)
+            position = game_manager.ball_positions[ball]
+            game_manager.update_cursors([(position, 0)], timestamp=timestamp)
+    game_manager.drop_hand(0)
+    recorder.close()
+    return game_manager
+
+
+def test_replay_reproduces_the_session(tmp_path):
+    path = str(tmp_path / 'session.jsonl')
+    played = play_session(path)
+    header, records = load_session(path)
+    result = replay_session(header, records)
+
+    assert header['version'] == LOG_VERSION
+    assert result['mismatch'] is None
+    assert result['game_manager'].score == played.score
+    assert result['game_manager'].level == played.level > 1
+    np.testing.assert_array_equal(result['game_manager'].ball_positions, played.ball_positions)
+
+
+def test_replay_reproduces_moving_balls(tmp_path):
+    path = str(tmp_path / 'session.jsonl')
+    played = play_session(path, BallPhysics(speed=200))
+    result = replay_session(*load_session(path))
+
+    assert result['mismatch'] is None
+    np.testing.assert_array_equal(result['game_manager'].ball_positions, played.ball_positions)
+
+
+def test_replay_reports_the_first_divergence(tmp_path):
+    path = str(tmp_path / 'session.jsonl')
+    play_session(path)
+    header, records = load_session(path)
+    events = [i for i, record in enumerate(records) if record['k'] == 'event']
+    records[events[1]]['score'] += 1
+
+    mismatch = replay_session(header, records)['mismatch']
+    assert mismatch['index'] == 1
+    assert mismatch['expected'][2] == mismatch['actual'][2] + 1
+
+
+def test_old_logs_are_rejected(tmp_path):
+    path = tmp_path / 'session.jsonl'
+    path.write_text(json.dumps({'k': 'start', 'version': LOG_VERSION - 1}) + "\n")
+
+    with pytest.raises(ValueError):
+        load_session(str(path))
+
+
+def test_recorded_logs_load_back(tmp_path):
+    path = str(tmp_path / 'session.jsonl')
+    recorder = SessionRecorder(path)
+    GameManager(seed=3, recorder=recorder)
+    recorder.close()
+
+    header, records = load_session(path)
+    assert header['seed'] == 3
+    assert [record['k'] for record in records] == []
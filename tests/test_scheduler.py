@@ -0,0 +1,65 @@
+from scheduler import INFER, REUSE, TRACK, InferenceScheduler
+
+
+def run_frames(scheduler, frames, work_time, inference_time):
+    """Drive the scheduler like the frame loop; returns the decisions"""
+    decisions = []
+    for i in range(frames):
+        decision = scheduler.decide(has_tracks=True)
+        inference = inference_time if decision == INFER else 0.0
+        if decision == INFER:
+            scheduler.record_inference(inference, timestamp=i / 30)
+        scheduler.record_frame(work_time + inference, inference)
+        decisions.append(decision)
+    return decisions
+
+
+def test_fast_inference_runs_every_frame():
+    scheduler = InferenceScheduler(target_fps=30)
+    decisions = run_frames(scheduler, 60, work_time=0.010, inference_time=0.015)
+
+    assert decisions == [INFER] * 60
+    assert scheduler.interval == 1
+
+
+def test_slow_inference_is_spread_over_frames():
+    scheduler = InferenceScheduler(target_fps=30)
+    decisions = run_frames(scheduler, 120, work_time=0.010, inference_time=0.050)
+
+    # 23 ms spare per frame: one 50 ms inference fits in every third frame
+    assert scheduler.interval == 3
+    assert decisions[-30:].count(INFER) == 10
+    assert set(decisions) == {INFER, TRACK}
+
+
+def test_interval_returns_to_one_when_load_drops():
+    scheduler = InferenceScheduler(target_fps=30, smoothing=0.5)
+    run_frames(scheduler, 60, work_time=0.010, inference_time=0.050)
+    run_frames(scheduler, 60, work_time=0.010, inference_time=0.010)
+
+    assert scheduler.interval == 1
+
+
+def test_overloaded_frames_use_the_longest_interval():
+    scheduler = InferenceScheduler(target_fps=30, max_interval=4)
+    run_frames(scheduler, 30, work_time=0.040, inference_time=0.020)
+
+    assert scheduler.interval == 4
+
+
+def test_fixed_interval_and_no_tracks():
+    scheduler = InferenceScheduler(adaptive=False, interval=2)
+    scheduler.record_inference()
+    scheduler.record_frame(0.001)
+
+    assert scheduler.decide(has_tracks=False) == REUSE
+    scheduler.record_frame(0.001)
+    assert scheduler.decide(has_tracks=False) == INFER
+
+
+def test_inference_history_stays_within_one_second():
+    scheduler = InferenceScheduler()
+    for i in range(10000):
+        scheduler.record_inference(0.01, timestamp=i / 30)
+
+    assert len(scheduler.inference_times) <= 31
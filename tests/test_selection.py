@@ -0,0 +1,61 @@
+import pytest
+
+from selection import CONFIRMED, DWELL, HOVER, IDLE, INSTANT, PINCH, POINT, SelectionFSM
+
+
+def test_dwell_confirms_after_dwell_time_once():
+    fsm = SelectionFSM(DWELL, dwell_time=0.3)
+
+    assert not fsm.update(4, 0.0)
+    assert fsm.state == HOVER
+    assert fsm.progress(0.15) == pytest.approx(0.5)
+    assert fsm.update(4, 0.3)
+    assert fsm.state == CONFIRMED
+    # Latched until the cursor leaves the ball
+    assert not fsm.update(4, 1.0)
+
+
+def test_changing_target_restarts_the_dwell():
+    fsm = SelectionFSM(DWELL, dwell_time=0.3)
+    fsm.update(4, 0.0)
+    fsm.update(5, 0.2)
+
+    assert not fsm.update(5, 0.4)
+    assert fsm.update(5, 0.5)
+    assert not fsm.update(None, 0.6)
+    assert fsm.state == IDLE
+
+
+def test_cancel_restarts_the_hover():
+    fsm = SelectionFSM(INSTANT)
+    assert fsm.update(1, 0.0)
+    fsm.cancel(0.1)
+
+    assert fsm.state == HOVER
+    assert fsm.update(1, 0.2)
+
+
+def test_pinch_is_debounced_and_uses_hysteresis():
+    fsm = SelectionFSM(PINCH, pinch_on=0.3, pinch_off=0.45, debounce_frames=2)
+
+    assert not fsm.update(1, 0.0, pinch_ratio=0.2)  # First closed frame is debounced
+    assert fsm.update(1, 0.1, pinch_ratio=0.2)
+    fsm.update(None, 0.2, pinch_ratio=0.2)
+    # Between the thresholds the pinch stays closed, so no new pinch starts
+    for t in (0.3, 0.4, 0.5):
+        assert not fsm.update(2, t, pinch_ratio=0.4)
+    assert fsm.pinched
+
+
+def test_point_mode_selects_only_while_pointing():
+    fsm = SelectionFSM(POINT, debounce_frames=2)
+
+    assert not fsm.update(1, 0.0, pointing=True)
+    assert fsm.update(1, 0.1, pointing=True)
+    assert fsm.selects_on_contact
+    assert not SelectionFSM(DWELL).selects_on_contact
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        SelectionFSM('hover')
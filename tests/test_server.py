@@ -0,0 +1,103 @@
+import threading
+
+import numpy as np
+
+from client import StateClient
+from filtering import HandTracker
+from frame_source import SyntheticSource
+from game import GestureGame
+from landmarks import HandLandmarks
+from levels import LevelPack
+from presenter import NullPresenter
+from protocol import RemoteBoard
+from selection import INSTANT
+from server import StateServer, run_server
+
+# Open hand around the index fingertip (landmark 8), as in the synthetic recording
+HAND = [
+    (10, 160), (-30, 140), (-55, 110), (-70, 80), (-80, 55),
+    (-20, 80), (-10, 45), (-5, 20), (0, 0),
+    (10, 80), (15, 40), (18, 15), (20, -5),
+    (35, 85), (45, 50), (50, 25), (55, 5),
+    (55, 95), (70, 70), (78, 50), (85, 35),
+]
+
+
+class PlayingDetector:
+    """Scripted player: points at the partner of the held ball, or at any unmatched ball"""
+
+    def __init__(self, last_level=3):
+        self.game = None  # GestureGame being played
+        self.last_level = last_level
+        self.leaving = 0  # Frames since the player reached the last level
+
+    def detect_hands(self, frame):
+        game_manager = self.game.game_manager
+        if game_manager.level >= self.last_level:
+            # The player walks away and comes back, then the server stops
+            self.leaving += 1
+            if self.leaving == 1:
+                game_manager.set_attract(True)
+            elif self.leaving == 2:
+                game_manager.set_attract(False)
+            else:
+                self.game.is_running = False
+            return HandLandmarks(), []
+
+        balls = game_manager.balls
+        held = [session.first_selected_ball for session in game_manager.sessions.values()
+                if session.first_selected_ball is not None]
+        unmatched = balls.unmatched()
+        if held:
+            same = unmatched[balls.color_ids[unmatched] == held[0].color_id]
+            target = same[same != held[0].id][0]
+        else:
+            target = unmatched[0]
+        x, y = balls.positions[target]
+        return HandLandmarks.from_lists([[(x + dx, y + dy) for dx, dy in HAND]]), ['Right']
+
+    def get_gesture_points(self, hand_landmarks):
+        return [(pointer, hand_id) for hand_id, pointer in enumerate(hand_landmarks.pointers())]
+
+    def release(self):
+        pass
+
+
+def test_client_mirrors_a_served_game_through_level_changes():
+    pack = LevelPack.from_dict({'levels': [{'pairs': 2}, {'pairs': 3}]})
+    detector = PlayingDetector()
+    game = GestureGame(frame_source=SyntheticSource(640, 480), gesture_detector=detector,
+                       selection_mode=INSTANT, seed=5, levels=pack, presenter=NullPresenter())
+    detector.game = game
+    # The scripted hand jumps between balls: keep its id, follow it exactly and
+    # never sweep across the board on the way
+    game.hand_tracker = HandTracker(max_match_distance=10000, min_cutoff=1e6, max_prediction=0.0)
+    game.game_manager.swept_selection = False
+    game.game_manager.resize((480, 640, 3))  # Deal for the synthetic frame before the first hand
+
+    server = StateServer('127.0.0.1:0', max_queue=100000)
+    server.start()
+    client = StateClient(f"127.0.0.1:{server.address[1]}")
+    board = RemoteBoard()
+    received = []
+    try:
+        while server.num_clients == 0:
+            threading.Event().wait(0.01)
+        # Messages queue up server-side, so the client can read them all afterwards
+        frames = run_server(game, server, max_frames=3000)
+        while not received or received[-1]['frame_id'] < frames - 1:
+            message = client.receive()
+            board.apply(message)
+            received.append(message)
+    finally:
+        client.close()
+        server.stop()
+
+    game_manager = game.game_manager
+    assert game_manager.level == 3 and frames < 3000
+    events = {event for message in received for event, _ in message.get('events', ())}
+    assert {'layout', 'select', 'match', 'level', 'attract', 'wake'} <= events
+    assert (board.score, board.level) == (game_manager.score, game_manager.level)
+    np.testing.assert_allclose(board.balls.positions, game_manager.ball_positions, atol=1e-3)
+    assert board.balls.matched.tolist() == game_manager.balls.matched.tolist()
+    assert not board.attract
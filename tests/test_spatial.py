@@ -0,0 +1,63 @@
+import numpy as np
+
+from spatial import SegmentGrid, UniformGrid
+from utils import line_intersection
+
+
+def test_radius_query_matches_brute_force():
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(-50, 1330, size=(400, 2))
+    grid = UniformGrid(positions, 100)
+
+    for point in rng.uniform(0, 1280, size=(50, 2)):
+        indices, distances = grid.query_radius(point, 75)
+        expected = np.flatnonzero(np.hypot(*(positions - point).T) < 75)
+        assert sorted(indices.tolist()) == expected.tolist()
+        np.testing.assert_allclose(distances, np.hypot(*(positions[indices] - point).T))
+
+
+def test_nearest_within_skips_excluded_points():
+    grid = UniformGrid([(100, 100), (110, 100), (300, 300)], 50)
+    exclude = np.array([False, True, False])
+
+    assert grid.nearest_within((108, 100), 20) == 1
+    assert grid.nearest_within((108, 100), 20, exclude) == 0
+    assert grid.nearest_within((200, 200), 20) is None
+
+
+def test_empty_grid_finds_nothing():
+    grid = UniformGrid(np.empty((0, 2)), 50)
+    indices, distances = grid.query_radius((10, 10), 100)
+
+    assert len(indices) == 0 and len(distances) == 0
+    assert grid.nearest_within((10, 10), 100) is None
+
+
+def test_segment_grid_cells_cover_the_segment():
+    grid = SegmentGrid(10)
+    cells = grid.cells_on((5, 5), (37, 18))
+
+    assert cells[0] == (0, 0) and cells[-1] == (3, 1)
+    # Consecutive cells share an edge
+    assert all(abs(ax - bx) + abs(ay - by) == 1
+               for (ax, ay), (bx, by) in zip(cells, cells[1:]))
+    for t in np.linspace(0, 1, 200):
+        x, y = 5 + 32 * t, 5 + 13 * t
+        assert (int(x // 10), int(y // 10)) in cells
+
+
+def test_segment_grid_crossings_match_brute_force():
+    rng = np.random.default_rng(5)
+    grid = SegmentGrid(64)
+    stored = [tuple(map(tuple, rng.uniform(0, 640, size=(2, 2)))) for _ in range(40)]
+    for p1, p2 in stored:
+        grid.insert(p1, p2)
+
+    assert len(grid) == 40
+    for p1, p2 in (tuple(map(tuple, rng.uniform(0, 640, size=(2, 2)))) for _ in range(200)):
+        expected = any(line_intersection(p1, p2, q1, q2) for q1, q2 in stored)
+        assert grid.crosses(p1, p2) == expected
+
+
+def test_empty_segment_grid_crosses_nothing():
+    assert not SegmentGrid(64).crosses((0, 0), (100, 100))
@@ -151,6 +151,26 @@ def get_fps(frame_count, elapsed_time):
         return 0
     return frame_count / elapsed_time
 
+def percentile(values, q):
+    """
+    Calculate a percentile with linear interpolation
+    
+    Args:
+        values: Sequence of numbers
+        q: Percentile in the range 0-100
+        
+    Returns:
+        float: Percentile value (0 for an empty sequence)
+    """
+    if not values:
+        return 0.0
+    
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
 def clamp(value, min_val, max_val):
     """
     Clamp value between min and max